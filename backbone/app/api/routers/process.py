@@ -10,13 +10,20 @@ import asyncio
 import time
 import logging
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, File, UploadFile, Form, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, FileResponse
 from pydantic import BaseModel
 from typing import Dict, List, Optional, Any, Set
 
 from app.common.config import ConfigService, get_config_service
 from app.api.services.video_processor import VideoProcessorService
 from app.api.services.audio_processor import AudioProcessorService
+from app.api.services.video_list_prefetcher import VideoListPrefetcher
+from app.core.content.continuation import continuation_stats
+from app.infrastructure.ai_services.claude_thinking_generate import claude_usage_stats
+from app.infrastructure.storage import ClipIndex, get_tts_cache, get_music_cache, get_llm_cache
+from app.infrastructure.storage.llm_cache import LLM_CACHE_DIR
+from app.infrastructure.storage.music_cache import MUSIC_CACHE_DIR
+from app.infrastructure.ffmpeg.clip_previews import PREVIEWS_BASE_DIR
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -46,6 +53,27 @@ class UploadResponse(BaseModel):
     prompt_id: str
     message: str
 
+class ClipPreviewResponse(BaseModel):
+    """Response model for a clip in the library browser."""
+    clip: str
+    cluster_id: Optional[int] = None
+    poster_url: Optional[str] = None
+    sprite_url: Optional[str] = None
+    sprite: Optional[Dict[str, Any]] = None
+
+class RescoreRequest(BaseModel):
+    """Request model for re-scoring a project's background music."""
+    project_id: str
+    music: Optional[Dict[str, Any]] = None
+    youtube_audio: Optional[Dict[str, Any]] = None
+
+class RescoreResponse(BaseModel):
+    """Response model for re-scoring a project's background music."""
+    status: str = "success"
+    message: str
+    video_url: Optional[str] = None
+    elapsed_seconds: Optional[float] = None
+
 class AudioGenerationResponse(BaseModel):
     """Response model for audio generation."""
     status: str = "success"
@@ -96,12 +124,25 @@ async def process_request(
         print(f"PROCESS ROUTER - VIDEO LIST TYPE: {type(video_list)}")
         print(f"PROCESS ROUTER - VIDEO LIST LENGTH: {len(video_list) if video_list else 0}")
         print(f'Look here, empty video list {video_list}')
-        creative, polish, final_response = start_video_pipeline(
-            mothership=request.mothership,
-            user_prompt=request.prompt,
-            config_service=config_service,
-            genre=genre
-        )
+        
+        # Start each entry's narration and clip prefetch while the rest of the list is generated
+        prefetcher = None
+        if config_service.get("video_generation", {}).get("stream_prefetch", True):
+            prefetcher = VideoListPrefetcher(config_service, genre)
+        
+        try:
+            creative, polish, final_response = await start_video_pipeline(
+                mothership=request.mothership,
+                user_prompt=request.prompt,
+                config_service=config_service,
+                genre=genre,
+                on_entry=prefetcher.submit if prefetcher else None,
+                use_llm_cache=(request.options or {}).get("llm_cache", True)
+            )
+        except Exception:
+            if prefetcher:
+                await prefetcher.cancel()
+            raise
         
         # Initialize the response
         response = ProcessResponse(
@@ -112,9 +153,10 @@ async def process_request(
             message="Video generation completed. Video processing started in background."
         )
         
-        # Schedule video processing in the background
+        # Schedule video processing in the background, once the prefetched narration is on disk
         background_tasks.add_task(
-            process_videos_background,
+            process_videos_after_prefetch,
+            prefetcher,
             ProcessRequest(
                 mothership=final_response,
                 prompt=creative,
@@ -130,6 +172,25 @@ async def process_request(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
 
+async def process_videos_after_prefetch(
+    prefetcher: Optional[VideoListPrefetcher],
+    request: ProcessRequest,
+    background_tasks: BackgroundTasks,
+    config_service: ConfigService
+):
+    """
+    Wait for the narration prefetched while the video list streamed, then process the videos.
+    
+    Args:
+        prefetcher: Prefetcher of the streamed entries (None if prefetching is disabled)
+        request: The processing request
+        background_tasks: Background tasks handler
+        config_service: Config service
+    """
+    if prefetcher:
+        await prefetcher.wait()
+    await process_videos_background(request, background_tasks, config_service)
+
 @router.post("/upload/audio", response_model=UploadResponse)
 async def upload_audio(
     file: UploadFile = File(...),
@@ -353,6 +414,56 @@ async def process_videos_background(
             video_urls=None
         )
 
+@router.post("/rescore", response_model=RescoreResponse)
+async def rescore_video(
+    request: RescoreRequest,
+    config_service: ConfigService = Depends(get_config_service)
+):
+    """
+    Swap a project's background music without re-rendering it.
+    
+    The music is mixed again onto the project's music-free master (kept by
+    /background), copying the video stream, so changes to the track, volume,
+    start time or trim take seconds.
+    
+    Args:
+        request (RescoreRequest): The re-score request
+        config_service (ConfigService): Config service
+        
+    Request parameters:
+        - project_id (str): Project ID of a completed render
+        - music (Dict[str, Any]): Optional overrides of the music config
+            (track_id, start_time, trim_audio, volume); a null track_id removes the music
+        - youtube_audio (Dict[str, Any]): Optional YouTube audio configuration used as-is
+    
+    Returns:
+        RescoreResponse: Path to the re-scored video
+    """
+    # The project ID names a directory under the output root, nothing else
+    project_id = request.project_id
+    if not project_id or project_id in (".", "..") or project_id != os.path.basename(project_id):
+        raise HTTPException(status_code=400, detail=f"Invalid project ID: {project_id}")
+    
+    started = time.monotonic()
+    video_processor = VideoProcessorService(config_service)
+    
+    try:
+        video_url = await video_processor.rescore_video(request.project_id, request.music, request.youtube_audio)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error re-scoring project {request.project_id}: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Error re-scoring video: {str(e)}")
+    
+    elapsed = time.monotonic() - started
+    return RescoreResponse(
+        message=f"Re-scored project {request.project_id} in {elapsed:.1f}s",
+        video_url=video_url,
+        elapsed_seconds=round(elapsed, 2)
+    )
+
 @router.get("/videos", response_model=List[str])
 async def get_processed_videos(
     genre: Optional[str] = None,
@@ -418,6 +529,67 @@ async def get_available_genres(
     
     return genres
 
+@router.get("/genres/{genre}/clips", response_model=List[ClipPreviewResponse])
+async def get_genre_clips(genre: str):
+    """
+    Get the clips of a genre with their precomputed previews.
+    Previews come from the clip index; no clip is decoded at request time.
+    
+    Args:
+        genre: Genre folder name
+        
+    Returns:
+        List[ClipPreviewResponse]: Clips with poster and sprite sheet URLs
+    """
+    videos_dir = os.path.join("data/media/videos", genre)
+    if genre != os.path.basename(genre) or not os.path.isdir(videos_dir):
+        raise HTTPException(status_code=404, detail=f"Genre not found: {genre}")
+    
+    index = ClipIndex(videos_dir)
+    clips = sorted(f for f in os.listdir(videos_dir) if f.endswith(('.mp4', '.mov', '.avi')))
+    
+    response = []
+    for clip in clips:
+        entry = index.get(clip) or {}
+        previews = entry.get("previews", {})
+        sprite = {k: v for k, v in previews.items() if k not in ("content_hash", "poster", "sprite")}
+        
+        response.append(ClipPreviewResponse(
+            clip=clip,
+            cluster_id=entry.get("cluster_id"),
+            poster_url=f"/api/previews/{genre}/{previews['poster']}" if previews.get("poster") else None,
+            sprite_url=f"/api/previews/{genre}/{previews['sprite']}" if previews.get("sprite") else None,
+            sprite=sprite or None
+        ))
+    
+    return response
+
+@router.get("/previews/{genre}/{filename}")
+async def get_clip_preview(genre: str, filename: str):
+    """
+    Serve a poster frame or sprite sheet.
+    Preview filenames contain the clip's content hash, so they are cached as immutable.
+    
+    Args:
+        genre: Genre folder name
+        filename: Preview filename
+        
+    Returns:
+        FileResponse: The preview image
+    """
+    if genre != os.path.basename(genre) or filename != os.path.basename(filename):
+        raise HTTPException(status_code=404, detail="Preview not found")
+    
+    preview_path = os.path.join(PREVIEWS_BASE_DIR, genre, filename)
+    if not os.path.isfile(preview_path):
+        raise HTTPException(status_code=404, detail="Preview not found")
+    
+    return FileResponse(
+        preview_path,
+        media_type="image/jpeg",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
+
 @router.post("/generate/audio", response_model=AudioGenerationResponse)
 async def generate_audio(
     background_tasks: BackgroundTasks = None,
@@ -506,6 +678,90 @@ async def generate_audio(
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Error generating audio: {str(e)}")
 
+@router.get("/audio/cache", response_model=Dict[str, Any])
+async def get_tts_cache_stats(
+    config_service: ConfigService = Depends(get_config_service)
+):
+    """
+    Get TTS cache metrics (hits, misses, evictions, size).
+    
+    Args:
+        config_service: Configuration service
+        
+    Returns:
+        Dict[str, Any]: Cache metrics since the server started
+    """
+    audio_config = config_service.get("audio", {})
+    cache = get_tts_cache(
+        audio_config.get("tts_cache_directory", "data/cache/tts"),
+        int(audio_config.get("tts_cache_max_mb", 2048)) * 1024 * 1024
+    )
+    return cache.stats()
+
+@router.get("/music/cache", response_model=Dict[str, Any])
+async def get_music_cache_stats(
+    config_service: ConfigService = Depends(get_config_service)
+):
+    """
+    Get music cache metrics (source and bed hits and misses, size).
+    
+    Args:
+        config_service: Configuration service
+        
+    Returns:
+        Dict[str, Any]: Cache metrics since the server started
+    """
+    music_config = config_service.get_music_config() or {}
+    cache = get_music_cache(
+        music_config.get("cache_directory", MUSIC_CACHE_DIR),
+        int(music_config.get("cache_max_mb", 2048)) * 1024 * 1024
+    )
+    return cache.stats()
+
+@router.get("/llm/cache", response_model=Dict[str, Any])
+async def get_llm_cache_stats(
+    config_service: ConfigService = Depends(get_config_service)
+):
+    """
+    Get LLM response cache metrics (hits, misses, expired entries, size).
+    
+    Args:
+        config_service: Configuration service
+        
+    Returns:
+        Dict[str, Any]: Cache metrics since the server started
+    """
+    llm_cache_config = config_service.get("llm_cache", {})
+    cache = get_llm_cache(
+        llm_cache_config.get("directory", LLM_CACHE_DIR),
+        float(llm_cache_config.get("ttl_hours", 24)) * 3600,
+        int(llm_cache_config.get("max_mb", 256)) * 1024 * 1024,
+        int(llm_cache_config.get("max_entries", 10000))
+    )
+    return cache.stats()
+
+@router.get("/llm/continuations", response_model=Dict[str, Any])
+async def get_continuation_stats():
+    """
+    Get video list continuation metrics (jobs per number of continuations, budget
+    exhaustions, token totals).
+    
+    Returns:
+        Dict[str, Any]: Continuation metrics since the server started
+    """
+    return continuation_stats()
+
+@router.get("/llm/usage", response_model=Dict[str, Any])
+async def get_llm_usage_stats():
+    """
+    Get Claude token usage, including prompt cache reads and writes of the stable
+    prompt prefixes (templates and clip catalog).
+    
+    Returns:
+        Dict[str, Any]: Usage since the server started
+    """
+    return claude_usage_stats()
+
 async def generate_audio_background(
     config_service: ConfigService
 ) -> List[str]:
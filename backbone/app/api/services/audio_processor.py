@@ -8,9 +8,14 @@ import os
 import json
 import logging
 import asyncio
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Awaitable
 
-from app.core.audio.audio_generator import AudioGenerator
+from app.core.audio.backends import create_audio_generator
+from app.core.audio.batch_synthesis import group_lines
+from app.core.audio.frame_scanner import scan_audio_duration
+from app.core.audio.alignment import load_alignment
+from app.core.audio.loudness import ANALYSIS_VERSION, analyze_audio, loudness_gain, speech_window
+from app.infrastructure.storage import JobManifest, compute_content_hash, get_tts_cache
 from app.common.config import ConfigService
 
 # Configure logging
@@ -39,8 +44,10 @@ class AudioProcessorService:
         
         # Initialize audio generator with config
         self._audio_generator = None
+        self._job_manifest = None
         self.audio_config = {
             # Use voice settings from the voice section
+            "backend": voice_config.get("backend", "elevenlabs"),
             "voice_id": voice_config.get("voice_id", "hKUnzqLzU3P9IVhYHREu"),
             "model_id": voice_config.get("model_id", "eleven_flash_v2"),
             "stability": voice_config.get("stability", 0.5),
@@ -53,7 +60,23 @@ class AudioProcessorService:
             "max_workers": audio_config.get("max_concurrent_processes", 4),
             "max_retries": audio_config.get("max_retries", 3),
             "retry_delay": audio_config.get("retry_delay", 2),
-            "max_retry_delay": audio_config.get("max_retry_delay", 10)
+            "max_retry_delay": audio_config.get("max_retry_delay", 10),
+            "max_concurrency": audio_config.get("max_tts_concurrency", 32),
+            "characters_per_minute": audio_config.get("tts_characters_per_minute"),
+            "cache_enabled": audio_config.get("tts_cache", True),
+            "cache_dir": audio_config.get("tts_cache_directory", "data/cache/tts"),
+            "cache_max_bytes": int(audio_config.get("tts_cache_max_mb", 2048)) * 1024 * 1024,
+            "base_url": audio_config.get("tts_base_url"),
+            "batch_lines": audio_config.get("tts_batch_lines", 1),
+            "batch_pause": audio_config.get("tts_batch_pause", 0.5),
+            "batch_max_characters": audio_config.get("tts_batch_max_characters", 2500),
+            "timestamps": audio_config.get("tts_timestamps", True),
+            "loudness_normalize": audio_config.get("loudness_normalize", True),
+            "loudness_target_lufs": audio_config.get("loudness_target_lufs", -16.0),
+            "loudness_max_gain_db": audio_config.get("loudness_max_gain_db", 12.0),
+            "loudness_peak_ceiling_dbfs": audio_config.get("loudness_peak_ceiling_dbfs", -1.0),
+            "trim_silence": audio_config.get("trim_silence", True),
+            "silence_padding": audio_config.get("silence_padding", 0.05)
         }
     
     @property
@@ -62,14 +85,124 @@ class AudioProcessorService:
         Get the audio generator, initializing it if needed.
         """
         if self._audio_generator is None:
-            # Get API key from config or environment
-            api_key = self.config_service.get("audio", {}).get("api_key") or os.getenv("EL")
+            # Get API keys from config or environment (EL, comma-separated or EL_1, EL_2, ...)
+            api_key = self.config_service.get("audio", {}).get("api_key") or self.config_service.get_env_list("EL")
             
-            # Initialize audio generator
-            self._audio_generator = AudioGenerator(api_key=api_key, config=self.audio_config)
+            # Initialize the audio generator for the configured TTS backend
+            self._audio_generator = create_audio_generator(self.audio_config, api_key=api_key)
             
         return self._audio_generator
     
+    @property
+    def job_manifest(self) -> JobManifest:
+        """
+        Get the manifest of the audio output directory, loading it if needed.
+        """
+        if self._job_manifest is None:
+            self._job_manifest = JobManifest(self.audio_config["audio_output_dir"])
+        return self._job_manifest
+    
+    def get_audio_duration(self, audio_path: str) -> Optional[float]:
+        """
+        Get the exact duration of a narration file from its frame headers.
+        The result is recorded in the job manifest, so each file is scanned once.
+        
+        Args:
+            audio_path (str): Path to the audio file
+            
+        Returns:
+            Optional[float]: Duration in seconds, or None if the file can't be scanned
+        """
+        entry = self.job_manifest.get_audio(audio_path)
+        if entry is None or "duration_us" not in entry:
+            try:
+                info = scan_audio_duration(audio_path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read audio duration from frame headers: {e}")
+                return None
+            
+            entry = self.job_manifest.set_audio(audio_path, {**(entry or {}), **info})
+            self.job_manifest.save()
+        
+        return entry["duration_us"] / 1_000_000
+    
+    async def get_audio_analysis(self, audio_path: str) -> Dict[str, Any]:
+        """
+        Get the loudness and speech bounds of a narration file.
+        The analysis runs once per distinct file: it is recorded in the job manifest and
+        kept in the TTS cache by content hash, so regenerated or shared lines reuse it.
+        
+        Args:
+            audio_path (str): Path to the audio file
+            
+        Returns:
+            Dict[str, Any]: The analysis (see app.core.audio.loudness.analyze_samples)
+        """
+        entry = self.job_manifest.get_audio(audio_path)
+        if entry and (entry.get("analysis") or {}).get("version") == ANALYSIS_VERSION:
+            return entry["analysis"]
+        
+        tts_cache = None
+        if self.audio_config["cache_enabled"]:
+            tts_cache = get_tts_cache(self.audio_config["cache_dir"], self.audio_config["cache_max_bytes"])
+        
+        content_hash = await asyncio.to_thread(compute_content_hash, audio_path)
+        analysis = tts_cache.load_analysis(content_hash, ANALYSIS_VERSION) if tts_cache else None
+        if analysis is None:
+            analysis = await analyze_audio(self.audio_generator.command_executor, audio_path)
+            if tts_cache:
+                tts_cache.store_analysis(content_hash, analysis)
+        
+        self.job_manifest.set_audio(audio_path, {**(entry or {}), "analysis": analysis})
+        self.job_manifest.save()
+        return analysis
+    
+    async def get_line_adjustments(self, audio_path: str) -> Dict[str, float]:
+        """
+        Get the gain and trim to apply to a narration line when it is rendered.
+        
+        Args:
+            audio_path (str): Path to the audio file
+            
+        Returns:
+            Dict[str, float]: audio_gain_db and, with silence trimming, audio_start and
+                              audio_end (seconds); empty if both adjustments are disabled
+        """
+        normalize = self.audio_config["loudness_normalize"]
+        trim = self.audio_config["trim_silence"]
+        if not normalize and not trim:
+            return {}
+        
+        analysis = await self.get_audio_analysis(audio_path)
+        adjustments = {}
+        if normalize:
+            adjustments["audio_gain_db"] = loudness_gain(
+                analysis,
+                self.audio_config["loudness_target_lufs"],
+                self.audio_config["loudness_max_gain_db"],
+                self.audio_config["loudness_peak_ceiling_dbfs"]
+            )
+        if trim:
+            adjustments["audio_start"], adjustments["audio_end"] = speech_window(analysis, self.audio_config["silence_padding"])
+        return adjustments
+    
+    def get_word_timings(self, audio_path: str, line: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get when each word of a narration line is spoken, from the timestamps saved with it.
+        
+        Args:
+            audio_path (str): Path to the audio file
+            line (str, optional): Narration text the audio should hold
+            
+        Returns:
+            Optional[List[Dict[str, Any]]]: word, start and end (seconds) of each word,
+                                            or None if the file has no current timestamps
+        """
+        alignment = load_alignment(audio_path, line)
+        if alignment is None:
+            return None
+        return alignment["words"]
+    
     async def process_audio(self, video_list_path: str = None) -> List[str]:
         """
         Process audio generation from video_list.json.
@@ -148,14 +281,15 @@ class AudioProcessorService:
                 # Get audio file path
                 audio_path = os.path.join(audio_dir, audio_file)
                 
-                # Skip if audio file already exists
-                if os.path.exists(audio_path):
+                # Get caption line
+                line = data.get("line", "")
+                
+                # Skip if audio file already exists (and, with the TTS cache, matches this line)
+                if os.path.exists(audio_path) and (not line or self.audio_generator.is_current(audio_path, line)):
                     logger.info(f"Audio file already exists: {audio_path}")
                     existing_files.add(audio_path)
                     continue
                 
-                # Get caption line
-                line = data.get("line", "")
                 if not line:
                     logger.warning(f"No caption line found for {audio_file}, skipping")
                     continue
@@ -177,20 +311,15 @@ class AudioProcessorService:
             if missing_entries:
                 logger.info(f"Generating {len(missing_entries)} missing audio files")
                 
-                # Run in a background thread to avoid blocking the event loop
-                import asyncio
-                from concurrent.futures import ThreadPoolExecutor
-                
                 # Sort entries by index to prioritize earlier files
                 sorted_entries = [{"index": idx, "text": text} for idx, text in 
                                   sorted(missing_entries.items(), key=lambda x: x[0])]
                 
-                with ThreadPoolExecutor() as executor:
-                    # Run batch generation in a separate thread
-                    result = await asyncio.get_event_loop().run_in_executor(
-                        executor,
-                        lambda: self.audio_generator.batch_generate(sorted_entries)
-                    )
+                # Generate natively on the event loop with the pooled client
+                try:
+                    result = await self.audio_generator.batch_generate_async(sorted_entries)
+                finally:
+                    await self.audio_generator.aclose()
                 
                 logger.info(f"Generated {len(result)} audio files")
                 return result
@@ -204,6 +333,86 @@ class AudioProcessorService:
             logger.debug(f"Traceback: {traceback.format_exc()}")
             raise
     
+    async def ensure_line_audio(self, audio_file: str, line: str) -> Optional[str]:
+        """
+        Ensure the audio file of a single video_list.json entry exists, generating it if needed.
+        Requests share the audio generator's pooled client and rate controller, so many
+        entries can call this concurrently.
+        
+        Args:
+            audio_file (str): Audio filename from video_list.json (e.g. audio_1.mp3)
+            line (str): Caption line to narrate
+            
+        Returns:
+            Optional[str]: Path to the audio file, or None if it could not be generated
+        """
+        audio_path = os.path.join(self.audio_config["audio_output_dir"], audio_file)
+        
+        # Skip if audio file already exists (and, with the TTS cache, matches this line)
+        if os.path.exists(audio_path) and (not line or self.audio_generator.is_current(audio_path, line)):
+            logger.info(f"Audio file already exists: {audio_path}")
+            return audio_path
+        
+        if not line:
+            logger.warning(f"No caption line found for {audio_file}, skipping")
+            return None
+        
+        try:
+            return await self.audio_generator.generate_audio_async(line, audio_path)
+        except Exception as e:
+            logger.error(f"Error generating audio for {audio_file}: {e}")
+            return audio_path if os.path.exists(audio_path) else None
+    
+    def line_audio_tasks(self, video_list: Dict[str, Dict]) -> Dict[str, Awaitable[Optional[str]]]:
+        """
+        Plan the audio generation of video_list.json entries.
+        With batching enabled (audio.tts_batch_lines > 1), consecutive lines are generated
+        in shared requests that start immediately; each entry's awaitable resolves when its
+        batch is done.
+        
+        Args:
+            video_list (Dict[str, Dict]): Entries from video_list.json (audio filename to data)
+            
+        Returns:
+            Dict[str, Awaitable[Optional[str]]]: Per audio filename, an awaitable resolving to
+                                                 the audio file path, or None if it failed
+        """
+        items = [(audio_file, data.get("line", "")) for audio_file, data in video_list.items()]
+        batch_lines = self.audio_config.get("batch_lines", 1)
+        
+        if batch_lines <= 1:
+            return {audio_file: self.ensure_line_audio(audio_file, line) for audio_file, line in items}
+        
+        async def generate_group(group):
+            audio_dir = self.audio_config["audio_output_dir"]
+            return await self.audio_generator.generate_batch_async([
+                (line, os.path.join(audio_dir, audio_file)) for audio_file, line in group
+            ])
+        
+        async def line_from_group(group_task, position):
+            return (await group_task)[position]
+        
+        tasks = {}
+        lines = [(audio_file, line) for audio_file, line in items if line]
+        for group in group_lines(lines, [line for _, line in lines], batch_lines, self.audio_config["batch_max_characters"]):
+            group_task = asyncio.ensure_future(generate_group(group))
+            for position, (audio_file, _) in enumerate(group):
+                tasks[audio_file] = line_from_group(group_task, position)
+        
+        # Entries without a line can only use an existing file
+        for audio_file, line in items:
+            if not line:
+                tasks[audio_file] = self.ensure_line_audio(audio_file, line)
+        
+        return tasks
+    
+    async def aclose(self):
+        """
+        Close the audio generator's HTTP client.
+        """
+        if self._audio_generator is not None:
+            await self._audio_generator.aclose()
+    
     def _get_audio_files_from_video_list(self, video_list_path: str) -> List[str]:
         """
         Get a list of audio file paths from the video_list.json file.
@@ -267,6 +476,7 @@ class AudioProcessorService:
         # Update audio generator config
         self.audio_config = {
             # Use voice settings from the voice section
+            "backend": voice_config.get("backend", "elevenlabs"),
             "voice_id": voice_config.get("voice_id", "hKUnzqLzU3P9IVhYHREu"),
             "model_id": voice_config.get("model_id", "eleven_flash_v2"),
             "stability": voice_config.get("stability", 0.5),
@@ -279,10 +489,27 @@ class AudioProcessorService:
             "max_workers": audio_config.get("max_concurrent_processes", 4),
             "max_retries": audio_config.get("max_retries", 3),
             "retry_delay": audio_config.get("retry_delay", 2),
-            "max_retry_delay": audio_config.get("max_retry_delay", 10)
+            "max_retry_delay": audio_config.get("max_retry_delay", 10),
+            "max_concurrency": audio_config.get("max_tts_concurrency", 32),
+            "characters_per_minute": audio_config.get("tts_characters_per_minute"),
+            "cache_enabled": audio_config.get("tts_cache", True),
+            "cache_dir": audio_config.get("tts_cache_directory", "data/cache/tts"),
+            "cache_max_bytes": int(audio_config.get("tts_cache_max_mb", 2048)) * 1024 * 1024,
+            "base_url": audio_config.get("tts_base_url"),
+            "batch_lines": audio_config.get("tts_batch_lines", 1),
+            "batch_pause": audio_config.get("tts_batch_pause", 0.5),
+            "batch_max_characters": audio_config.get("tts_batch_max_characters", 2500),
+            "timestamps": audio_config.get("tts_timestamps", True),
+            "loudness_normalize": audio_config.get("loudness_normalize", True),
+            "loudness_target_lufs": audio_config.get("loudness_target_lufs", -16.0),
+            "loudness_max_gain_db": audio_config.get("loudness_max_gain_db", 12.0),
+            "loudness_peak_ceiling_dbfs": audio_config.get("loudness_peak_ceiling_dbfs", -1.0),
+            "trim_silence": audio_config.get("trim_silence", True),
+            "silence_padding": audio_config.get("silence_padding", 0.05)
         }
         
         # Reset the audio generator so it will be recreated with the new config
         self._audio_generator = None
+        self._job_manifest = None
         
         logger.info("Audio generator configuration updated") 
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Video List Prefetcher
+
+This module starts the work of each video_list entry while the LLM is still generating
+the rest of the list: the entry's narration is synthesized into the audio directory and
+its source clip is read ahead into the page cache. The render later finds the narration
+already on disk (checked against the TTS cache), so generation and synthesis overlap.
+"""
+
+import os
+import asyncio
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+from app.api.services.audio_processor import AudioProcessorService
+from app.common.config import ConfigService
+
+logger = logging.getLogger(__name__)
+
+class VideoListPrefetcher:
+    """
+    Prefetches the narration and source clip of video_list entries as they are parsed.
+    """
+
+    def __init__(self, config_service: ConfigService, genre: str):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            config_service: Configuration service
+            genre: Genre whose clip library the entries refer to
+        """
+        self.config_service = config_service
+        self.videos_dir = f"data/media/videos/{genre}"
+        self.audio_processor = AudioProcessorService(config_service)
+        self._tasks: List[Tuple[str, asyncio.Task]] = []
+        self._lines: Dict[str, str] = {}
+
+    def submit(self, audio_file: str, entry: Dict[str, Any]) -> None:
+        """
+        Start prefetching an entry. An entry streamed again with the same line is not
+        prefetched twice.
+
+        Args:
+            audio_file: Audio filename of the entry (e.g. audio_1.mp3)
+            entry: Entry from the streamed video_list (source_video, clip, line)
+        """
+        line = entry.get("line", "")
+        if not line or self._lines.get(audio_file) == line:
+            return
+
+        self._lines[audio_file] = line
+        logger.info(f"Prefetching {audio_file} while the video list is generated")
+        self._tasks.append((audio_file, asyncio.ensure_future(
+            self._prefetch(audio_file, line, entry.get("source_video"))
+        )))
+
+    async def _prefetch(self, audio_file: str, line: str, source_video: Optional[str]) -> Optional[str]:
+        """Synthesize an entry's narration and read its source clip ahead."""
+        if source_video:
+            await asyncio.to_thread(_read_ahead, os.path.join(self.videos_dir, source_video))
+        return await self.audio_processor.ensure_line_audio(audio_file, line)
+
+    async def wait(self) -> Dict[str, Optional[str]]:
+        """
+        Wait for every prefetch started so far and release the TTS client.
+
+        Returns:
+            Dict[str, Optional[str]]: Per audio filename, the narration path, or None if it failed
+        """
+        results = await asyncio.gather(*(task for _, task in self._tasks), return_exceptions=True)
+        await self.audio_processor.aclose()
+
+        prefetched = {}
+        for (audio_file, _), result in zip(self._tasks, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Prefetch of {audio_file} failed, it will be generated with the render: {result}")
+                result = None
+            prefetched[audio_file] = result
+
+        logger.info(f"Prefetched {sum(1 for path in prefetched.values() if path)}/{len(prefetched)} narration lines")
+        return prefetched
+
+    async def cancel(self) -> None:
+        """
+        Cancel the prefetches still running and release the TTS client.
+        """
+        for _, task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*(task for _, task in self._tasks), return_exceptions=True)
+        await self.audio_processor.aclose()
+
+def _read_ahead(path: str) -> None:
+    """Ask the OS to read a file into the page cache, where supported."""
+    if not hasattr(os, "posix_fadvise") or not os.path.exists(path):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
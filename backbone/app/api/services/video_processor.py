@@ -6,17 +6,25 @@ This module provides services for processing videos using the async FFmpeg infra
 
 import os
 import json
+import shutil
 import asyncio
 import logging
+import tempfile
 from typing import Dict, List, Any, Optional
 
 from app.infrastructure.ffmpeg import create_pipeline, configure_ffmpeg, create_youtube_audio_merger
+from app.infrastructure.storage import ClipIndex
 from app.common.config import ConfigService
 from app.api.services.audio_processor import AudioProcessorService
+from app.core.audio.format_plan import plan_audio_formats
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Music-free master and its record, kept in each project's output directory for re-scoring
+MASTER_FILE = "master.mp4"
+MASTER_RECORD_FILE = "master.json"
+
 class VideoProcessorService:
     """
     Service for processing videos using FFmpeg.
@@ -36,6 +44,16 @@ class VideoProcessorService:
         ffmpeg_config = self.config_service.get("ffmpeg", {})
         self.max_concurrent_processes = ffmpeg_config.get("max_concurrent_processes", 4)
         
+        # Assemble all narration lines into one track instead of muxing audio per clip, so the
+        # narration's only encode after TTS is the final one. Turning this off muxes audio into
+        # every clip, which encodes narration to AAC per clip, in the concatenation and in the
+        # music mix; the per-clip videos then keep their own audio.
+        self.use_narration_assembler = ffmpeg_config.get("narration_assembler", True)
+        self.narration_track_path = os.path.join("data", "current", "narration.wav")
+        
+        # Run each video_list.json entry as its own TTS -> probe -> render flow instead of staging
+        self.use_dataflow = ffmpeg_config.get("dataflow", True)
+        
         # Configure FFmpeg with our settings
         configure_ffmpeg(max_concurrent_processes=self.max_concurrent_processes)
         
@@ -52,14 +70,30 @@ class VideoProcessorService:
         Lazy initialization to ensure it's created when needed.
         """
         if self._pipeline is None:
+            audio_plan = self.audio_plan
             ffmpeg_config = {
                 "max_concurrent_processes": self.max_concurrent_processes,
                 "font_size": self.config_service.get("ffmpeg", {}).get("font_size", 24),
-                "position": self.config_service.get("ffmpeg", {}).get("position", "bottom")
+                "position": self.config_service.get("ffmpeg", {}).get("position", "bottom"),
+                "narration": {"sample_rate": audio_plan["sample_rate"], **self.config_service.get("ffmpeg", {}).get("narration", {})},
+                "audio": audio_plan
             }
             self._pipeline = create_pipeline(ffmpeg_config)
         return self._pipeline
     
+    @property
+    def audio_plan(self) -> Dict[str, Any]:
+        """
+        Get the audio format plan of a render: the sample rate every stage after the TTS
+        decode works at, and the single final AAC encode (see app.core.audio.format_plan).
+        """
+        audio_config = self.config_service.get("audio", {})
+        return plan_audio_formats(
+            self.audio_processor.audio_config["output_format"],
+            audio_config.get("mix_sample_rate"),
+            audio_config.get("final_audio_bitrate", "192k")
+        )
+    
     @property
     def audio_processor(self):
         """
@@ -77,7 +111,55 @@ class VideoProcessorService:
         Returns:
             YouTubeAudioMerger: A YouTube audio merger
         """
-        return create_youtube_audio_merger()
+        music_config = self.config_service.get_music_config() or {}
+        return create_youtube_audio_merger(config={
+            "cache": music_config.get("cache"),
+            "cache_dir": music_config.get("cache_directory"),
+            "cache_max_mb": music_config.get("cache_max_mb"),
+            "bed_bucket_seconds": music_config.get("bed_bucket_seconds"),
+            "bed_sample_rate": music_config.get("bed_sample_rate") or self.audio_plan["sample_rate"],
+            "final_bitrate": self.audio_plan["final_bitrate"],
+            "ducking": music_config.get("ducking")
+        })
+    
+    def _youtube_audio_from_music(self, music_config: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Convert a music configuration (track_id, start_time, trim_audio, volume) to the
+        YouTube audio format used by the merger.
+        
+        Args:
+            music_config: Music configuration; start_time may be seconds or "M:SS"
+            
+        Returns:
+            Optional[Dict[str, Any]]: YouTube audio configuration, or None without a track_id
+        """
+        if not music_config or not music_config.get("track_id"):
+            return None
+        
+        track_id = music_config.get("track_id")
+        youtube_audio = {
+            "url": f"https://www.youtube.com/watch?v={track_id}",
+            "volume": music_config.get("volume", 0.5)
+        }
+        
+        # Handle start_time conversion from "M:SS" to seconds if needed
+        start_time = music_config.get("start_time", "0:00")
+        if isinstance(start_time, str) and ":" in start_time:
+            try:
+                minutes, seconds = start_time.split(":")
+                youtube_audio["start_time"] = float(minutes) * 60 + float(seconds)
+            except Exception as e:
+                logger.error(f"Error converting music start_time '{start_time}' to seconds: {e}")
+                youtube_audio["start_time"] = 0.0
+        else:
+            youtube_audio["start_time"] = float(start_time) if start_time else 0.0
+        
+        # Add trim_audio parameter from music config
+        if "trim_audio" in music_config:
+            youtube_audio["trim_audio"] = float(music_config.get("trim_audio"))
+        
+        logger.info(f"Using music track_id '{track_id}' as YouTube audio: {youtube_audio}")
+        return youtube_audio
     
     async def process_videos(self, prompts_data: Dict[str, str] = None, genre: Optional[str] = None, project_id: str = None, options: Optional[Dict[str, Any]] = None) -> List[str]:
         """
@@ -120,34 +202,7 @@ class VideoProcessorService:
                 logger.info(f"YouTube audio options found in config: {youtube_audio}")
             # If no youtube_audio config, check music config for track_id
             else:
-                music_config = self.config_service.get_music_config()
-                if music_config and "track_id" in music_config:
-                    track_id = music_config.get("track_id")
-                    if track_id:
-                        # Convert music config to youtube_audio format
-                        youtube_audio = {
-                            "url": f"https://www.youtube.com/watch?v={track_id}",
-                            "volume": music_config.get("volume", 0.5)
-                        }
-                        
-                        # Handle start_time conversion from "M:SS" to seconds if needed
-                        start_time = music_config.get("start_time", "0:00")
-                        if isinstance(start_time, str) and ":" in start_time:
-                            try:
-                                minutes, seconds = start_time.split(":")
-                                start_time_seconds = float(minutes) * 60 + float(seconds)
-                                youtube_audio["start_time"] = start_time_seconds
-                            except Exception as e:
-                                logger.error(f"Error converting music start_time '{start_time}' to seconds: {e}")
-                                youtube_audio["start_time"] = 0.0
-                        else:
-                            youtube_audio["start_time"] = float(start_time) if start_time else 0.0
-                        
-                        # Add trim_audio parameter from music config
-                        if "trim_audio" in music_config:
-                            youtube_audio["trim_audio"] = float(music_config.get("trim_audio"))
-                            
-                        logger.info(f"Using music track_id '{track_id}' as YouTube audio: {youtube_audio}")
+                youtube_audio = self._youtube_audio_from_music(self.config_service.get_music_config())
         
         logger.info("====== PROCESS STEP 1: PREPARE AUDIO FILES ======")
         # Construct paths
@@ -156,8 +211,9 @@ class VideoProcessorService:
         video_list_path = os.path.join(audio_dir, "video_list.json")
         
         # Step 1: Generate audio files from video_list.json if it exists
+        # (with the dataflow, each entry generates its own audio in step 2)
         available_audio_files = set()
-        if os.path.exists(video_list_path):
+        if os.path.exists(video_list_path) and not self.use_dataflow:
             logger.info(f"Found video_list.json at {video_list_path}, generating audio files")
             try:
                 # Generate any missing audio files
@@ -181,7 +237,11 @@ class VideoProcessorService:
         logger.info("====== PROCESS STEP 2: CREATE INDIVIDUAL VIDEOS WITH CAPTIONS ======")
         # Step 2: Process videos
         processed_videos = []
-        if os.path.exists(video_list_path):
+        if os.path.exists(video_list_path) and self.use_dataflow:
+            # Run each entry as TTS -> probe -> render, rendering clips as their audio is ready
+            logger.info("Using video_list.json for per-clip audio generation and video processing")
+            processed_videos = await self._process_video_list_dataflow(video_list_path, videos_dir)
+        elif os.path.exists(video_list_path):
             # Use video_list.json for processing, but only process videos with available audio
             logger.info(f"Using video_list.json for video processing")
             processed_videos = await self._process_from_video_list(
@@ -210,11 +270,16 @@ class VideoProcessorService:
             
             try:
                 # Concatenate all processed videos and apply YouTube audio if provided
+                narration_track = None
+                if self.use_narration_assembler and os.path.exists(self.narration_track_path):
+                    narration_track = self.narration_track_path
+                
                 final_video = await self.concatenate_videos(
                     processed_videos, 
                     final_output_path, 
                     project_id,
-                    youtube_audio
+                    youtube_audio,
+                    narration_track=narration_track
                 )
                 logger.info(f"Successfully created final concatenated video: {final_video}")
                 
@@ -266,12 +331,14 @@ class VideoProcessorService:
                 if os.path.exists(audio_path):
                     available_audio_files.add(audio_path)
         
+        # Offline clip analysis (best start offsets), if the library has been indexed
+        clip_index = ClipIndex(videos_dir)
+        
         # Prepare data for processing
         video_data = {}
         for audio_file, data in video_list.items():
             # Get full paths
             audio_path = os.path.join(audio_dir, audio_file)
-            video_path = os.path.join(videos_dir, data["source_video"])
             
             # Skip if audio file doesn't exist
             if audio_path not in available_audio_files:
@@ -279,16 +346,15 @@ class VideoProcessorService:
                 continue
                 
             # Skip if video file doesn't exist
-            if not os.path.exists(video_path):
-                logger.warning(f"Video file not found: {video_path}")
+            entry = self._video_entry(data, videos_dir, clip_index)
+            if entry is None:
                 continue
                 
+            # Exact narration length, loudness gain and speech window, for the render
+            await self._describe_audio(entry, audio_path)
+            
             # Add to processing data
-            video_data[audio_path] = {
-                "line": data["line"],
-                "source_video": video_path,
-                "clip": data.get("clip", None)  # Include clip name if available
-            }
+            video_data[audio_path] = entry
         
         if not video_data:
             logger.warning("No valid audio-video pairs found in video_list.json")
@@ -299,6 +365,204 @@ class VideoProcessorService:
         # Process each video
         return await self._process_video_data(video_data)
     
+    def _video_entry(self, data: Dict[str, Any], videos_dir: str, clip_index: ClipIndex) -> Optional[Dict[str, Any]]:
+        """
+        Build the processing data of a video_list.json entry.
+        
+        Args:
+            data: Entry from video_list.json
+            videos_dir: Directory containing source videos
+            clip_index: Offline clip analysis of the genre
+            
+        Returns:
+            Optional[Dict[str, Any]]: Processing data, or None if the source video doesn't exist
+        """
+        video_path = os.path.join(videos_dir, data["source_video"])
+        if not os.path.exists(video_path):
+            logger.warning(f"Video file not found: {video_path}")
+            return None
+        
+        entry = {
+            "line": data["line"],
+            "source_video": video_path,
+            "clip": data.get("clip", None)  # Include clip name if available
+        }
+        
+        # Offline clip analysis (best start offset), if the library has been indexed; the offset
+        # is checked against the narration's length once it is known (see _fit_start_offset)
+        clip_entry = clip_index.get(data["source_video"])
+        if clip_entry and clip_entry.get("best_start"):
+            entry["start_offset"] = clip_entry["best_start"]
+            entry["keyframes"] = clip_entry.get("keyframes", [])
+        if clip_entry and clip_entry.get("duration"):
+            entry["clip_duration"] = clip_entry["duration"]
+        
+        return entry
+    
+    def _fit_start_offset(self, entry: Dict[str, Any]) -> None:
+        """
+        Make sure the clip has room for the whole narration after its start offset.
+        The best start only leaves the analysis window before the end of the clip, so for a
+        longer line the latest keyframe that leaves room is used instead, or the clip start.
+        
+        Args:
+            entry: Processing data of the line, with its audio_duration
+        """
+        start_offset = entry.get("start_offset")
+        clip_duration = entry.get("clip_duration")
+        audio_duration = entry.get("audio_duration")
+        if not start_offset or not clip_duration or not audio_duration:
+            return
+        
+        gap = self.pipeline.narration_assembler.config["gap"] if self.use_narration_assembler else 0.0
+        latest_start = clip_duration - (audio_duration + gap)
+        if start_offset <= latest_start + 1e-6:
+            return
+        
+        fitting = [t for t in entry.get("keyframes", []) if 0.0 <= t <= min(latest_start, start_offset)]
+        fitted = max(fitting) if fitting else 0.0
+        logger.info(
+            f"Narration of {audio_duration:.2f}s doesn't fit after best start {start_offset:.2f}s "
+            f"of {entry['source_video']}, starting at {fitted:.2f}s"
+        )
+        if fitted:
+            entry["start_offset"] = fitted
+        else:
+            entry.pop("start_offset", None)
+    
+    async def _describe_audio(self, entry: Dict[str, Any], audio_path: str) -> None:
+        """
+        Add what the render needs to know about a narration line to its processing data:
+        its exact length, the word timings the captions follow and, when enabled, the
+        loudness gain and the speech window to keep. With a speech window, audio_duration
+        is the length of the window and word timings are relative to its start. The clip's
+        start offset is then moved earlier if the line wouldn't fit after it.
+        
+        Args:
+            entry: Processing data of the line
+            audio_path: Path to the line's audio file
+        """
+        entry["audio_duration"] = self.audio_processor.get_audio_duration(audio_path)
+        words = self.audio_processor.get_word_timings(audio_path, entry.get("line"))
+        if words:
+            entry["word_timings"] = words
+        
+        try:
+            entry.update(await self.audio_processor.get_line_adjustments(audio_path))
+        except Exception as e:
+            logger.warning(f"Could not analyze narration {audio_path}, rendering it unadjusted: {e}")
+        
+        if "audio_end" in entry:
+            entry["audio_duration"] = entry["audio_end"] - entry["audio_start"]
+            if words:
+                offset = entry["audio_start"]
+                entry["word_timings"] = [
+                    {**word, "start": max(word["start"] - offset, 0.0), "end": max(word["end"] - offset, 0.0)}
+                    for word in words
+                ]
+        
+        self._fit_start_offset(entry)
+    
+    async def _process_video_list_dataflow(self, video_list_path: str, videos_dir: str) -> List[str]:
+        """
+        Process video_list.json as one small pipeline per entry: TTS, then probe, then render.
+        
+        Entries run concurrently, so a clip renders as soon as its own narration exists
+        instead of waiting for the whole batch. TTS requests are limited by the audio
+        generator's rate controller and renders by the FFmpeg process limit, so neither
+        stage holds capacity of the other while it waits.
+        
+        Args:
+            video_list_path: Path to video_list.json
+            videos_dir: Directory containing source videos
+            
+        Returns:
+            List[str]: List of processed video file paths, in video_list.json order
+        """
+        try:
+            with open(video_list_path, 'r') as f:
+                video_list = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading video_list.json: {e}")
+            raise
+        
+        clip_index = ClipIndex(videos_dir)
+        render_slots = asyncio.Semaphore(self.max_concurrent_processes)
+        
+        self.audio_processor.update_audio_generator_config()
+        os.makedirs(self.audio_processor.audio_config["audio_output_dir"], exist_ok=True)
+        os.makedirs(self.pipeline.output_dir, exist_ok=True)
+        
+        use_narration = self.use_narration_assembler
+        if os.path.exists(self.narration_track_path):
+            os.remove(self.narration_track_path)
+        
+        logger.info(f"Processing {len(video_list)} videos from video_list.json with max {self.max_concurrent_processes} concurrent renders")
+        
+        entries = {}
+        for audio_file, data in video_list.items():
+            entry = self._video_entry(data, videos_dir, clip_index)
+            if entry is not None:
+                entries[audio_file] = entry
+        
+        async def process_entry(audio_file: str, entry: Dict[str, Any], audio_task):
+            # TTS: rate controlled by the audio generator (batched lines share a request)
+            audio_path = await audio_task
+            if not audio_path:
+                return None
+            
+            # Probe: exact narration length from the MP3 frame headers (no process spawned),
+            # loudness and speech bounds (once per distinct file), and with the narration
+            # assembler, the decoded line and its slot on the timeline
+            await self._describe_audio(entry, audio_path)
+            narration_line = None
+            if use_narration:
+                try:
+                    narration_line = await self.pipeline.prepare_narrated_video(audio_path, entry)
+                except Exception as e:
+                    logger.error(f"Error decoding narration {audio_path}: {e}")
+                    return None
+            
+            # Render: limited to the FFmpeg process slots
+            async with render_slots:
+                if use_narration:
+                    video = await self.pipeline.render_narrated_video(audio_path, entry, narration_line[1])
+                else:
+                    video = await self.pipeline.process_video(audio_path, entry)
+            
+            if not video or not os.path.exists(video):
+                return None
+            return video, narration_line
+        
+        try:
+            audio_tasks = self.audio_processor.line_audio_tasks({
+                audio_file: video_list[audio_file] for audio_file in entries
+            })
+            results = await asyncio.gather(
+                *(process_entry(audio_file, entry, audio_tasks[audio_file]) for audio_file, entry in entries.items()),
+                return_exceptions=True
+            )
+        finally:
+            await self.audio_processor.aclose()
+        
+        # Keep the narration lines of the clips that rendered, so audio and video stay aligned
+        processed_videos, kept_tracks, kept_slots = [], [], []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Task failed with exception: {result}")
+            elif result:
+                video, narration_line = result
+                processed_videos.append(video)
+                if narration_line:
+                    kept_tracks.append(narration_line[0])
+                    kept_slots.append(narration_line[1])
+        
+        if use_narration and processed_videos:
+            self.pipeline.write_narration_track(kept_tracks, kept_slots, self.narration_track_path)
+        
+        logger.info(f"Successfully processed {len(processed_videos)} videos")
+        return processed_videos
+    
     async def _process_dynamic_pairing(self, prompts_data: Dict[str, str], audio_dir: str, videos_dir: str) -> List[str]:
         """
         Process videos by dynamically pairing audio files with videos.
@@ -403,9 +667,18 @@ class VideoProcessorService:
         # Process videos using the pipeline
         processed_videos = []
         
+        # Narration assembly needs a real audio file for every clip
+        use_narration = self.use_narration_assembler and video_data and \
+            not any(data.get("no_audio") for data in video_data.values())
+        if not use_narration and os.path.exists(self.narration_track_path):
+            os.remove(self.narration_track_path)
+        
         try:
             # Start the video processing pipeline
-            processed_videos = await self.pipeline.process_videos(video_data)
+            if use_narration:
+                processed_videos = await self.pipeline.process_videos_with_narration(video_data, self.narration_track_path)
+            else:
+                processed_videos = await self.pipeline.process_videos(video_data)
             logger.info(f"Successfully processed {len(processed_videos)} videos")
         except Exception as e:
             logger.error(f"Error processing videos: {e}")
@@ -415,7 +688,8 @@ class VideoProcessorService:
         return processed_videos
     
     async def apply_youtube_audio(self, video_path: str, youtube_url: str, output_path: str = None, 
-                                 start_time: float = 0.0, trim_audio: float = 0.0, volume: float = 1.0) -> str:
+                                 start_time: float = 0.0, trim_audio: float = 0.0, volume: float = 1.0,
+                                 voice_file: Optional[str] = None) -> str:
         """
         Apply YouTube audio to a video.
         
@@ -426,6 +700,7 @@ class VideoProcessorService:
             start_time: Start time in seconds to begin the audio in the video
             trim_audio: Trim the beginning of the YouTube audio by this many seconds
             volume: Volume of the YouTube audio (0.0-1.0)
+            voice_file: Narration track to mix with instead of the video's audio (optional)
             
         Returns:
             str: Path to the processed video
@@ -461,7 +736,8 @@ class VideoProcessorService:
                 output_file=output_path,
                 start_time=start_time,
                 trim_audio=trim_audio,
-                volume=volume
+                volume=volume,
+                voice_file=voice_file
             )
             logger.info(f"STEP 4: SUCCESSFULLY COMPLETED YOUTUBE AUDIO PROCESSING")
             logger.info(f"  - Final output: {result}")
@@ -474,7 +750,8 @@ class VideoProcessorService:
             return video_path
             
     async def concatenate_videos(self, video_files: List[str], output_path: str, project_id: str = None, 
-                               youtube_audio: Optional[Dict[str, Any]] = None) -> str:
+                               youtube_audio: Optional[Dict[str, Any]] = None,
+                               narration_track: Optional[str] = None) -> str:
         """
         Concatenate multiple videos into a single file.
         Optionally apply YouTube audio to the final video.
@@ -490,6 +767,8 @@ class VideoProcessorService:
                                "trim_audio": 0.0,
                                "volume": 1.0
                            }
+            narration_track: Optional assembled narration track to mux into the
+                             concatenated (silent) video
             
         Returns:
             str: Path to the concatenated video
@@ -515,6 +794,19 @@ class VideoProcessorService:
                 project_id=project_id
             )
             
+            # Keep the music-free master so the music can be re-scored later. With an assembled
+            # narration the master stays silent and the narration is kept as an uncompressed
+            # stem, so the final mix below is the narration's only encode.
+            master_path = None
+            narration_stem = None
+            if final_video_path:
+                master_path = os.path.join(output_dir, MASTER_FILE)
+                await asyncio.to_thread(shutil.copyfile, final_video_path, master_path)
+                if narration_track and os.path.exists(narration_track):
+                    narration_stem = os.path.join(output_dir, os.path.basename(narration_track))
+                    await asyncio.to_thread(shutil.copyfile, narration_track, narration_stem)
+                logger.info(f"STEP 1b: SAVED MUSIC-FREE MASTER to {master_path}")
+            
             # STEP 2: PREPARE YOUTUBE AUDIO CONFIGURATION
             logger.info("STEP 2: PREPARING YOUTUBE AUDIO")
             
@@ -526,67 +818,20 @@ class VideoProcessorService:
                     logger.info(f"Using YouTube audio from config: {youtube_audio}")
                 # If no youtube_audio config, check music config for track_id
                 else:
-                    music_config = self.config_service.get_music_config()
-                    if music_config and "track_id" in music_config:
-                        track_id = music_config.get("track_id")
-                        if track_id:
-                            # Convert music config to youtube_audio format
-                            youtube_audio = {
-                                "url": f"https://www.youtube.com/watch?v={track_id}",
-                                "volume": music_config.get("volume", 0.5)
-                            }
-                            
-                            # Handle start_time conversion from "M:SS" to seconds if needed
-                            start_time = music_config.get("start_time", "0:00")
-                            if isinstance(start_time, str) and ":" in start_time:
-                                try:
-                                    minutes, seconds = start_time.split(":")
-                                    start_time_seconds = float(minutes) * 60 + float(seconds)
-                                    youtube_audio["start_time"] = start_time_seconds
-                                except Exception as e:
-                                    logger.error(f"Error converting music start_time '{start_time}' to seconds: {e}")
-                                    youtube_audio["start_time"] = 0.0
-                            else:
-                                youtube_audio["start_time"] = float(start_time) if start_time else 0.0
-                                
-                            # Add trim_audio parameter from music config
-                            if "trim_audio" in music_config:
-                                youtube_audio["trim_audio"] = float(music_config.get("trim_audio"))
-                            
-                            logger.info(f"Using music track_id '{track_id}' as YouTube audio: {youtube_audio}")
-            
-            # STEP 3: APPLY YOUTUBE AUDIO AND CREATE FINAL OUTPUT
-            if youtube_audio and final_video_path:
-                youtube_url = youtube_audio.get("url")
-                if youtube_url:
-                    logger.info(f"STEP 3: APPLYING YOUTUBE AUDIO from {youtube_url} to concatenated video")
-                    # Create a temporary path for the intermediate version
-                    temp_path = final_video_path.replace(".mp4", "_temp.mp4")
-                    
-                    # Rename the final video to a temporary name
-                    os.rename(final_video_path, temp_path)
-                    
-                    # Apply YouTube audio
-                    final_video_path = await self.apply_youtube_audio(
-                        video_path=temp_path,
-                        youtube_url=youtube_url,
-                        output_path=final_video_path,
-                        start_time=youtube_audio.get("start_time", 0.0),
-                        trim_audio=youtube_audio.get("trim_audio", 0.0),
-                        volume=youtube_audio.get("volume", 1.0)
-                    )
-                    
-                    # Clean up temporary file
-                    if os.path.exists(temp_path) and final_video_path != temp_path:
-                        try:
-                            os.remove(temp_path)
-                            logger.info("Temporary concatenated file removed after adding YouTube audio")
-                        except Exception as e:
-                            logger.warning(f"Failed to clean up temporary file: {e}")
-                    
-                    logger.info(f"STEP 4: FINAL OUTPUT CREATED at {final_video_path}")
-            else:
-                logger.info(f"STEP 3: NO YOUTUBE AUDIO APPLIED. FINAL OUTPUT at {final_video_path}")
+                    youtube_audio = self._youtube_audio_from_music(self.config_service.get_music_config())
+            
+            # STEP 3: APPLY YOUTUBE AUDIO (AND NARRATION) AND CREATE FINAL OUTPUT
+            if final_video_path:
+                final_video_path = await self._mix_final_audio(final_video_path, youtube_audio, narration_stem)
+            
+            if master_path:
+                self._save_master_record(output_dir, {
+                    "master": master_path,
+                    "narration_stem": narration_stem,
+                    "master_has_voice": narration_stem is None,
+                    "final": final_video_path,
+                    "youtube_audio": youtube_audio
+                })
             
             return final_video_path
             
@@ -594,4 +839,163 @@ class VideoProcessorService:
             logger.error(f"Error concatenating videos: {e}")
             import traceback
             logger.debug(f"Traceback: {traceback.format_exc()}")
-            return None 
\ No newline at end of file
+            return None 
+    
+    async def _mix_final_audio(self, video_path: str, youtube_audio: Optional[Dict[str, Any]],
+                               narration_stem: Optional[str]) -> str:
+        """
+        Give the concatenated video its final audio in one encode: the music mixed under the
+        video's audio or the narration stem, or the narration stem alone.
+        
+        Args:
+            video_path: Concatenated video, replaced by the final video
+            youtube_audio: YouTube audio configuration (None for no music)
+            narration_stem: Uncompressed narration for a silent video (optional)
+            
+        Returns:
+            str: Path to the final video
+        """
+        youtube_url = (youtube_audio or {}).get("url")
+        if not youtube_url and not narration_stem:
+            logger.info(f"STEP 3: NO YOUTUBE AUDIO APPLIED. FINAL OUTPUT at {video_path}")
+            return video_path
+        
+        # Mix from a temporary copy into the final path
+        temp_path = video_path.replace(".mp4", "_temp.mp4")
+        os.rename(video_path, temp_path)
+        
+        if youtube_url:
+            logger.info(f"STEP 3: APPLYING YOUTUBE AUDIO from {youtube_url} to concatenated video")
+            final_video_path = await self.apply_youtube_audio(
+                video_path=temp_path,
+                youtube_url=youtube_url,
+                output_path=video_path,
+                start_time=youtube_audio.get("start_time", 0.0),
+                trim_audio=youtube_audio.get("trim_audio", 0.0),
+                volume=youtube_audio.get("volume", 1.0),
+                voice_file=narration_stem
+            )
+        else:
+            logger.info(f"STEP 3: ADDING NARRATION TRACK {narration_stem}")
+            final_video_path = await self.pipeline.audio_video_merger.process(
+                audio_file=narration_stem,
+                video_file=temp_path,
+                output_file=video_path
+            )
+        
+        if final_video_path == temp_path:
+            # The mix failed: keep what we have under the final name
+            os.rename(temp_path, video_path)
+            return video_path
+        
+        # Clean up temporary file
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except Exception as e:
+                logger.warning(f"Failed to clean up temporary file: {e}")
+        
+        logger.info(f"STEP 4: FINAL OUTPUT CREATED at {final_video_path}")
+        return final_video_path
+    
+    def _save_master_record(self, output_dir: str, record: Dict[str, Any]) -> None:
+        """
+        Write a project's master record (master, narration stem, final video and the music
+        applied), via a temporary file so readers never see a partial record.
+        
+        Args:
+            output_dir: Project output directory
+            record: Master record
+        """
+        record_path = os.path.join(output_dir, MASTER_RECORD_FILE)
+        fd, temp_path = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(record, f, indent=2)
+            os.replace(temp_path, record_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+    
+    async def rescore_video(self, project_id: str, music: Optional[Dict[str, Any]] = None,
+                            youtube_audio: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Re-mix a project's background music from its music-free master, without re-rendering.
+        The video stream is copied; only the audio is mixed again.
+        
+        Args:
+            project_id: Project ID of a completed render
+            music: Music settings (track_id, start_time, trim_audio, volume) overriding the
+                   music configuration; a null track_id removes the music
+            youtube_audio: YouTube audio configuration to use instead of music settings
+            
+        Returns:
+            str: Path to the re-scored final video
+            
+        Raises:
+            ValueError: If the project ID is not a single directory name
+            FileNotFoundError: If the project has no music-free master
+            RuntimeError: If the music mix fails
+        """
+        # Checked by the router too; never let the ID leave the output root
+        if not project_id or project_id in (".", "..") or project_id != os.path.basename(project_id):
+            raise ValueError(f"Invalid project ID: {project_id}")
+        
+        output_dir = f"./data/media/output/{project_id}"
+        record_path = os.path.join(output_dir, MASTER_RECORD_FILE)
+        if not os.path.exists(record_path):
+            raise FileNotFoundError(f"No music-free master for project {project_id}")
+        
+        with open(record_path, "r") as f:
+            record = json.load(f)
+        
+        master_path = record["master"]
+        final_path = record["final"]
+        if not os.path.exists(master_path):
+            raise FileNotFoundError(f"Master video missing: {master_path}")
+        
+        if youtube_audio is None:
+            music_config = dict(self.config_service.get_music_config() or {})
+            music_config.update(music or {})
+            youtube_audio = self._youtube_audio_from_music(music_config)
+        
+        # Masters of assembled narrations are silent; their voice is the narration stem
+        voice_file = None
+        if not record.get("master_has_voice", True):
+            voice_file = record.get("narration_stem")
+            if not voice_file or not os.path.exists(voice_file):
+                raise FileNotFoundError(f"Narration stem missing for project {project_id}")
+        
+        logger.info(f"===== RESCORING {project_id} with {youtube_audio or 'no music'} =====")
+        if youtube_audio and youtube_audio.get("url"):
+            result = await self.apply_youtube_audio(
+                video_path=master_path,
+                youtube_url=youtube_audio["url"],
+                output_path=final_path,
+                start_time=youtube_audio.get("start_time", 0.0),
+                trim_audio=youtube_audio.get("trim_audio", 0.0),
+                volume=youtube_audio.get("volume", 1.0),
+                voice_file=voice_file
+            )
+            if result != final_path:
+                raise RuntimeError(f"Music mix failed for project {project_id}")
+        elif voice_file:
+            # No music: mux the narration stem back in
+            temp_path = f"{final_path}.tmp.mp4"
+            result = await self.pipeline.audio_video_merger.process(
+                audio_file=voice_file,
+                video_file=master_path,
+                output_file=temp_path
+            )
+            if result != temp_path:
+                raise RuntimeError(f"Narration mux failed for project {project_id}")
+            os.replace(temp_path, final_path)
+        else:
+            # No music: the final video is the master
+            temp_path = f"{final_path}.tmp.mp4"
+            await asyncio.to_thread(shutil.copyfile, master_path, temp_path)
+            os.replace(temp_path, final_path)
+        
+        record["youtube_audio"] = youtube_audio
+        self._save_master_record(output_dir, record)
+        return final_path
@@ -5,6 +5,7 @@ This module provides a configuration service for the application.
 """
 
 import os
+import re
 import json
 import logging
 from typing import Any, Dict, Optional, Union, List
@@ -650,6 +651,30 @@ class ConfigService:
         
         # If not found, try to get from environment
         return os.environ.get(key, default)
+    
+    def get_env_list(self, key: str) -> List[str]:
+        """
+        Get every value of a multi-valued environment variable, e.g. a pool of API keys.
+        Values come from the variable itself (comma-separated) and from numbered variants
+        (KEY_1, KEY_2, ...), in that order, without duplicates.
+        
+        Args:
+            key (str): The environment variable key
+            
+        Returns:
+            List[str]: The values
+        """
+        names = [key] + sorted(
+            (name for name in set(self.env_vars) | set(os.environ) if re.fullmatch(rf"{re.escape(key)}_\d+", name)),
+            key=lambda name: int(name.rsplit("_", 1)[1])
+        )
+        
+        values = []
+        for name in names:
+            for value in str(self.get_env(name) or "").split(","):
+                if value.strip() and value.strip() not in values:
+                    values.append(value.strip())
+        return values
 
 @lru_cache()
 def get_config_service() -> ConfigService:
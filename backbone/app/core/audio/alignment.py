@@ -0,0 +1,154 @@
+"""
+Narration Alignment
+
+This module keeps the character-level timestamps returned by with-timestamps TTS next to
+each narration file (audio_1.mp3 -> audio_1.alignment.json) and turns them into word
+timings, so captions can follow when words are actually spoken.
+"""
+
+import os
+import json
+import logging
+import tempfile
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+ALIGNMENT_SUFFIX = ".alignment.json"
+
+def alignment_path(audio_path: str) -> str:
+    """
+    Get the path of the alignment sidecar of an audio file.
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        str: Path to the sidecar
+    """
+    return os.path.splitext(audio_path)[0] + ALIGNMENT_SUFFIX
+
+def slice_alignment(alignment: Dict[str, List], start: float, end: Optional[float]) -> Dict[str, List]:
+    """
+    Take the characters spoken between two times, re-timed to start at zero.
+
+    Args:
+        alignment: Provider alignment ("characters", "character_start_times_seconds",
+                   "character_end_times_seconds")
+        start: Start of the window in seconds
+        end: End of the window in seconds (None for the end of the audio)
+
+    Returns:
+        Dict[str, List]: Alignment of the window
+    """
+    sliced = {"characters": [], "character_start_times_seconds": [], "character_end_times_seconds": []}
+    for char, char_start, char_end in zip(
+        alignment["characters"], alignment["character_start_times_seconds"], alignment["character_end_times_seconds"]
+    ):
+        if char_start >= start and (end is None or char_start < end):
+            sliced["characters"].append(char)
+            sliced["character_start_times_seconds"].append(round(char_start - start, 3))
+            sliced["character_end_times_seconds"].append(round(char_end - start, 3))
+    return sliced
+
+def even_alignment(text: str, duration: float) -> Dict[str, List]:
+    """
+    Spread the characters of a text evenly over a duration (for backends without timestamps).
+
+    Args:
+        text: Narration text
+        duration: Audio duration in seconds
+
+    Returns:
+        Dict[str, List]: Alignment of the text
+    """
+    step = duration / max(len(text), 1)
+    return {
+        "characters": list(text),
+        "character_start_times_seconds": [round(i * step, 3) for i in range(len(text))],
+        "character_end_times_seconds": [round((i + 1) * step, 3) for i in range(len(text))]
+    }
+
+def word_timings(alignment: Dict[str, List]) -> List[Dict[str, Any]]:
+    """
+    Group aligned characters into words.
+
+    Args:
+        alignment: Character alignment
+
+    Returns:
+        List[Dict[str, Any]]: word, start and end (seconds) of each word, in order
+    """
+    words = []
+    current = None
+    for char, char_start, char_end in zip(
+        alignment["characters"], alignment["character_start_times_seconds"], alignment["character_end_times_seconds"]
+    ):
+        if char.isspace():
+            current = None
+            continue
+        if current is None:
+            current = {"word": "", "start": char_start, "end": char_end}
+            words.append(current)
+        current["word"] += char
+        current["end"] = char_end
+    return words
+
+def save_alignment(audio_path: str, text: str, alignment: Dict[str, List]) -> str:
+    """
+    Write the alignment sidecar of an audio file, atomically. The sidecar records the text
+    and the audio size, so it is ignored once the audio is regenerated for another line.
+
+    Args:
+        audio_path: Path to the audio file
+        text: Narration text
+        alignment: Character alignment
+
+    Returns:
+        str: Path to the sidecar
+    """
+    path = alignment_path(audio_path)
+    output_dir = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump({
+                "text": text,
+                "audio_size": os.path.getsize(audio_path),
+                "alignment": alignment,
+                "words": word_timings(alignment)
+            }, f)
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    return path
+
+def load_alignment(audio_path: str, text: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Read the alignment sidecar of an audio file, if it describes the file on disk.
+
+    Args:
+        audio_path: Path to the audio file
+        text: Narration text the audio should hold (optional)
+
+    Returns:
+        Optional[Dict[str, Any]]: text, audio_size, alignment and words, or None if missing or stale
+    """
+    path = alignment_path(audio_path)
+    if not os.path.exists(path) or not os.path.exists(audio_path):
+        return None
+
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable alignment {path}: {e}")
+        return None
+
+    if data.get("audio_size") != os.path.getsize(audio_path):
+        return None
+    if text is not None and data.get("text", "").strip() != text.strip():
+        return None
+    return data
@@ -1,13 +1,18 @@
 import os
 import json
+import asyncio
 import logging
-import time
-import random
-from typing import Dict, List, Union, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import tempfile
+from typing import Dict, List, Union, Optional, Tuple
 from dotenv import load_dotenv
 
 from app.core.audio.abstract_audio_generator import AbstractAudioGenerator
+from app.core.audio.elevenlabs_client import AsyncElevenLabsClient
+from app.core.audio.rate_control import TTSRateController
+from app.core.credential_pool import get_credential_pool
+from app.core.audio.batch_synthesis import group_lines, build_batch_text, line_boundaries, mp3_encoding, snap_to_frames, split_batch_audio
+from app.core.audio.alignment import ALIGNMENT_SUFFIX, alignment_path, save_alignment, slice_alignment
+from app.infrastructure.storage.tts_cache import TTSCache, TTS_CACHE_DIR, get_tts_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,24 +23,31 @@ class AudioGenerator(AbstractAudioGenerator):
     Implements the AbstractAudioGenerator interface.
     """
     
-    def __init__(self, api_key: Optional[str] = None, config: Optional[Dict] = None):
+    # Whether the backend needs an API key to synthesize
+    requires_api_key = True
+    
+    def __init__(self, api_key: Optional[Union[str, List[str]]] = None, config: Optional[Dict] = None):
         """
         Initialize the audio generator.
         
         Args:
-            api_key: ElevenLabs API key (optional, will default to environment variable)
+            api_key: ElevenLabs API key, or several to pool (optional, will default to environment variable)
             config: Configuration options for audio generation
         """
         # Load environment variables if not already loaded
         load_dotenv()
         
-        # Get API key from parameter, environment, or raise error
-        self.api_key = api_key or os.getenv("EL")
-        if not self.api_key:
+        # Get API keys from parameter, environment, or raise error
+        if isinstance(api_key, str):
+            api_key = [api_key]
+        self.api_keys = [key for key in (api_key or [os.getenv("EL")]) if key]
+        self.api_key = self.api_keys[0] if self.api_keys else None
+        if not self.api_key and self.requires_api_key:
             logger.warning("No ElevenLabs API key provided. Audio generation will not work.")
         
         # Default configuration
         self.config = {
+            "backend": "elevenlabs",             # TTS backend (see app.core.audio.backends)
             "voice_id": "hKUnzqLzU3P9IVhYHREu",  # Default voice
             "model_id": "eleven_flash_v2",       # Default model
             "stability": 0.5,
@@ -44,11 +56,21 @@ class AudioGenerator(AbstractAudioGenerator):
             "use_speaker_boost": True,
             "output_format": "mp3_44100_128",
             "audio_output_dir": "data/current",
-            "max_workers": 4,                    # Reduced from 8 to 4 to prevent connection issues
+            "max_workers": 4,                    # Initial TTS concurrency, adapted by the rate controller
+            "max_concurrency": 32,               # Upper bound for adaptive TTS concurrency
+            "characters_per_minute": None,       # Provider character quota (None for no quota)
             "max_retries": 3,                    # Number of retries for API calls
             "retry_delay": 2,                    # Initial delay between retries (in seconds)
             "max_retry_delay": 10,               # Maximum delay between retries (in seconds)
-            "jitter": 0.5                        # Random jitter factor for retry delays
+            "jitter": 0.5,                       # Random jitter factor for retry delays
+            "cache_enabled": True,               # Reuse audio for identical lines and voice settings
+            "cache_dir": TTS_CACHE_DIR,          # Shared cache outside the per-run directories
+            "cache_max_bytes": 2 * 1024 ** 3,    # Cache size before LRU eviction
+            "base_url": None,                    # API base URL override (e.g. a local mock server)
+            "batch_lines": 1,                    # Lines per batched TTS request (1 disables batching)
+            "batch_pause": 0.5,                  # Pause between batched lines in seconds
+            "batch_max_characters": 2500,        # Maximum characters per batched request
+            "timestamps": True                   # Request character timestamps and keep them next to each file
         }
         
         # Update default config with provided config
@@ -60,63 +82,147 @@ class AudioGenerator(AbstractAudioGenerator):
         
         # Lazy-load the ElevenLabs client when first needed
         self._client = None
+        
+        # FFmpeg executor for splitting batched audio, created when first needed
+        self._command_executor = None
+        
+        # Adaptive concurrency (AIMD on 429/5xx/latency) and character quota, per key when
+        # several keys are pooled (requests then go to the least-loaded healthy key). The pool
+        # is shared by every generator in the process, so key budgets and health carry over
+        # across jobs and concurrent jobs share them.
+        if len(self.api_keys) > 1:
+            self.rate_controller = get_credential_pool("ElevenLabs", self.api_keys, {
+                "initial_limit": self.config.get("max_workers", 4),
+                "max_limit": self.config.get("max_concurrency", 32),
+                "budget_per_minute": self.config.get("characters_per_minute")
+            })
+        else:
+            self.rate_controller = TTSRateController({
+                "initial_limit": self.config.get("max_workers", 4),
+                "max_limit": max(self.config.get("max_concurrency", 32), self.config.get("max_workers", 4)),
+                "characters_per_minute": self.config.get("characters_per_minute")
+            })
+        
+        # SHA-256 checksums of generated files, computed while streaming
+        self.checksums: Dict[str, str] = {}
+        
+        # Content-hash TTS cache shared across projects
+        self.tts_cache: Optional[TTSCache] = None
+        if self.config.get("cache_enabled", True):
+            self.tts_cache = get_tts_cache(self.config["cache_dir"], self.config["cache_max_bytes"])
     
     @property
-    def client(self):
-        """Get the ElevenLabs client, initializing it if needed."""
+    def client(self) -> Optional[AsyncElevenLabsClient]:
+        """Get the pooled async ElevenLabs client, initializing it if needed."""
         if self._client is None and self.api_key:
-            try:
-                from elevenlabs.client import ElevenLabs
-                self._client = ElevenLabs(api_key=self.api_key)
-            except ImportError:
-                logger.error("elevenlabs package is not installed. Please install it using: pip install elevenlabs")
-                raise
+            client_config = {
+                "max_connections": max(self.config.get("max_concurrency", 32), self.config.get("max_workers", 4)) * len(self.api_keys),
+                "max_retries": self.config.get("max_retries", 3),
+                "retry_delay": self.config.get("retry_delay", 2),
+                "max_retry_delay": self.config.get("max_retry_delay", 10),
+                "jitter": self.config.get("jitter", 0.5)
+            }
+            if self.config.get("base_url"):
+                client_config["base_url"] = self.config["base_url"]
+            
+            self._client = AsyncElevenLabsClient(
+                api_key=self.api_key,
+                rate_controller=self.rate_controller,
+                config=client_config
+            )
         return self._client
     
-    def _with_retry(self, func, *args, **kwargs):
+    @property
+    def command_executor(self):
+        """Get the FFmpeg command executor, initializing it if needed."""
+        if self._command_executor is None:
+            from app.infrastructure.ffmpeg.factories import create_command_executor
+            self._command_executor = create_command_executor()
+        return self._command_executor
+    
+    async def aclose(self):
+        """Close the pooled HTTP connections."""
+        if self._client is not None:
+            await self._client.aclose()
+    
+    def is_current(self, output_path: str, text: str) -> bool:
         """
-        Execute a function with retry logic for handling API connection issues.
+        Check whether an existing audio file can be reused for a line.
+        With the cache enabled, the file must hold the cached audio for exactly this
+        text and these voice settings, so stale files from another script are regenerated.
         
         Args:
-            func: Function to execute
-            *args: Positional arguments to pass to the function
-            **kwargs: Keyword arguments to pass to the function
+            output_path: Path of the audio file
+            text: Narration text
             
         Returns:
-            The result of the function call
+            bool: True if the file can be reused
         """
-        max_retries = self.config.get("max_retries", 3)
-        base_delay = self.config.get("retry_delay", 2)
-        max_delay = self.config.get("max_retry_delay", 10)
-        jitter = self.config.get("jitter", 0.5)
+        if not os.path.exists(output_path):
+            return False
+        if self.tts_cache is None:
+            return True
+        return self.tts_cache.matches(TTSCache.make_key(text, self.config), output_path)
+    
+    def _from_cache(self, text: str, output_path: str) -> bool:
+        """
+        Link the cached audio for a line into the workspace, if the cache has it.
         
-        last_exception = None
+        Args:
+            text: Narration text
+            output_path: Path of the audio file
+            
+        Returns:
+            bool: True on a cache hit
+        """
+        if self.tts_cache is None:
+            return False
         
-        for attempt in range(max_retries + 1):
-            try:
-                if attempt > 0:
-                    logger.info(f"Retry attempt {attempt}/{max_retries}...")
-                
-                return func(*args, **kwargs)
-                
-            except Exception as e:
-                last_exception = e
-                
-                if attempt < max_retries:
-                    # Calculate exponential backoff with jitter
-                    delay = min(base_delay * (2 ** attempt), max_delay)
-                    delay = delay * (1 + random.uniform(-jitter, jitter))
-                    
-                    # Log the error and retry information
-                    logger.warning(f"Error during API call: {e}. Retrying in {delay:.2f} seconds...")
-                    time.sleep(delay)
-                else:
-                    logger.error(f"All {max_retries} retry attempts failed: {e}")
-                    raise last_exception
+        cached_path = self.tts_cache.lookup(TTSCache.make_key(text, self.config), os.path.splitext(output_path)[1])
+        if not cached_path:
+            return False
+        
+        self.tts_cache.link_into(cached_path, output_path)
+        
+        # Bring the line's timestamps along, when they were cached with it
+        cached_alignment = self.tts_cache.path_for(TTSCache.make_key(text, self.config), ALIGNMENT_SUFFIX)
+        if os.path.exists(cached_alignment):
+            self.tts_cache.link_into(cached_alignment, alignment_path(output_path))
+        
+        logger.info(f"TTS cache hit, linked {cached_path} to {output_path}")
+        return True
+    
+    def _store_line(self, text: str, output_path: str, alignment: Optional[Dict] = None) -> None:
+        """
+        Record a generated line: write its timestamps next to it and add both to the cache.
+        
+        Args:
+            text: Narration text
+            output_path: Path of the audio file
+            alignment: Character alignment of the audio (optional)
+        """
+        if alignment:
+            save_alignment(output_path, text, alignment)
+        
+        if self.tts_cache is not None:
+            key = TTSCache.make_key(text, self.config)
+            self.tts_cache.store(key, output_path)
+            if alignment:
+                self.tts_cache.store(key, alignment_path(output_path), ALIGNMENT_SUFFIX)
+    
+    def _voice_settings(self) -> Dict:
+        """Get the voice settings sent with each request."""
+        return {
+            "stability": self.config.get("stability", 0.5),
+            "similarity_boost": self.config.get("similarity_boost", 0.75),
+            "speed": self.config.get("speed", 1.15),
+            "use_speaker_boost": self.config.get("use_speaker_boost", True)
+        }
     
     def generate_audio(self, text: str, output_path: Optional[str] = None) -> str:
         """
-        Generate a single audio file from text.
+        Generate a single audio file from text (blocking).
+        Use generate_audio_async from async code.
         
         Args:
             text: Text to convert to audio
@@ -125,63 +231,209 @@ class AudioGenerator(AbstractAudioGenerator):
         Returns:
             str: Path to the generated audio file
         """
-        # Check if client is available
-        if not self.client:
-            raise ValueError("ElevenLabs client is not initialized. Check API key.")
+        async def _run():
+            try:
+                return await self.generate_audio_async(text, output_path)
+            finally:
+                await self.aclose()
         
+        return asyncio.run(_run())
+    
+    async def generate_audio_async(self, text: str, output_path: Optional[str] = None) -> str:
+        """
+        Generate a single audio file from text.
+        
+        Args:
+            text: Text to convert to audio
+            output_path: Path to save the audio file (optional)
+            
+        Returns:
+            str: Path to the generated audio file
+        """
         # Check if output file already exists
-        if output_path and os.path.exists(output_path):
+        if output_path and self.is_current(output_path, text):
             logger.info(f"Audio file already exists, skipping generation: {output_path}")
             return output_path
         
+        # Determine output path if not provided
+        if not output_path:
+            output_path = os.path.join(self.config["audio_output_dir"], f"audio_{os.urandom(4).hex()}.mp3")
+        
+        # Reuse audio generated for the same line and voice settings by any project
+        if self._from_cache(text, output_path):
+            return output_path
+        
         try:
             logger.info(f"Generating audio for text: {text[:50]}{'...' if len(text) > 50 else ''}")
             
-            # Set voice settings
-            voice_settings = {
-                "stability": self.config.get("stability", 0.5),
-                "similarity_boost": self.config.get("similarity_boost", 0.75),
-                "speed": self.config.get("speed", 1.15),
-                "use_speaker_boost": self.config.get("use_speaker_boost", True)
-            }
-            
-            # Convert text to speech with retry logic
-            def _generate_audio():
-                audio_generator = self.client.text_to_speech.convert(
-                    text=text,
-                    voice_id=self.config.get("voice_id"),
-                    model_id=self.config.get("model_id"),
-                    output_format=self.config.get("output_format"),
-                    voice_settings=voice_settings
-                )
-                return b"".join(audio_generator)
-            
-            # Execute with retry
-            audio_bytes = self._with_retry(_generate_audio)
-            
-            # Determine output path if not provided
-            if not output_path:
-                output_path = os.path.join(self.config["audio_output_dir"], f"audio_{os.urandom(4).hex()}.mp3")
-            
-            # Ensure the directory exists
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            result = await self._synthesize(text, output_path)
+            self.checksums[output_path] = result["sha256"]
+            self._store_line(text, output_path, result.get("alignment"))
             
-            # Write audio bytes to file
-            with open(output_path, "wb") as f:
-                f.write(audio_bytes)
-            
-            logger.info(f"Generated audio file: {output_path}")
+            logger.info(f"Generated audio file: {output_path} ({result['size']} bytes, sha256 {result['sha256'][:12]})")
             return output_path
         
+        except asyncio.CancelledError:
+            logger.info(f"Audio generation cancelled: {output_path}")
+            raise
         except Exception as e:
             logger.error(f"Error generating audio: {e}")
             import traceback
             logger.debug(f"Traceback: {traceback.format_exc()}")
             raise
     
+    async def _synthesize(self, text: str, output_path: str) -> Dict:
+        """
+        Synthesize one line to a file. Backends override this.
+        
+        Args:
+            text: Text to convert to audio
+            output_path: Path to save the audio file
+            
+        Returns:
+            Dict: path, size (bytes) and sha256 of the written file, and the
+                  character alignment if timestamps were requested
+        """
+        # Check if client is available
+        if not self.client:
+            raise ValueError("ElevenLabs client is not initialized. Check API key.")
+        
+        if self.config.get("timestamps"):
+            return await self.client.text_to_speech_with_timestamps_to_file(
+                text=text,
+                output_path=output_path,
+                voice_id=self.config.get("voice_id"),
+                model_id=self.config.get("model_id"),
+                output_format=self.config.get("output_format"),
+                voice_settings=self._voice_settings()
+            )
+        
+        # Stream text to speech to disk; the file appears atomically once complete
+        # (the client retries with async backoff)
+        return await self.client.text_to_speech_to_file(
+            text=text,
+            output_path=output_path,
+            voice_id=self.config.get("voice_id"),
+            model_id=self.config.get("model_id"),
+            output_format=self.config.get("output_format"),
+            voice_settings=self._voice_settings()
+        )
+    
+    async def generate_batch_async(self, items: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Generate several consecutive lines with one request.
+        
+        The lines are sent as one text separated by explicit pauses, and the returned audio is
+        split back into per-line files at the middle of each pause, located with the provider's
+        character-level timestamps. Lines already on disk or in the cache are skipped; if the
+        batched request or the split fails, the remaining lines are generated one by one.
+        
+        Args:
+            items: (text, output_path) of each line, in narration order
+            
+        Returns:
+            List[Optional[str]]: Path of each line's audio file, or None if it failed
+        """
+        results = [None] * len(items)
+        pending = []
+        for i, (text, output_path) in enumerate(items):
+            if self.is_current(output_path, text) or self._from_cache(text, output_path):
+                results[i] = output_path
+            else:
+                pending.append(i)
+        
+        # Splitting copies MP3 frames, so only MP3 output is batched
+        if len(pending) > 1 and mp3_encoding(self.config.get("output_format")):
+            try:
+                paths = await self._synthesize_batch([items[i] for i in pending])
+                for i, path in zip(pending, paths):
+                    results[i] = path
+                pending = []
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Batched TTS failed, generating {len(pending)} lines separately: {e}")
+        
+        async def generate_line(i: int):
+            try:
+                results[i] = await self.generate_audio_async(*items[i])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error generating audio for {items[i][1]}: {e}")
+        
+        await asyncio.gather(*(generate_line(i) for i in pending))
+        return results
+    
+    async def _synthesize_batch(self, items: List[Tuple[str, str]]) -> List[str]:
+        """
+        Synthesize lines in one request with timestamps and split the audio per line.
+        
+        Args:
+            items: (text, output_path) of each line, in narration order
+            
+        Returns:
+            List[str]: Paths of the per-line audio files
+        """
+        if not self.client:
+            raise ValueError("ElevenLabs client is not initialized. Check API key.")
+        
+        lines = [text for text, _ in items]
+        output_paths = [output_path for _, output_path in items]
+        output_dir = os.path.dirname(output_paths[0]) or "."
+        os.makedirs(output_dir, exist_ok=True)
+        
+        logger.info(f"Generating {len(lines)} lines in one batched request")
+        fd, batch_file = tempfile.mkstemp(dir=output_dir, suffix=".batch.mp3")
+        os.close(fd)
+        try:
+            result = await self.client.text_to_speech_with_timestamps_to_file(
+                text=build_batch_text(lines, self.config.get("batch_pause", 0.5)),
+                output_path=batch_file,
+                voice_id=self.config.get("voice_id"),
+                model_id=self.config.get("model_id"),
+                output_format=self.config.get("output_format"),
+                voice_settings=self._voice_settings()
+            )
+            boundaries = snap_to_frames(line_boundaries(result["alignment"], lines), self.config.get("output_format"))
+            await split_batch_audio(self.command_executor, batch_file, boundaries, output_paths)
+        finally:
+            if os.path.exists(batch_file):
+                os.unlink(batch_file)
+        
+        for (text, output_path), (start, end) in zip(items, boundaries):
+            alignment = slice_alignment(result["alignment"], start, end) if self.config.get("timestamps") else None
+            self._store_line(text, output_path, alignment)
+        
+        logger.info(f"Split batched audio into {len(output_paths)} files")
+        return output_paths
+    
     def batch_generate(self, entries: Union[Dict[str, str], List[Dict], List[tuple]]) -> List[str]:
+        """
+        Generate multiple audio files from a list of text entries (blocking).
+        Use batch_generate_async from async code.
+        
+        Args:
+            entries: A dictionary with keys as file indexes and values as text,
+                    or a list of dictionaries with 'index' and 'text' keys,
+                    or a list of (index, text) tuples
+                    
+        Returns:
+            List[str]: List of paths to generated audio files
+        """
+        async def _run():
+            try:
+                return await self.batch_generate_async(entries)
+            finally:
+                await self.aclose()
+        
+        return asyncio.run(_run())
+    
+    async def batch_generate_async(self, entries: Union[Dict[str, str], List[Dict], List[tuple]]) -> List[str]:
         """
         Generate multiple audio files from a list of text entries.
+        Requests run concurrently on the pooled client; the rate controller
+        adapts concurrency to the provider's limits.
         
         Args:
             entries: A dictionary with keys as file indexes and values as text,
@@ -224,67 +476,71 @@ class AudioGenerator(AbstractAudioGenerator):
         results = [None] * len(audio_entries)  # Pre-allocate results list
         failed_entries = []  # Track failed entries for retry
         
-        # Use lower concurrency to prevent connection issues
-        max_workers = min(self.config.get("max_workers", 4), 4)
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_idx = {}
+        async def generate_entry(list_idx: int, entry: Dict):
+            output_path = os.path.join(self.config["audio_output_dir"], f"audio_{entry['index']}.mp3")
             
-            for list_idx, entry in enumerate(audio_entries):
-                index = entry["index"]
-                text = entry["text"]
-                output_path = os.path.join(self.config["audio_output_dir"], f"audio_{index}.mp3")
-                
-                # Skip if file already exists
-                if os.path.exists(output_path):
-                    logger.info(f"Audio file already exists, skipping: {output_path}")
-                    results[list_idx] = output_path
-                    continue
-                
-                # Submit task to thread pool
-                future = executor.submit(self.generate_audio, text, output_path)
-                future_to_idx[future] = list_idx
+            # Skip if file already exists
+            if self.is_current(output_path, entry["text"]):
+                logger.info(f"Audio file already exists, skipping: {output_path}")
+                results[list_idx] = output_path
+                return
             
-            # Collect results as they complete
-            for future in as_completed(future_to_idx):
-                idx = future_to_idx[future]
-                entry = audio_entries[idx]
-                try:
-                    output_path = future.result()
-                    results[idx] = output_path
-                    logger.info(f"Successfully generated audio for index {entry['index']}")
-                except Exception as e:
-                    logger.error(f"Error in batch generation for index {entry['index']}: {e}")
-                    failed_entries.append(entry)
+            try:
+                results[list_idx] = await self.generate_audio_async(entry["text"], output_path)
+                logger.info(f"Successfully generated audio for index {entry['index']}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in batch generation for index {entry['index']}: {e}")
+                failed_entries.append((list_idx, entry))
         
-        # Retry failed entries sequentially to avoid overwhelming the API
+        async def generate_group(group: List[int]):
+            group_results = await self.generate_batch_async([
+                (audio_entries[i]["text"], os.path.join(self.config["audio_output_dir"], f"audio_{audio_entries[i]['index']}.mp3"))
+                for i in group
+            ])
+            for i, result in zip(group, group_results):
+                if result:
+                    results[i] = result
+                else:
+                    failed_entries.append((i, audio_entries[i]))
+        
+        batch_lines = self.config.get("batch_lines", 1)
+        if batch_lines > 1:
+            # Consecutive lines share one request and are split by timestamps
+            groups = group_lines(
+                list(range(len(audio_entries))),
+                [entry["text"] for entry in audio_entries],
+                batch_lines,
+                self.config.get("batch_max_characters", 2500)
+            )
+            await asyncio.gather(*(generate_group(group) for group in groups))
+        else:
+            await asyncio.gather(*(generate_entry(i, entry) for i, entry in enumerate(audio_entries)))
+        
+        # Retry failed entries once more; the rate controller has already backed off
         if failed_entries:
-            logger.info(f"Retrying {len(failed_entries)} failed entries sequentially...")
-            for entry in failed_entries:
-                index = entry["index"]
-                text = entry["text"]
-                output_path = os.path.join(self.config["audio_output_dir"], f"audio_{index}.mp3")
-                
+            logger.info(f"Retrying {len(failed_entries)} failed entries...")
+            
+            async def retry_entry(list_idx: int, entry: Dict):
+                output_path = os.path.join(self.config["audio_output_dir"], f"audio_{entry['index']}.mp3")
                 try:
-                    # Retry with longer timeout and exponential backoff
-                    # Find the original index in audio_entries
-                    for i, orig_entry in enumerate(audio_entries):
-                        if orig_entry["index"] == index:
-                            original_idx = i
-                            break
-                    else:
-                        original_idx = -1
-                    
-                    # Try to generate again with more conservative settings
-                    output_path = self.generate_audio(text, output_path)
-                    if original_idx >= 0:
-                        results[original_idx] = output_path
+                    results[list_idx] = await self.generate_audio_async(entry["text"], output_path)
+                except asyncio.CancelledError:
+                    raise
                 except Exception as e:
-                    logger.error(f"Final retry failed for index {index}: {e}")
+                    logger.error(f"Final retry failed for index {entry['index']}: {e}")
+            
+            await asyncio.gather(*(retry_entry(list_idx, entry) for list_idx, entry in failed_entries))
         
         # Filter out None results
         valid_results = [r for r in results if r is not None]
         logger.info(f"Generated {len(valid_results)} audio files out of {len(audio_entries)} entries")
+        logger.info(f"TTS rate control: {self.rate_controller.stats()}")
+        
+        if self.tts_cache is not None:
+            stats = self.tts_cache.stats()
+            logger.info(f"TTS cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries ({stats['size_bytes']} bytes)")
         
         return valid_results
 
@@ -329,7 +585,7 @@ class AudioGenerator(AbstractAudioGenerator):
             # Convert dictionary to list of entries for batch_generate
             batch_entries = [{"index": idx, "text": text} for idx, text in entries.items()]
             
-            # Generate audio files with reduced concurrency
+            # Generate audio files
             return self.batch_generate(batch_entries)
             
         except Exception as e:
@@ -0,0 +1,54 @@
+"""
+TTS Backends
+
+This module provides the registry of TTS backends. The backend is selected with
+voice.backend in config.json ("elevenlabs" by default, or "offline").
+"""
+
+import logging
+from typing import Dict, List, Optional, Type, Union
+
+from app.core.audio.audio_generator import AudioGenerator
+from app.core.audio.offline_audio_generator import OfflineAudioGenerator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTS_BACKEND = "elevenlabs"
+
+TTS_BACKENDS: Dict[str, Type[AudioGenerator]] = {}
+
+def register_tts_backend(name: str, generator_class: Type[AudioGenerator]) -> None:
+    """
+    Register a TTS backend.
+
+    Args:
+        name: Backend name used in the voice config
+        generator_class: AudioGenerator subclass implementing the backend
+    """
+    TTS_BACKENDS[name] = generator_class
+
+def create_audio_generator(config: Optional[Dict] = None,
+                           api_key: Optional[Union[str, List[str]]] = None) -> AudioGenerator:
+    """
+    Create the audio generator for the backend named in the config.
+
+    Args:
+        config: Audio generation config, with "backend" naming the backend
+        api_key: API key for backends that need one, or several to pool
+
+    Returns:
+        AudioGenerator: The audio generator
+
+    Raises:
+        ValueError: If the backend is not registered
+    """
+    config = config or {}
+    backend = config.get("backend") or DEFAULT_TTS_BACKEND
+    if backend not in TTS_BACKENDS:
+        raise ValueError(f"Unknown TTS backend '{backend}'. Available backends: {', '.join(sorted(TTS_BACKENDS))}")
+
+    logger.info(f"Using TTS backend: {backend}")
+    return TTS_BACKENDS[backend](api_key=api_key, config=config)
+
+register_tts_backend("elevenlabs", AudioGenerator)
+register_tts_backend("offline", OfflineAudioGenerator)
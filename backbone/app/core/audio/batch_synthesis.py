@@ -0,0 +1,183 @@
+"""
+Batched Synthesis
+
+This module provides the pieces of batched TTS: grouping consecutive narration lines into
+one request separated by explicit pauses, locating each line in the provider's
+character-level alignment, and splitting the returned audio back into per-line files
+with a single FFmpeg process. The split copies whole MP3 frames, so the lines keep the
+provider's encoding and the only lossy generation is the provider's own.
+"""
+
+import os
+import re
+import shlex
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+from app.core.ffmpeg.interfaces import FFmpegCommandExecutor
+
+logger = logging.getLogger(__name__)
+
+def group_lines(items: List[Any], texts: List[str], max_lines: int, max_characters: int) -> List[List[Any]]:
+    """
+    Group consecutive items into batches of at most max_lines lines and max_characters characters.
+
+    Args:
+        items: Items to group, in narration order
+        texts: Text of each item
+        max_lines: Maximum lines per batch
+        max_characters: Maximum characters per batch (a longer single line gets its own batch)
+
+    Returns:
+        List[List[Any]]: Batches of consecutive items
+    """
+    groups, current, characters = [], [], 0
+    for item, text in zip(items, texts):
+        if current and (len(current) >= max_lines or characters + len(text) > max_characters):
+            groups.append(current)
+            current, characters = [], 0
+        current.append(item)
+        characters += len(text)
+
+    if current:
+        groups.append(current)
+    return groups
+
+def build_batch_text(lines: List[str], pause: float) -> str:
+    """
+    Join lines into one request text with an explicit pause between them.
+
+    Args:
+        lines: Narration lines
+        pause: Pause between lines in seconds
+
+    Returns:
+        str: The request text
+    """
+    separator = f' <break time="{pause:.2f}s" /> '
+    return separator.join(line.strip() for line in lines)
+
+def line_boundaries(alignment: Dict[str, List], lines: List[str]) -> List[Tuple[float, Optional[float]]]:
+    """
+    Find where each line starts and ends in the batch audio from a character alignment.
+    Cuts are placed in the middle of the pause between lines.
+
+    Args:
+        alignment: Provider alignment with "characters", "character_start_times_seconds"
+                   and "character_end_times_seconds"
+        lines: The lines that were batched, in order
+
+    Returns:
+        List[Tuple[float, Optional[float]]]: (start, end) of each line in seconds;
+                                             the last line ends with the audio (None)
+
+    Raises:
+        ValueError: If a line can't be located in the alignment
+    """
+    characters = "".join(alignment["characters"])
+    starts = alignment["character_start_times_seconds"]
+    ends = alignment["character_end_times_seconds"]
+
+    # Match on letters and digits only, so provider text normalization of spacing and
+    # punctuation doesn't break the search
+    index_map = [i for i, char in enumerate(characters) if char.isalnum()]
+    normalized = "".join(characters[i].lower() for i in index_map)
+
+    spans = []
+    cursor = 0
+    for line in lines:
+        needle = re.sub(r"[^0-9a-z]", "", line.lower())
+        position = normalized.find(needle, cursor) if needle else -1
+        if position < 0:
+            raise ValueError(f"Line not found in alignment: {line[:50]}")
+        first, last = index_map[position], index_map[position + len(needle) - 1]
+        spans.append((starts[first], ends[last]))
+        cursor = position + len(needle)
+
+    boundaries = []
+    for i in range(len(spans)):
+        start = 0.0 if i == 0 else (spans[i - 1][1] + spans[i][0]) / 2
+        end = None if i == len(spans) - 1 else (spans[i][1] + spans[i + 1][0]) / 2
+        boundaries.append((start, end))
+    return boundaries
+
+def mp3_encoding(output_format: str) -> Optional[Dict[str, int]]:
+    """
+    Get the sample rate and bitrate of an MP3 output format (e.g. mp3_44100_128).
+
+    Args:
+        output_format: Provider output format
+
+    Returns:
+        Optional[Dict[str, int]]: sample_rate and bitrate (kbps), or None if not MP3
+    """
+    match = re.fullmatch(r"mp3_(\d+)_(\d+)", output_format or "")
+    if not match:
+        return None
+    return {"sample_rate": int(match.group(1)), "bitrate": int(match.group(2))}
+
+def snap_to_frames(boundaries: List[Tuple[float, Optional[float]]], output_format: str) -> List[Tuple[float, Optional[float]]]:
+    """
+    Move line boundaries to the nearest MP3 frame boundary, so the audio can be split by
+    copying frames. Cuts fall in the pause between lines, where a shift of under one frame
+    (about 26 ms at 44.1 kHz) is silent.
+
+    Args:
+        boundaries: (start, end) of each line in seconds
+        output_format: Provider output format (e.g. mp3_44100_128)
+
+    Returns:
+        List[Tuple[float, Optional[float]]]: The boundaries on frame boundaries
+    """
+    sample_rate = (mp3_encoding(output_format) or {"sample_rate": 44100})["sample_rate"]
+    # MPEG-1 Layer III frames hold 1152 samples; the MPEG-2 rates below 32 kHz hold 576
+    frame = (1152 if sample_rate >= 32000 else 576) / sample_rate
+
+    def snap(time: float) -> float:
+        return round(time / frame) * frame
+
+    return [(snap(start), None if end is None else snap(end)) for start, end in boundaries]
+
+async def split_batch_audio(
+    command_executor: FFmpegCommandExecutor,
+    batch_file: str,
+    boundaries: List[Tuple[float, Optional[float]]],
+    output_paths: List[str]
+) -> List[str]:
+    """
+    Split batch audio into per-line MP3 files with one FFmpeg process, copying the MP3
+    frames of each line without decoding or re-encoding them (see snap_to_frames).
+    Each output is written to a temporary file and renamed into place.
+
+    Args:
+        command_executor: Command executor for running FFmpeg
+        batch_file: Path to the batch audio (MP3)
+        boundaries: (start, end) of each line in seconds, on frame boundaries
+        output_paths: Path of each line's audio file
+
+    Returns:
+        List[str]: The output paths
+    """
+    temp_paths = [
+        os.path.join(os.path.dirname(path) or ".", f".{os.path.basename(path)}.{os.getpid()}.split.mp3")
+        for path in output_paths
+    ]
+
+    # Seeking and stopping as output options applies per output, so the batch is read once
+    cmd_parts = ["ffmpeg", "-i", batch_file]
+    for (start, end), temp_path in zip(boundaries, temp_paths):
+        cmd_parts += ["-map", "0:a", "-c:a", "copy", "-ss", f"{start:.4f}"]
+        if end is not None:
+            cmd_parts += ["-to", f"{end:.4f}"]
+        cmd_parts += ["-y", temp_path]
+
+    try:
+        await command_executor.execute(" ".join(shlex.quote(str(part)) for part in cmd_parts))
+        for temp_path, output_path in zip(temp_paths, output_paths):
+            os.replace(temp_path, output_path)
+    finally:
+        for temp_path in temp_paths:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    return output_paths
@@ -0,0 +1,383 @@
+"""
+ElevenLabs Client
+
+This module provides a native asyncio client for the ElevenLabs text-to-speech API,
+with a pooled keep-alive HTTP connection and async exponential backoff.
+"""
+
+import os
+import json
+import base64
+import random
+import hashlib
+import asyncio
+import logging
+import tempfile
+from typing import Dict, Any, Optional, Union
+
+import httpx
+
+from app.core.audio.rate_control import TTSRateController
+from app.core.credential_pool import CredentialPool
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+ELEVENLABS_API_URL = "https://api.elevenlabs.io/v1"
+
+# Status codes worth retrying: timeouts, rate limits and server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+class ElevenLabsAPIError(Exception):
+    """Error returned by the ElevenLabs API."""
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"ElevenLabs API error {status_code}: {message}")
+        self.status_code = status_code
+        self.retryable = status_code in RETRYABLE_STATUS_CODES
+        self.retry_after = retry_after
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header given in seconds."""
+    try:
+        return float(response.headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+class AsyncElevenLabsClient:
+    """
+    Asynchronous ElevenLabs client.
+
+    All requests share one httpx.AsyncClient, so connections are kept alive and reused
+    across a batch. Cancelling a request task cancels the in-flight HTTP request.
+    """
+
+    def __init__(self, api_key: str, config: Optional[Dict[str, Any]] = None,
+                 rate_controller: Optional[Union[TTSRateController, CredentialPool]] = None):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: ElevenLabs API key (used when the rate controller doesn't pick one)
+            config: Client options (optional, overrides the defaults)
+            rate_controller: Adaptive concurrency and quota control applied to every attempt,
+                             or a credential pool choosing the key of each attempt (optional)
+        """
+        self.api_key = api_key
+        self.rate_controller = rate_controller
+
+        # Default configuration
+        self.config = {
+            "base_url": ELEVENLABS_API_URL,
+            "timeout": 60.0,             # Request timeout in seconds
+            "max_connections": 8,        # Size of the connection pool
+            "keepalive_expiry": 30.0,    # Seconds an idle connection is kept open
+            "max_retries": 3,            # Number of retries for API calls
+            "retry_delay": 2,            # Initial delay between retries (in seconds)
+            "max_retry_delay": 10,       # Maximum delay between retries (in seconds)
+            "jitter": 0.5,               # Random jitter factor for retry delays
+            "chunk_size": 64 * 1024      # Bytes per streamed chunk written to disk
+        }
+
+        if config:
+            self.config.update(config)
+
+        self._client = None
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client, creating it if needed."""
+        if self._client is None or self._client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.config["max_connections"],
+                max_keepalive_connections=self.config["max_connections"],
+                keepalive_expiry=self.config["keepalive_expiry"]
+            )
+            self._client = httpx.AsyncClient(
+                base_url=self.config["base_url"],
+                headers={"xi-api-key": self.api_key},
+                timeout=self.config["timeout"],
+                limits=limits
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP client."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _with_retry(self, func, *args, **kwargs):
+        """
+        Await a coroutine function with async exponential backoff.
+        Client errors (4xx other than rate limits) are not retried.
+
+        Args:
+            func: Coroutine function to call
+            *args: Positional arguments to pass to the function
+            **kwargs: Keyword arguments to pass to the function
+
+        Returns:
+            The result of the function call
+        """
+        max_retries = self.config["max_retries"]
+        base_delay = self.config["retry_delay"]
+        max_delay = self.config["max_retry_delay"]
+        jitter = self.config["jitter"]
+
+        for attempt in range(max_retries + 1):
+            try:
+                if attempt > 0:
+                    logger.info(f"Retry attempt {attempt}/{max_retries}...")
+
+                return await func(*args, **kwargs)
+
+            except (httpx.TransportError, ElevenLabsAPIError) as e:
+                retryable = isinstance(e, httpx.TransportError) or e.retryable
+
+                if retryable and attempt < max_retries:
+                    # Calculate exponential backoff with jitter
+                    delay = min(base_delay * (2 ** attempt), max_delay)
+                    delay = delay * (1 + random.uniform(-jitter, jitter))
+
+                    # Honor the provider's Retry-After if it asks for longer
+                    delay = max(delay, getattr(e, "retry_after", None) or 0.0)
+
+                    logger.warning(f"Error during API call: {e}. Retrying in {delay:.2f} seconds...")
+                    await asyncio.sleep(delay)
+                else:
+                    if retryable:
+                        logger.error(f"All {max_retries} retry attempts failed: {e}")
+                    raise
+
+    async def _attempt(self, func, characters: int):
+        """
+        Run one request attempt under the rate controller, if any.
+
+        Args:
+            func: Coroutine function performing the request, called with the request headers
+            characters: Number of characters the request consumes
+
+        Returns:
+            The result of the function call
+        """
+        if self.rate_controller is None:
+            return await func({"xi-api-key": self.api_key})
+
+        # A credential pool yields the key of the attempt; a plain rate controller yields None
+        async with self.rate_controller.request(characters) as api_key:
+            return await func({"xi-api-key": api_key or self.api_key})
+
+    async def text_to_speech(
+        self,
+        text: str,
+        voice_id: str,
+        model_id: str,
+        output_format: str,
+        voice_settings: Dict[str, Any]
+    ) -> bytes:
+        """
+        Convert text to speech.
+
+        Args:
+            text: Text to convert
+            voice_id: ElevenLabs voice ID
+            model_id: ElevenLabs model ID
+            output_format: Output format (e.g. mp3_44100_128)
+            voice_settings: Voice settings (stability, similarity_boost, speed, use_speaker_boost)
+
+        Returns:
+            bytes: The encoded audio
+        """
+        async def _convert(headers):
+            response = await self.http_client.post(
+                f"/text-to-speech/{voice_id}",
+                params={"output_format": output_format},
+                headers=headers,
+                json={"text": text, "model_id": model_id, "voice_settings": voice_settings}
+            )
+            if response.status_code != 200:
+                raise ElevenLabsAPIError(response.status_code, response.text[:500], _retry_after(response))
+            return response.content
+
+        return await self._with_retry(self._attempt, _convert, len(text))
+
+    async def text_to_speech_to_file(
+        self,
+        text: str,
+        output_path: str,
+        voice_id: str,
+        model_id: str,
+        output_format: str,
+        voice_settings: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Convert text to speech, streaming the response straight to disk.
+
+        Chunks are written to a temporary file next to output_path as they arrive, with a
+        SHA-256 checksum computed on the fly. The file is renamed into place only once the
+        response is complete, so output_path never holds a partial file.
+
+        Args:
+            text: Text to convert
+            output_path: Path to save the audio file
+            voice_id: ElevenLabs voice ID
+            model_id: ElevenLabs model ID
+            output_format: Output format (e.g. mp3_44100_128)
+            voice_settings: Voice settings (stability, similarity_boost, speed, use_speaker_boost)
+
+        Returns:
+            Dict[str, Any]: path, size (bytes) and sha256 of the written file
+        """
+        output_dir = os.path.dirname(output_path) or "."
+        os.makedirs(output_dir, exist_ok=True)
+
+        async def _stream(headers):
+            fd, temp_path = tempfile.mkstemp(dir=output_dir, suffix=".part")
+            checksum = hashlib.sha256()
+            size = 0
+
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    async with self.http_client.stream(
+                        "POST",
+                        f"/text-to-speech/{voice_id}/stream",
+                        params={"output_format": output_format},
+                        headers=headers,
+                        json={"text": text, "model_id": model_id, "voice_settings": voice_settings}
+                    ) as response:
+                        if response.status_code != 200:
+                            body = await response.aread()
+                            raise ElevenLabsAPIError(
+                                response.status_code,
+                                body[:500].decode(errors="replace"),
+                                _retry_after(response)
+                            )
+
+                        async for chunk in response.aiter_bytes(self.config["chunk_size"]):
+                            f.write(chunk)
+                            checksum.update(chunk)
+                            size += len(chunk)
+
+                if size == 0:
+                    raise ElevenLabsAPIError(502, "Empty audio response")
+
+                os.replace(temp_path, output_path)
+            except BaseException:
+                # Includes cancellation: never leave partial files behind
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+                raise
+
+            return {"path": output_path, "size": size, "sha256": checksum.hexdigest()}
+
+        return await self._with_retry(self._attempt, _stream, len(text))
+
+    async def text_to_speech_with_timestamps_to_file(
+        self,
+        text: str,
+        output_path: str,
+        voice_id: str,
+        model_id: str,
+        output_format: str,
+        voice_settings: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Convert text to speech with character-level timestamps, streaming the audio to disk.
+
+        The streaming endpoint returns one JSON object per line, each with a base64 chunk of
+        audio and the alignment of the characters it covers. Each chunk is decoded and written
+        to a temporary file next to output_path as it arrives, with a SHA-256 checksum computed
+        on the fly, so the response is never held in memory. The file is renamed into place
+        only once the response is complete.
+
+        Args:
+            text: Text to convert
+            output_path: Path to save the audio file
+            voice_id: ElevenLabs voice ID
+            model_id: ElevenLabs model ID
+            output_format: Output format (e.g. mp3_44100_128)
+            voice_settings: Voice settings (stability, similarity_boost, speed, use_speaker_boost)
+
+        Returns:
+            Dict[str, Any]: path, size (bytes) and sha256 of the written file, and the alignment
+        """
+        output_dir = os.path.dirname(output_path) or "."
+        os.makedirs(output_dir, exist_ok=True)
+
+        async def _stream(headers):
+            fd, temp_path = tempfile.mkstemp(dir=output_dir, suffix=".part")
+            checksum = hashlib.sha256()
+            size = 0
+            alignment = {"characters": [], "character_start_times_seconds": [], "character_end_times_seconds": []}
+
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    async with self.http_client.stream(
+                        "POST",
+                        f"/text-to-speech/{voice_id}/stream/with-timestamps",
+                        params={"output_format": output_format},
+                        headers=headers,
+                        json={"text": text, "model_id": model_id, "voice_settings": voice_settings}
+                    ) as response:
+                        if response.status_code != 200:
+                            body = await response.aread()
+                            raise ElevenLabsAPIError(
+                                response.status_code,
+                                body[:500].decode(errors="replace"),
+                                _retry_after(response)
+                            )
+
+                        async for line in response.aiter_lines():
+                            if not line.strip():
+                                continue
+                            try:
+                                data = json.loads(line)
+                            except ValueError:
+                                raise ElevenLabsAPIError(502, f"Malformed stream line: {line[:100]}")
+
+                            if data.get("audio_base64"):
+                                chunk = base64.b64decode(data["audio_base64"])
+                                f.write(chunk)
+                                checksum.update(chunk)
+                                size += len(chunk)
+
+                            _extend_alignment(alignment, data.get("alignment") or data.get("normalized_alignment"))
+
+                if size == 0 or not alignment["characters"]:
+                    raise ElevenLabsAPIError(502, "Response without audio or alignment")
+
+                os.replace(temp_path, output_path)
+            except BaseException:
+                # Includes cancellation: never leave partial files behind
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+                raise
+
+            return {"path": output_path, "size": size, "sha256": checksum.hexdigest(), "alignment": alignment}
+
+        return await self._with_retry(self._attempt, _stream, len(text))
+
+def _extend_alignment(alignment: Dict[str, list], chunk: Optional[Dict[str, list]]) -> None:
+    """
+    Append the alignment of a streamed chunk to the alignment of the whole response.
+    Chunk times are expected relative to the start of the audio; a chunk whose times
+    restart from zero is shifted to follow the previous one.
+    """
+    if not chunk or not chunk.get("characters"):
+        return
+
+    starts = chunk["character_start_times_seconds"]
+    ends = chunk["character_end_times_seconds"]
+    previous_end = alignment["character_end_times_seconds"][-1] if alignment["characters"] else 0.0
+    offset = previous_end if starts[0] < previous_end - 0.01 else 0.0
+
+    alignment["characters"] += chunk["characters"]
+    alignment["character_start_times_seconds"] += [time + offset for time in starts]
+    alignment["character_end_times_seconds"] += [time + offset for time in ends]
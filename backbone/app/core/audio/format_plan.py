@@ -0,0 +1,66 @@
+"""
+Audio Format Plan
+
+This module decides, once per render, which sample rate and codecs every audio stage uses.
+Narration arrives from TTS already encoded, so the plan keeps everything after the TTS decode
+lossless (16-bit PCM at one sample rate) and leaves a single AAC encode for the final file:
+narration is decoded once, each signal is resampled at most once, and no stage re-encodes
+audio another stage will decode again.
+"""
+
+import re
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sample rates the final AAC track is delivered at
+DELIVERY_SAMPLE_RATES = (44100, 48000)
+DEFAULT_SAMPLE_RATE = 48000
+
+def tts_sample_rate(output_format: str) -> Optional[int]:
+    """
+    Get the sample rate of a provider output format (e.g. mp3_44100_128, pcm_24000).
+
+    Args:
+        output_format: Provider output format
+
+    Returns:
+        Optional[int]: Sample rate in Hz, or None if the format doesn't name one
+    """
+    match = re.match(r"[a-z0-9]+_(\d+)", output_format or "")
+    return int(match.group(1)) if match else None
+
+def plan_audio_formats(output_format: str, sample_rate: Optional[int] = None,
+                       bitrate: str = "192k") -> Dict[str, Any]:
+    """
+    Plan the audio formats of a render.
+
+    The mix runs at the TTS sample rate when it is a delivery rate, so narration is never
+    resampled and music is resampled once, when its bed is built. Lower TTS rates are
+    resampled once, when the narration is decoded.
+
+    Args:
+        output_format: TTS output format
+        sample_rate: Sample rate to mix and deliver at (optional, overrides the choice)
+        bitrate: Bitrate of the final AAC encode
+
+    Returns:
+        Dict[str, Any]: tts_output_format, tts_sample_rate, sample_rate (of every stage
+                        after the TTS decode), intermediate_codec, final_codec and final_bitrate
+    """
+    source_rate = tts_sample_rate(output_format)
+    if not sample_rate:
+        sample_rate = source_rate if source_rate in DELIVERY_SAMPLE_RATES else DEFAULT_SAMPLE_RATE
+
+    if source_rate and source_rate != sample_rate:
+        logger.info(f"TTS output {output_format} will be resampled once, to {sample_rate} Hz")
+
+    return {
+        "tts_output_format": output_format,
+        "tts_sample_rate": source_rate,
+        "sample_rate": int(sample_rate),
+        "intermediate_codec": "pcm_s16le",
+        "final_codec": "aac",
+        "final_bitrate": bitrate
+    }
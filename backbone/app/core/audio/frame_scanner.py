@@ -0,0 +1,258 @@
+"""
+Audio Frame Scanner
+
+This module reads the duration of MP3 and ADTS AAC files from their frame headers,
+without decoding and without spawning ffprobe. Files are memory-mapped and only the
+headers are touched. For MP3s with a LAME/Xing "Info" tag the frame count and the
+encoder delay and padding come from the tag, so the sample count is exact.
+"""
+
+import os
+import mmap
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bitrates in kbps indexed by [version class][layer][bitrate index]
+# (version class 0 is MPEG-1, 1 is MPEG-2 and MPEG-2.5)
+_MP3_BITRATES = {
+    (0, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (0, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (0, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (1, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (1, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (1, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+}
+
+# Sample rates indexed by version bits, then sample rate index
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],   # MPEG-1
+    2: [22050, 24000, 16000],   # MPEG-2
+    0: [11025, 12000, 8000]     # MPEG-2.5
+}
+
+_ADTS_SAMPLE_RATES = [96000, 88200, 64000, 48000, 44100, 32000, 24000, 22050, 16000, 12000, 11025, 8000, 7350]
+
+def _parse_mp3_header(data, pos: int) -> Optional[Dict[str, int]]:
+    """
+    Parse an MPEG audio frame header.
+
+    Args:
+        data: Buffer holding the file
+        pos: Offset of the header
+
+    Returns:
+        Optional[Dict[str, int]]: Frame length, samples per frame, sample rate, channels
+                                  and layer, or None if there is no valid header at pos
+    """
+    if pos + 4 > len(data):
+        return None
+
+    header = int.from_bytes(data[pos:pos + 4], "big")
+    if header >> 21 != 0x7FF:
+        return None
+
+    version_bits = (header >> 19) & 0x3
+    layer = 4 - ((header >> 17) & 0x3)
+    bitrate_index = (header >> 12) & 0xF
+    sample_rate_index = (header >> 10) & 0x3
+    padding = (header >> 9) & 0x1
+    channel_mode = (header >> 6) & 0x3
+
+    # Reserved version/layer, free-format or bad bitrate, reserved sample rate
+    if version_bits == 1 or layer == 4 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    version_class = 0 if version_bits == 3 else 1
+    bitrate = _MP3_BITRATES[(version_class, layer)][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version_bits][sample_rate_index]
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2 or version_class == 0:
+        samples = 1152
+        length = 144 * bitrate // sample_rate + padding
+    else:
+        samples = 576
+        length = 72 * bitrate // sample_rate + padding
+
+    return {
+        "length": length,
+        "samples": samples,
+        "sample_rate": sample_rate,
+        "channels": 1 if channel_mode == 3 else 2,
+        "layer": layer,
+        "version_class": version_class
+    }
+
+def _parse_adts_header(data, pos: int) -> Optional[Dict[str, int]]:
+    """
+    Parse an ADTS (AAC) frame header.
+
+    Args:
+        data: Buffer holding the file
+        pos: Offset of the header
+
+    Returns:
+        Optional[Dict[str, int]]: Frame length, samples per frame, sample rate and channels,
+                                  or None if there is no valid header at pos
+    """
+    if pos + 7 > len(data):
+        return None
+
+    header = int.from_bytes(data[pos:pos + 7], "big")
+    if header >> 44 != 0xFFF or (header >> 41) & 0x3 != 0:
+        return None
+
+    sample_rate_index = (header >> 34) & 0xF
+    length = (header >> 13) & 0x1FFF
+    if sample_rate_index >= len(_ADTS_SAMPLE_RATES) or length < 7:
+        return None
+
+    return {
+        "length": length,
+        "samples": 1024 * ((header & 0x3) + 1),
+        "sample_rate": _ADTS_SAMPLE_RATES[sample_rate_index],
+        "channels": (header >> 30) & 0x7
+    }
+
+def _skip_id3v2(data) -> int:
+    """Get the offset of the first byte after any leading ID3v2 tags."""
+    pos = 0
+    while pos + 10 <= len(data) and data[pos:pos + 3] == b"ID3":
+        size = 0
+        for byte in data[pos + 6:pos + 10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if data[pos + 5] & 0x10 else 0
+        pos += 10 + size + footer
+    return pos
+
+def _read_lame_tag(data, pos: int, frame: Dict[str, int]) -> Optional[Dict[str, int]]:
+    """
+    Read the Xing/Info tag of the first MP3 frame, if it has one.
+
+    Args:
+        data: Buffer holding the file
+        pos: Offset of the first frame
+        frame: Parsed header of the first frame
+
+    Returns:
+        Optional[Dict[str, int]]: Audio frame count, encoder delay and padding,
+                                  or None if the frame is a regular audio frame
+    """
+    # The tag follows the side information, whose size depends on version and channels
+    if frame["version_class"] == 0:
+        side_info = 17 if frame["channels"] == 1 else 32
+    else:
+        side_info = 9 if frame["channels"] == 1 else 17
+    tag_pos = pos + 4 + side_info
+
+    if data[tag_pos:tag_pos + 4] not in (b"Xing", b"Info"):
+        return None
+
+    flags = int.from_bytes(data[tag_pos + 4:tag_pos + 8], "big")
+    offset = tag_pos + 8
+    frames = None
+    if flags & 0x1:
+        frames = int.from_bytes(data[offset:offset + 4], "big")
+        offset += 4
+    if flags & 0x2:
+        offset += 4
+    if flags & 0x4:
+        offset += 100
+    if flags & 0x8:
+        offset += 4
+
+    # The LAME extension stores encoder delay and padding as two 12-bit values
+    delay, padding = 0, 0
+    if offset + 24 <= pos + frame["length"] and data[offset:offset + 4] in (b"LAME", b"Lavc", b"Lavf"):
+        packed = int.from_bytes(data[offset + 21:offset + 24], "big")
+        delay, padding = packed >> 12, packed & 0xFFF
+
+    return {"frames": frames, "delay": delay, "padding": padding}
+
+def _scan(data) -> Dict[str, Any]:
+    """Scan the frame headers of an in-memory MP3 or ADTS file."""
+    start = _skip_id3v2(data)
+    end = len(data)
+
+    # Find the first frame whose successor is also a valid header, so stray sync bytes are ignored
+    pos = data.find(b"\xff", start)
+    parser = None
+    while 0 <= pos < end - 4:
+        for candidate in (_parse_mp3_header, _parse_adts_header):
+            frame = candidate(data, pos)
+            if frame and (pos + frame["length"] >= end or candidate(data, pos + frame["length"])):
+                parser = candidate
+                break
+        if parser:
+            break
+        pos = data.find(b"\xff", pos + 1)
+
+    if parser is None:
+        raise ValueError("No MP3 or ADTS frames found")
+
+    first = parser(data, pos)
+    codec = "mp3" if parser is _parse_mp3_header else "aac"
+    sample_rate = first["sample_rate"]
+    delay, padding = 0, 0
+
+    lame_tag = _read_lame_tag(data, pos, first) if codec == "mp3" else None
+    if lame_tag:
+        delay, padding = lame_tag["delay"], lame_tag["padding"]
+        pos += first["length"]
+
+    if lame_tag and lame_tag["frames"] is not None:
+        frames = lame_tag["frames"]
+        total_samples = frames * first["samples"]
+    else:
+        # Walk the frames; stop at the first non-frame (e.g. a trailing ID3v1 or APE tag)
+        frames = 0
+        total_samples = 0
+        while pos < end:
+            frame = parser(data, pos)
+            if frame is None or frame["sample_rate"] != sample_rate:
+                break
+            frames += 1
+            total_samples += frame["samples"]
+            pos += frame["length"]
+
+    samples = max(total_samples - delay - padding, 0)
+
+    return {
+        "codec": codec,
+        "sample_rate": sample_rate,
+        "channels": first["channels"],
+        "frames": frames,
+        "samples": samples,
+        "encoder_delay": delay,
+        "encoder_padding": padding,
+        "duration_us": samples * 1_000_000 // sample_rate
+    }
+
+def scan_audio_duration(audio_file: str) -> Dict[str, Any]:
+    """
+    Get the exact duration of an MP3 or ADTS AAC file from its frame headers.
+
+    Args:
+        audio_file: Path to the audio file
+
+    Returns:
+        Dict[str, Any]: codec, sample_rate, channels, frames, samples (after removing
+                        encoder delay and padding), encoder_delay, encoder_padding and
+                        duration_us (microseconds)
+
+    Raises:
+        ValueError: If the file contains no MP3 or ADTS frames
+    """
+    if os.path.getsize(audio_file) == 0:
+        raise ValueError(f"Empty audio file: {audio_file}")
+
+    with open(audio_file, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            try:
+                return _scan(data)
+            except ValueError as e:
+                raise ValueError(f"{e}: {audio_file}") from None
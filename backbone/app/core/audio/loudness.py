@@ -0,0 +1,199 @@
+"""
+Loudness Analysis
+
+This module measures narration files once with NumPy: integrated loudness (ITU-R BS.1770
+gating over a K-weighted signal), sample peak, and where speech starts and ends. A single
+FFmpeg decode produces both the plain and the K-weighted signal. The measurements are
+independent of any target level, so they can be cached and turned into a gain and a trim
+window at render time, where they ride along in the render's existing audio pass.
+"""
+
+import os
+import shlex
+import logging
+import tempfile
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from app.core.ffmpeg.interfaces import FFmpegCommandExecutor
+
+logger = logging.getLogger(__name__)
+
+# Bump when the measurements change, so cached analyses are recomputed
+ANALYSIS_VERSION = 1
+
+ANALYSIS_SAMPLE_RATE = 48000
+
+# ITU-R BS.1770 K-weighting at 48 kHz: a high shelf, then a high pass
+K_WEIGHTING_FILTER = (
+    "biquad=b0=1.53512485958697:b1=-2.69169618940638:b2=1.19839281085285:a0=1:a1=-1.69065929318241:a2=0.73248077421585,"
+    "biquad=b0=1.0:b1=-2.0:b2=1.0:a0=1:a1=-1.99004745483398:a2=0.99007225036621"
+)
+
+# Gating blocks: 400 ms with 75% overlap, -70 LUFS absolute and -10 LU relative gates
+BLOCK_SECONDS = 0.4
+BLOCK_STEP_SECONDS = 0.1
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+
+# Speech detection: 10 ms frames louder than the floor and within this range of the loudest frame
+SPEECH_FRAME_SECONDS = 0.01
+SPEECH_FLOOR_DBFS = -60.0
+SPEECH_RANGE_DB = 40.0
+
+def integrated_loudness(weighted: np.ndarray, sample_rate: int) -> Optional[float]:
+    """
+    Compute gated integrated loudness of a K-weighted mono signal.
+
+    Args:
+        weighted: K-weighted samples
+        sample_rate: Sample rate
+
+    Returns:
+        Optional[float]: Loudness in LUFS, or None if every block is below the absolute gate
+    """
+    block = int(BLOCK_SECONDS * sample_rate)
+    step = int(BLOCK_STEP_SECONDS * sample_rate)
+    if len(weighted) == 0:
+        return None
+
+    power = np.concatenate(([0.0], np.cumsum(np.square(weighted, dtype=np.float64))))
+    if len(weighted) <= block:
+        mean_squares = np.array([power[-1] / len(weighted)])
+    else:
+        starts = np.arange(0, len(weighted) - block + 1, step)
+        mean_squares = (power[starts + block] - power[starts]) / block
+
+    with np.errstate(divide="ignore"):
+        block_loudness = -0.691 + 10 * np.log10(mean_squares)
+
+    gated = mean_squares[block_loudness > ABSOLUTE_GATE_LUFS]
+    if len(gated) == 0:
+        return None
+
+    relative_gate = -0.691 + 10 * np.log10(gated.mean()) + RELATIVE_GATE_LU
+    gated = mean_squares[(block_loudness > ABSOLUTE_GATE_LUFS) & (block_loudness > relative_gate)]
+    return float(-0.691 + 10 * np.log10(gated.mean()))
+
+def speech_bounds(samples: np.ndarray, sample_rate: int) -> Tuple[float, float]:
+    """
+    Find where speech starts and ends, from the level of short frames.
+
+    Args:
+        samples: Mono samples in [-1, 1]
+        sample_rate: Sample rate
+
+    Returns:
+        Tuple[float, float]: Start and end of speech in seconds (the whole file if none is found)
+    """
+    duration = len(samples) / sample_rate
+    frame = int(SPEECH_FRAME_SECONDS * sample_rate)
+    frames = len(samples) // frame
+    if frames == 0:
+        return 0.0, duration
+
+    rms = np.sqrt(np.mean(np.square(samples[: frames * frame].reshape(frames, frame), dtype=np.float64), axis=1))
+    with np.errstate(divide="ignore"):
+        level = 20 * np.log10(rms)
+
+    threshold = max(SPEECH_FLOOR_DBFS, float(level.max()) - SPEECH_RANGE_DB)
+    voiced = np.flatnonzero(level > threshold)
+    if len(voiced) == 0:
+        return 0.0, duration
+
+    return float(voiced[0] * frame / sample_rate), float(min((voiced[-1] + 1) * frame / sample_rate, duration))
+
+def analyze_samples(samples: np.ndarray, weighted: np.ndarray, sample_rate: int) -> Dict[str, Any]:
+    """
+    Measure a decoded narration line.
+
+    Args:
+        samples: Mono samples in [-1, 1]
+        weighted: The same samples, K-weighted
+        sample_rate: Sample rate
+
+    Returns:
+        Dict[str, Any]: version, duration, integrated_lufs (None if silent), peak_dbfs,
+                        speech_start and speech_end (seconds)
+    """
+    peak = float(np.max(np.abs(samples))) if len(samples) else 0.0
+    speech_start, speech_end = speech_bounds(samples, sample_rate)
+    loudness = integrated_loudness(weighted, sample_rate)
+
+    return {
+        "version": ANALYSIS_VERSION,
+        "duration": round(len(samples) / sample_rate, 6),
+        "integrated_lufs": round(loudness, 2) if loudness is not None else None,
+        "peak_dbfs": round(float(20 * np.log10(peak)), 2) if peak > 0 else None,
+        "speech_start": round(speech_start, 4),
+        "speech_end": round(speech_end, 4)
+    }
+
+def loudness_gain(analysis: Dict[str, Any], target_lufs: float, max_gain_db: float, peak_ceiling_dbfs: float) -> float:
+    """
+    Get the gain bringing a line to the target loudness without pushing its peak over the ceiling.
+
+    Args:
+        analysis: Result of analyze_samples
+        target_lufs: Target integrated loudness
+        max_gain_db: Largest boost or cut applied
+        peak_ceiling_dbfs: Highest allowed sample peak after gain
+
+    Returns:
+        float: Gain in dB (0.0 for silent lines)
+    """
+    if analysis.get("integrated_lufs") is None:
+        return 0.0
+
+    gain = min(max(target_lufs - analysis["integrated_lufs"], -max_gain_db), max_gain_db)
+    if analysis.get("peak_dbfs") is not None:
+        gain = min(gain, peak_ceiling_dbfs - analysis["peak_dbfs"])
+    return round(gain, 2)
+
+def speech_window(analysis: Dict[str, Any], padding: float) -> Tuple[float, float]:
+    """
+    Get the part of a line to keep: the speech, padded on both sides.
+
+    Args:
+        analysis: Result of analyze_samples
+        padding: Silence kept around the speech in seconds
+
+    Returns:
+        Tuple[float, float]: Start and end in seconds
+    """
+    start = max(analysis["speech_start"] - padding, 0.0)
+    end = min(analysis["speech_end"] + padding, analysis["duration"])
+    return round(start, 4), round(end, 4)
+
+async def analyze_audio(command_executor: FFmpegCommandExecutor, audio_file: str) -> Dict[str, Any]:
+    """
+    Decode an audio file once (plain and K-weighted) and measure it.
+
+    Args:
+        command_executor: Command executor for running FFmpeg
+        audio_file: Path to the audio file
+
+    Returns:
+        Dict[str, Any]: Result of analyze_samples
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        plain_file = os.path.join(temp_dir, "plain.f32")
+        weighted_file = os.path.join(temp_dir, "weighted.f32")
+        cmd_parts = [
+            "ffmpeg",
+            "-i", audio_file,
+            "-filter_complex",
+            f"[0:a]aformat=sample_fmts=flt:sample_rates={ANALYSIS_SAMPLE_RATE}:channel_layouts=mono,"
+            f"asplit=2[plain][k];[k]{K_WEIGHTING_FILTER}[weighted]",
+            "-map", "[plain]", "-f", "f32le", "-y", plain_file,
+            "-map", "[weighted]", "-f", "f32le", "-y", weighted_file
+        ]
+        await command_executor.execute(" ".join(shlex.quote(str(part)) for part in cmd_parts))
+
+        samples = np.fromfile(plain_file, dtype=np.float32)
+        weighted = np.fromfile(weighted_file, dtype=np.float32)
+
+    analysis = analyze_samples(samples, weighted, ANALYSIS_SAMPLE_RATE)
+    logger.debug(f"Analyzed {audio_file}: {analysis}")
+    return analysis
@@ -0,0 +1,132 @@
+"""
+Offline Audio Generator
+
+This module provides a TTS backend that needs no network: each line becomes a deterministic
+tone (or silence) sized to the length of the text, encoded in the configured output format.
+It follows the same interface, output paths and caching rules as the ElevenLabs generator,
+so the whole pipeline can be run and benchmarked without the API.
+"""
+
+import os
+import shlex
+import asyncio
+import hashlib
+import logging
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from app.core.audio.audio_generator import AudioGenerator
+from app.core.audio.batch_synthesis import mp3_encoding
+from app.core.audio.alignment import even_alignment
+from app.infrastructure.storage.file_hash import compute_content_hash
+
+logger = logging.getLogger(__name__)
+
+class OfflineAudioGenerator(AudioGenerator):
+    """
+    Generates placeholder narration locally with FFmpeg.
+    """
+
+    requires_api_key = False
+
+    def __init__(self, api_key: Optional[str] = None, config: Optional[Dict] = None):
+        """
+        Initialize the offline generator.
+
+        Args:
+            api_key: Ignored (accepted for interface compatibility)
+            config: Configuration options for audio generation
+        """
+        offline_config = {
+            "characters_per_second": 15.0,   # Speaking rate at speed 1.0
+            "signal": "tone",                # "tone" or "silence"
+            "min_duration": 0.5              # Shortest line in seconds
+        }
+        offline_config.update(config or {})
+        offline_config["backend"] = "offline"
+        super().__init__(api_key=api_key, config=offline_config)
+
+    def line_duration(self, text: str) -> float:
+        """
+        Get the duration of a line, following the configured speaking rate and speed.
+
+        Args:
+            text: Narration text
+
+        Returns:
+            float: Duration in seconds
+        """
+        rate = self.config["characters_per_second"] * (self.config.get("speed") or 1.0)
+        return max(len(text.strip()) / rate, self.config["min_duration"])
+
+    async def _synthesize(self, text: str, output_path: str) -> Dict:
+        """
+        Render a line to a file.
+
+        Args:
+            text: Text to convert to audio
+            output_path: Path to save the audio file
+
+        Returns:
+            Dict: path, size (bytes) and sha256 of the written file, and the
+                  character alignment if timestamps were requested
+        """
+        encoding = mp3_encoding(self.config.get("output_format")) or {"sample_rate": 44100, "bitrate": 128}
+        duration = self.line_duration(text)
+
+        if self.config["signal"] == "silence":
+            source = f"anullsrc=r={encoding['sample_rate']}:cl=mono"
+        else:
+            # Same text, same pitch: derive the frequency from the text
+            digest = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+            source = f"sine=frequency={200 + digest % 400}:sample_rate={encoding['sample_rate']}"
+
+        output_dir = os.path.dirname(output_path) or "."
+        os.makedirs(output_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=output_dir, suffix=".part.mp3")
+        os.close(fd)
+
+        cmd_parts = [
+            "ffmpeg",
+            "-f", "lavfi",
+            "-i", source,
+            "-t", f"{duration:.3f}",
+            "-c:a", "libmp3lame",
+            "-b:a", f"{encoding['bitrate']}k",
+            "-y", temp_path
+        ]
+        try:
+            await self.command_executor.execute(" ".join(shlex.quote(str(part)) for part in cmd_parts))
+            os.replace(temp_path, output_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+        result = {
+            "path": output_path,
+            "size": os.path.getsize(output_path),
+            "sha256": await asyncio.to_thread(compute_content_hash, output_path)
+        }
+        if self.config.get("timestamps"):
+            # Characters spread evenly over the tone, in the provider's alignment format
+            result["alignment"] = even_alignment(text.strip(), duration)
+        return result
+
+    async def _synthesize_batch(self, items: List[Tuple[str, str]]) -> List[str]:
+        """
+        Render several lines. There is no request overhead to save offline,
+        so each line is rendered directly rather than split from one file.
+
+        Args:
+            items: (text, output_path) of each line, in narration order
+
+        Returns:
+            List[str]: Paths of the per-line audio files
+        """
+        results = await asyncio.gather(*(self._synthesize(text, output_path) for text, output_path in items))
+
+        for (text, output_path), result in zip(items, results):
+            self.checksums[output_path] = result["sha256"]
+            self._store_line(text, output_path, result.get("alignment"))
+
+        return [result["path"] for result in results]
@@ -0,0 +1,242 @@
+"""
+TTS Rate Control
+
+This module provides adaptive rate control for the TTS API: an AIMD concurrency
+controller driven by throttling, server errors and latency, and a token bucket for
+the provider's character quota.
+"""
+
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    Token bucket for a per-minute quota (e.g. characters of TTS).
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate_per_minute: Tokens added per minute
+            capacity: Maximum burst size (defaults to one minute of tokens)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def acquire(self, amount: float):
+        """
+        Wait until the requested tokens are available and take them.
+        Requests larger than the capacity wait for a full bucket.
+
+        Args:
+            amount: Number of tokens to take
+        """
+        amount = min(amount, self.capacity)
+
+        # The lock keeps waiters in FIFO order so large requests are not starved
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+class AIMDConcurrencyController:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit.
+
+    The limit grows by about one slot per limit-many healthy requests and is cut
+    multiplicatively on throttling (429), server errors (5xx), or latency well above the
+    observed baseline for requests of a similar size. Only requests started after the last cut can cut again, so a burst
+    of errors from one window halves the limit once instead of collapsing it.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the controller.
+
+        Args:
+            config: Controller options (optional, overrides the defaults)
+        """
+        # Default configuration
+        self.config = {
+            "initial_limit": 4,         # Starting concurrency
+            "min_limit": 1,             # Never go below this concurrency
+            "max_limit": 32,            # Never go above this concurrency
+            "decrease_factor": 0.5,     # Multiplicative decrease on congestion
+            "latency_tolerance": 2.5    # Congestion if latency exceeds the baseline of its size by this factor
+        }
+
+        if config:
+            self.config.update(config)
+
+        self.limit = float(self.config["initial_limit"])
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+        self._last_decrease = 0.0
+        # Healthy latency per request size bucket (powers of two of the cost). TTS latency is
+        # mostly a fixed time to first byte, so latency per character would make every short
+        # request look slow next to a long one; whole-request latency is only compared with
+        # requests of a similar size.
+        self._baselines: Dict[int, float] = {}
+
+        # Metrics
+        self.successes = 0
+        self.throttled = 0
+        self.errors = 0
+
+    @property
+    def current_limit(self) -> int:
+        """Current integer concurrency limit."""
+        return max(self.config["min_limit"], int(self.limit))
+
+    async def acquire(self):
+        """Wait for a free slot under the current limit."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.current_limit)
+            self.in_flight += 1
+
+    async def release(self, latency: float, cost: float = 1.0, outcome: str = "ok"):
+        """
+        Release a slot and adjust the limit from the request outcome.
+
+        Args:
+            latency: Request latency in seconds
+            cost: Request size, which picks the latency baseline (e.g. characters)
+            outcome: "ok", "throttled" (429), "error" (5xx or transport error),
+                     or "rejected" (other client errors, which leave the limit unchanged)
+        """
+        started = time.monotonic() - latency
+
+        async with self._condition:
+            self.in_flight -= 1
+
+            if outcome == "throttled":
+                self.throttled += 1
+                self._decrease("throttled", started)
+            elif outcome == "error":
+                self.errors += 1
+                self._decrease("error", started)
+            elif outcome == "ok":
+                self.successes += 1
+                bucket = int(max(cost, 1.0)).bit_length()
+                baseline = self._baselines.get(bucket)
+                if baseline is not None and latency > baseline * self.config["latency_tolerance"]:
+                    self._decrease("latency", started)
+                else:
+                    self.limit = min(self.config["max_limit"], self.limit + 1.0 / self.limit)
+
+                # Track the fastest sustained latency of the size as its healthy baseline
+                if baseline is None:
+                    self._baselines[bucket] = latency
+                else:
+                    self._baselines[bucket] = min(latency, 0.9 * baseline + 0.1 * latency)
+
+            self._condition.notify_all()
+
+    def _decrease(self, reason: str, started: float):
+        # Requests that were already in flight at the last cut reflect the old limit
+        if started < self._last_decrease:
+            return
+
+        now = time.monotonic()
+        old_limit = self.current_limit
+        self.limit = max(self.config["min_limit"], self.limit * self.config["decrease_factor"])
+        self._last_decrease = now
+        logger.info(f"TTS concurrency decreased ({reason}): {old_limit} -> {self.current_limit}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get concurrency controller metrics.
+
+        Returns:
+            Dict[str, Any]: Current limit, in-flight requests and outcome counters
+        """
+        return {
+            "limit": self.current_limit,
+            "in_flight": self.in_flight,
+            "successes": self.successes,
+            "throttled": self.throttled,
+            "errors": self.errors
+        }
+
+class TTSRateController:
+    """
+    Combines the AIMD concurrency limit with an optional character quota bucket.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the rate controller.
+
+        Args:
+            config: Options for the concurrency controller, plus "characters_per_minute"
+                    for the character quota (optional, no quota if unset)
+        """
+        config = dict(config or {})
+        characters_per_minute = config.pop("characters_per_minute", None)
+
+        self.concurrency = AIMDConcurrencyController(config)
+        self.quota = TokenBucket(characters_per_minute) if characters_per_minute else None
+
+    @asynccontextmanager
+    async def request(self, characters: int):
+        """
+        Run one request under the character quota and the concurrency limit.
+        The body should raise on failure; the outcome is classified from the exception.
+
+        Args:
+            characters: Number of characters the request consumes
+        """
+        if self.quota is not None:
+            await self.quota.acquire(characters)
+
+        await self.concurrency.acquire()
+        start = time.monotonic()
+        outcome = "rejected"
+        try:
+            yield
+            outcome = "ok"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            status_code = getattr(e, "status_code", None)
+            if status_code == 429:
+                outcome = "throttled"
+            elif status_code is None or status_code >= 500:
+                outcome = "error"
+            raise
+        finally:
+            await asyncio.shield(self.concurrency.release(
+                time.monotonic() - start,
+                cost=characters,
+                outcome=outcome
+            ))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get rate controller metrics.
+
+        Returns:
+            Dict[str, Any]: Concurrency metrics plus the available quota, if any
+        """
+        stats = self.concurrency.stats()
+        if self.quota is not None:
+            stats["quota_available"] = int(self.quota.tokens)
+        return stats
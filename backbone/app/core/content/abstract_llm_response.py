@@ -1,7 +1,23 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, List, Optional
 
 class AbstractLLMResponse(ABC):
+    # Stop reason and token usage of the last response, when the LLM reports them
+    last_turn: Optional[Dict] = None
+    
     @abstractmethod
-    def generate_response(self, user_prompt: str) -> str:
-        """Generate a response to a prompt using the LLM"""
+    async def generate_response(self, user_prompt: str, prefix: str = "") -> str:
+        """Generate a response to prefix + user_prompt using the LLM, without blocking the event loop.
+        The prefix is the part shared by many requests, which providers with prompt caching can cache"""
         pass
+    
+    def cache_params(self) -> Dict:
+        """Request parameters that affect the response (model, temperature, ...), for caching"""
+        return {}
+    
+    async def stream_response(self, user_prompt: str, history: Optional[List[Dict[str, str]]] = None,
+                              prefix: str = "") -> AsyncIterator[str]:
+        """Stream a response to a prompt after earlier role/content turns, in chunks (one chunk unless overridden).
+        The prefix opens the conversation's first user message"""
+        turns = [message["content"] for message in history or []]
+        yield await self.generate_response("\n\n".join(turns + [user_prompt]), prefix=prefix)
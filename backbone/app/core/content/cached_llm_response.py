@@ -0,0 +1,106 @@
+"""
+Cached LLM Response
+
+This module wraps an LLM response implementation with the disk response cache, so an
+identical request (same model, parameters and merged prompt) within the cache TTL is
+answered from disk instead of the LLM.
+"""
+
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Optional
+
+from app.core.content.abstract_llm_response import AbstractLLMResponse
+from app.infrastructure.storage.llm_cache import LLMResponseCache
+
+logger = logging.getLogger(__name__)
+
+class CachedLLMResponse(AbstractLLMResponse):
+    """
+    AbstractLLMResponse decorator answering repeated requests from the LLM response cache.
+    """
+
+    def __init__(self, llm: AbstractLLMResponse, cache: LLMResponseCache):
+        """
+        Initialize the cached response.
+
+        Args:
+            llm: LLM response implementation to call on a cache miss
+            cache: Response cache
+        """
+        self.llm = llm
+        self.cache = cache
+        self.last_turn = None
+
+    def cache_params(self) -> Dict:
+        """Request parameters of the wrapped LLM, with its implementation name."""
+        return {"llm": type(self.llm).__name__, **self.llm.cache_params()}
+
+    async def generate_response(self, user_prompt: str, *args, prefix: str = "") -> str:
+        """
+        Generate a response, from the cache when the same request was answered before.
+
+        Args:
+            user_prompt: The prompt to send to the LLM
+            *args: Further arguments of the wrapped implementation (part of the cache key)
+            prefix: Stable start of the prompt (optional)
+
+        Returns:
+            The generated or cached response
+        """
+        params = self.cache_params()
+        if args:
+            params["args"] = list(args)
+        key = LLMResponseCache.make_key(params, user_prompt, prefix=prefix)
+
+        entry = await asyncio.to_thread(self.cache.lookup, key)
+        if entry is not None:
+            logger.info(f"LLM cache hit for {params['llm']} ({key[:12]})")
+            self.last_turn = self._cached_turn(entry)
+            return entry["text"]
+
+        text = await self.llm.generate_response(user_prompt, *args, prefix=prefix)
+        self.last_turn = self.llm.last_turn
+        if text:
+            await asyncio.to_thread(self.cache.store, key, text, self.last_turn)
+        return text
+
+    async def stream_response(self, user_prompt: str, history: Optional[List[Dict[str, str]]] = None,
+                              prefix: str = "") -> AsyncIterator[str]:
+        """
+        Stream a response, or replay it as one chunk when the same turn was answered before.
+        Only complete responses are cached.
+
+        Args:
+            user_prompt: The prompt to send to the LLM
+            history: Earlier turns of the conversation, as role/content messages (optional)
+            prefix: Stable start of the conversation's first user message (optional)
+
+        Yields:
+            Chunks of the response, in order
+        """
+        key = LLMResponseCache.make_key(self.cache_params(), user_prompt, history, prefix)
+
+        entry = await asyncio.to_thread(self.cache.lookup, key)
+        if entry is not None:
+            logger.info(f"LLM cache hit for {type(self.llm).__name__} ({key[:12]})")
+            self.last_turn = self._cached_turn(entry)
+            yield entry["text"]
+            return
+
+        text = ""
+        async for chunk in self.llm.stream_response(user_prompt, history=history, prefix=prefix):
+            text += chunk
+            yield chunk
+
+        self.last_turn = self.llm.last_turn
+        if text:
+            await asyncio.to_thread(self.cache.store, key, text, self.last_turn)
+
+    @staticmethod
+    def _cached_turn(entry: Dict) -> Dict:
+        """
+        Describe a turn answered from the cache: the original stop reason, and no token usage,
+        since nothing was sent to the LLM (the stored usage belongs to the original request).
+        """
+        return {"stop_reason": (entry.get("turn") or {}).get("stop_reason"), "cached": True}
@@ -1,3 +1,4 @@
+from typing import AsyncIterator, Dict, List, Optional
 from app.core.content.abstract_llm_response import AbstractLLMResponse
 from app.infrastructure.ai_services.claude_thinking_generate import ClaudeThinkingGenerate
 from app.common.config import ConfigService, get_config_service
@@ -9,14 +10,40 @@ class ClaudeLLMResponse(AbstractLLMResponse):
         self.config_service = config_service or get_config_service()
         self.claude_service = ClaudeThinkingGenerate(config_service=self.config_service)
     
-    def generate_response(self, user_prompt: str) -> str:
+    def cache_params(self) -> Dict:
+        """Request parameters that affect the response, for caching."""
+        return {"provider": "anthropic", **self.claude_service.thinking_params()}
+    
+    async def generate_response(self, user_prompt: str, prefix: str = "") -> str:
         """
         Generate a response to a prompt using Claude with thinking enabled.
         
         Args:
             user_prompt: The prompt to send to Claude
+            prefix: Stable start of the prompt, cached by Claude across requests (optional)
             
         Returns:
             The generated response from Claude
         """
-        return self.claude_service.generate_text_with_thinking(user_prompt) 
\ No newline at end of file
+        return await self.claude_service.generate_text_with_thinking(user_prompt, prefix)
+    
+    @property
+    def last_turn(self) -> Dict:
+        """Stop reason and token usage of the last response."""
+        return self.claude_service.last_turn
+    
+    async def stream_response(self, user_prompt: str, history: Optional[List[Dict[str, str]]] = None,
+                              prefix: str = "") -> AsyncIterator[str]:
+        """
+        Stream a response to a prompt using Claude with thinking enabled.
+        
+        Args:
+            user_prompt: The prompt to send to Claude
+            history: Earlier turns of the conversation, as role/content messages (optional)
+            prefix: Stable start of the conversation's first user message, cached by Claude (optional)
+            
+        Yields:
+            Chunks of the response from Claude, as they are generated
+        """
+        async for text in self.claude_service.stream_text_with_thinking(user_prompt, history, prefix):
+            yield text
@@ -0,0 +1,186 @@
+"""
+Bounded Continuation
+
+This module continues an LLM response that needs more than one turn, such as a long
+video list. The prompt is sent once; each continuation replays the earlier output as
+assistant turns and adds a short instruction chosen from the stop reason (cut off at
+max_tokens, or ended without completing). Turns and output tokens are capped, and
+per-job metrics record how many continuations each response needed.
+"""
+
+import time
+import logging
+import threading
+from collections import Counter
+from typing import Dict, List, Any, Optional, Callable, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+CUT_OFF_PROMPT = (
+    "Your previous message was cut off. Continue exactly where it stopped, "
+    "without repeating anything already written."
+)
+INCOMPLETE_PROMPT = (
+    "Continue where your previous message ended, without repeating anything already "
+    "written. Write finish when the list is complete."
+)
+
+class ContinuationSession:
+    """
+    One response generated over as many turns as needed, within a budget.
+    """
+
+    def __init__(self, llm, prompt: str, config: Optional[Dict[str, Any]] = None, prefix: str = ""):
+        """
+        Initialize the session.
+
+        Args:
+            llm: LLM response implementation (AbstractLLMResponse)
+            prompt: Prompt of the first turn
+            config: Budget options (optional, overrides the defaults)
+            prefix: Stable start of the first turn, sent with every turn so providers with
+                    prompt caching read it from cache (optional)
+        """
+        self.llm = llm
+        self.prompt = prompt
+        self.prefix = prefix
+
+        # Default configuration
+        self.config = {
+            "max_turns": 4,              # Turns including the first (hard cap)
+            "max_output_tokens": 32000   # Output tokens across all turns (hard cap)
+        }
+
+        if config:
+            self.config.update({key: value for key, value in config.items() if value is not None})
+
+        self.text = ""
+        self.metrics = {
+            "turns": 0,
+            "cached_turns": 0,
+            "continuations": 0,
+            "stop_reasons": [],
+            "input_tokens": 0,
+            "cache_read_input_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "output_tokens": 0,
+            "finished": False,
+            "budget_exhausted": False,
+            "elapsed_seconds": 0.0
+        }
+
+    async def stream(self, is_complete: Callable[[str], bool]) -> AsyncIterator[str]:
+        """
+        Stream the response, continuing it until it is complete or the budget runs out.
+
+        Args:
+            is_complete: Called with the text so far after each turn; True ends the session
+
+        Yields:
+            Chunks of the response, in order, across turns
+        """
+        started = time.monotonic()
+        history: List[Dict[str, str]] = []
+        user_prompt = self.prompt
+
+        try:
+            while True:
+                turn_text = ""
+                async for text in self.llm.stream_response(user_prompt, history=history, prefix=self.prefix):
+                    turn_text += text
+                    self.text += text
+                    yield text
+
+                turn = getattr(self.llm, "last_turn", None) or {}
+                stop_reason = turn.get("stop_reason")
+                self.metrics["turns"] += 1
+                self.metrics["stop_reasons"].append(stop_reason)
+                self.metrics["input_tokens"] += turn.get("input_tokens") or 0
+                self.metrics["cache_read_input_tokens"] += turn.get("cache_read_input_tokens") or 0
+                self.metrics["cache_creation_input_tokens"] += turn.get("cache_creation_input_tokens") or 0
+                # Without usage from the provider, estimate about 4 characters per token
+                # (turns answered from the response cache cost nothing)
+                if not turn.get("cached"):
+                    self.metrics["output_tokens"] += turn.get("output_tokens") or len(turn_text) // 4
+                else:
+                    self.metrics["cached_turns"] += 1
+
+                if is_complete(self.text):
+                    self.metrics["finished"] = True
+                    return
+                if not turn_text.strip():
+                    logger.warning("LLM turn returned no text, not continuing")
+                    return
+                if (self.metrics["turns"] >= self.config["max_turns"]
+                        or self.metrics["output_tokens"] >= self.config["max_output_tokens"]):
+                    self.metrics["budget_exhausted"] = True
+                    logger.warning(
+                        f"Continuation budget exhausted after {self.metrics['turns']} turns "
+                        f"and {self.metrics['output_tokens']} output tokens, using the partial response"
+                    )
+                    return
+
+                history += [{"role": "user", "content": user_prompt}, {"role": "assistant", "content": turn_text}]
+                user_prompt = CUT_OFF_PROMPT if stop_reason == "max_tokens" else INCOMPLETE_PROMPT
+                self.metrics["continuations"] += 1
+                logger.info(f"Continuing LLM response (turn {self.metrics['turns'] + 1}, stop reason {stop_reason})")
+        finally:
+            self.metrics["elapsed_seconds"] = round(time.monotonic() - started, 2)
+            _stats.record(self.metrics)
+
+class ContinuationStats:
+    """
+    Continuation metrics across jobs since the server started.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.jobs = 0
+        self.finished = 0
+        self.budget_exhausted = 0
+        self.continuations = Counter()
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def record(self, metrics: Dict[str, Any]) -> None:
+        """
+        Record the metrics of a finished session.
+
+        Args:
+            metrics: Session metrics
+        """
+        with self._lock:
+            self.jobs += 1
+            self.finished += int(metrics["finished"])
+            self.budget_exhausted += int(metrics["budget_exhausted"])
+            self.continuations[metrics["continuations"]] += 1
+            self.input_tokens += metrics["input_tokens"]
+            self.output_tokens += metrics["output_tokens"]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the metrics.
+
+        Returns:
+            Dict[str, Any]: Job counts, jobs per number of continuations, and token totals
+        """
+        with self._lock:
+            return {
+                "jobs": self.jobs,
+                "finished": self.finished,
+                "budget_exhausted": self.budget_exhausted,
+                "continuations": {str(count): jobs for count, jobs in sorted(self.continuations.items())},
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens
+            }
+
+_stats = ContinuationStats()
+
+def continuation_stats() -> Dict[str, Any]:
+    """
+    Get continuation metrics across jobs since the server started.
+
+    Returns:
+        Dict[str, Any]: Continuation metrics
+    """
+    return _stats.stats()
@@ -1,3 +1,4 @@
+from typing import Dict
 from app.core.content.abstract_llm_response import AbstractLLMResponse
 from app.infrastructure.ai_services.claude_thinking_generate import ClaudeThinkingGenerate
 from app.common.config import ConfigService, get_config_service
@@ -9,15 +10,25 @@ class StandardClaudeResponse(AbstractLLMResponse):
         self.config_service = config_service or get_config_service()
         self.claude_service = ClaudeThinkingGenerate(config_service=self.config_service)
     
-    def generate_response(self, user_prompt: str) -> str:
+    def cache_params(self) -> Dict:
+        """Request parameters that affect the response, for caching."""
+        return {"provider": "anthropic", **self.claude_service.standard_params()}
+    
+    @property
+    def last_turn(self) -> Dict:
+        """Stop reason and token usage of the last response."""
+        return self.claude_service.last_turn
+    
+    async def generate_response(self, user_prompt: str, prefix: str = "") -> str:
         """
         Generate a response to a prompt using Claude without thinking enabled.
         Uses the test_generate method which doesn't have thinking enabled.
         
         Args:
             user_prompt: The prompt to send to Claude
+            prefix: Stable start of the prompt, cached by Claude across requests (optional)
             
         Returns:
             The generated response from Claude
         """
-        return self.claude_service.test_generate(user_prompt) 
\ No newline at end of file
+        return await self.claude_service.test_generate(user_prompt, prefix) 
\ No newline at end of file
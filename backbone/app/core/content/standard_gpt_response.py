@@ -1,3 +1,4 @@
+from typing import Dict
 from app.core.content.abstract_llm_response import AbstractLLMResponse
 from app.common.config import ConfigService, get_config_service
 from app.infrastructure.ai_services.gpt_generate import GPTGenerate
@@ -13,7 +14,11 @@ class StandardGPTResponse(AbstractLLMResponse):
         self.config_service = config_service or get_config_service()
         self.gpt_service = GPTGenerate()
     
-    def generate_response(self, list_prompt: str, polish_output: str = None) -> str:
+    def cache_params(self) -> Dict:
+        """Request parameters that affect the response, for caching."""
+        return {"provider": "openai", **self.gpt_service.request_params()}
+    
+    async def generate_response(self, list_prompt: str, polish_output: str = None, prefix: str = "") -> str:
         """
         Generate a response to a prompt using GPT.
         Uses the generate_text method with list_prompt as system prompt and polish_output as user prompt.
@@ -21,6 +26,7 @@ class StandardGPTResponse(AbstractLLMResponse):
         Args:
             list_prompt: Instructions and format requirements to use as system prompt
             polish_output: Content to transform, used as the user prompt
+            prefix: Stable start of the system prompt (OpenAI caches repeated prefixes automatically)
             
         Returns:
             The generated response from GPT
@@ -28,7 +34,7 @@ class StandardGPTResponse(AbstractLLMResponse):
         logger.info("Generating response with GPT")
         
         # Use list_prompt as the system prompt
-        system_prompt = list_prompt
+        system_prompt = prefix + list_prompt
         logger.info(f"System prompt length: {len(system_prompt)}")
         
         # Use polish_output as the user prompt, or a simple request if None
@@ -40,7 +46,7 @@ class StandardGPTResponse(AbstractLLMResponse):
             logger.info("Using default user prompt")
         
         try:
-            result = self.gpt_service.generate_text(user_prompt=user_prompt, system_prompt=system_prompt)
+            result = await self.gpt_service.generate_text(user_prompt=user_prompt, system_prompt=system_prompt)
             logger.info(f"GPT response received, length: {len(result) if result else 0}")
             return result
         except Exception as e:
@@ -0,0 +1,122 @@
+"""
+Video List Stream Parser
+
+This module parses video_list entries out of streamed LLM output. Text is fed in as it
+arrives, and each top-level "audio_N.mp3" entry is emitted as soon as its object closes,
+so the entry can start its TTS and clip prefetch while the rest of the list is generated.
+Prose around the JSON and markdown fences are ignored.
+"""
+
+import re
+import json
+import logging
+from typing import Dict, List, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+AUDIO_KEY_PATTERN = re.compile(r"^audio_\d+\.mp3$")
+
+class VideoListStreamParser:
+    """
+    Incremental parser for video_list JSON embedded in streamed text.
+
+    Only strings and braces are tracked, so each character is scanned once however the
+    text is split into chunks.
+    """
+
+    def __init__(self):
+        self._depth = 0              # Current brace depth (0 outside JSON)
+        self._in_string = False
+        self._escaped = False
+        self._string_start = None    # Offset of the opening quote of the current string
+        self._last_key = None        # Last string seen at depth 1 (the key of the next value)
+        self._entry_key = None       # Key of the entry being read
+        self._entry_start = None     # Offset of the entry's opening brace
+        self._buffer = ""            # Text since the start of the current entry or key
+        self._offset = 0             # Offset of the buffer in the stream
+        self._position = 0           # Offset of the next character to scan
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    def feed(self, text: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Feed the next chunk of text.
+
+        Args:
+            text: Next chunk of the streamed response
+
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: (audio filename, entry) of each entry closed by
+                                              this chunk, in stream order
+        """
+        self._buffer += text
+        completed = []
+
+        for i in range(self._position - self._offset, len(self._buffer)):
+            char = self._buffer[i]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = self._buffer[self._string_start + 1:i]
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._last_key = None
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char == "{":
+                self._depth += 1
+                if self._depth == 2:
+                    self._entry_key, self._entry_start = self._last_key, i
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 1 and self._entry_start is not None:
+                    entry = self._parse_entry(self._buffer[self._entry_start:i + 1])
+                    if entry is not None:
+                        completed.append((self._entry_key, entry))
+                    self._entry_start = None
+
+        self._position = self._offset + len(self._buffer)
+        self._trim()
+        return completed
+
+    def _parse_entry(self, text: str):
+        """Parse a closed entry, keeping it only if it is a narrated audio entry."""
+        if not self._entry_key or not AUDIO_KEY_PATTERN.match(self._entry_key):
+            return None
+        try:
+            entry = json.loads(text)
+        except json.JSONDecodeError:
+            logger.debug(f"Skipping malformed streamed entry {self._entry_key}")
+            return None
+        if not isinstance(entry, dict) or not entry.get("line"):
+            return None
+
+        self.entries[self._entry_key] = entry
+        return entry
+
+    def _trim(self):
+        """Drop scanned text that can no longer be part of an entry or key."""
+        keep_from = len(self._buffer)
+        if self._entry_start is not None:
+            keep_from = self._entry_start
+        elif self._in_string:
+            keep_from = self._string_start
+
+        if keep_from:
+            self._buffer = self._buffer[keep_from:]
+            self._offset += keep_from
+            if self._entry_start is not None:
+                self._entry_start -= keep_from
+            if self._in_string:
+                self._string_start -= keep_from
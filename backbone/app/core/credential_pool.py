@@ -0,0 +1,350 @@
+"""
+Credential Pools
+
+This module spreads requests to a provider across several API keys. Each key has its own
+rate budget (cost per minute, e.g. TTS characters or LLM requests), its own adaptive
+concurrency limit, and health tracking: throttled keys cool down, keys failing repeatedly
+are rested, and rejected keys (401/403) are taken out of rotation. Each request goes to the
+least-loaded usable key, so aggregate throughput scales with the number of keys.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Optional
+
+from app.core.audio.rate_control import AIMDConcurrencyController
+
+logger = logging.getLogger(__name__)
+
+class CredentialPoolExhausted(Exception):
+    """Raised when no key of a pool can be used."""
+
+class Budget:
+    """
+    Per-minute cost budget. Requests reserve their cost up front and wait out any debt,
+    so callers are served in order.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        """
+        Initialize the budget.
+
+        Args:
+            rate_per_minute: Cost allowed per minute (a full minute can be used at once)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = rate_per_minute
+        self.available = rate_per_minute
+        self._last_refill = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def delay(self, cost: float) -> float:
+        """
+        Get how long a request of this cost would wait, without reserving it.
+
+        Args:
+            cost: Request cost
+
+        Returns:
+            float: Wait in seconds
+        """
+        self._refill()
+        return max(0.0, min(cost, self.capacity) - self.available) / self.rate
+
+    def reserve(self, cost: float) -> float:
+        """
+        Reserve a request's cost.
+
+        Args:
+            cost: Request cost
+
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        wait = self.delay(cost)
+        self.available -= min(cost, self.capacity)
+        return wait
+
+class Credential:
+    """
+    One API key of a pool, with its budget, concurrency limit and health.
+    """
+
+    def __init__(self, name: str, key: str, config: Dict[str, Any]):
+        """
+        Initialize the credential.
+
+        Args:
+            name: Name used in logs and stats (never the key itself)
+            key: API key
+            config: Pool configuration
+        """
+        self.name = name
+        self.key = key
+        self.budget = Budget(config["budget_per_minute"]) if config.get("budget_per_minute") else None
+        self.concurrency = AIMDConcurrencyController({
+            "initial_limit": config["initial_limit"],
+            "max_limit": max(config["max_limit"], config["initial_limit"])
+        })
+
+        self.pending = 0             # Requests assigned to the key and not finished
+        self.cooldown_until = 0.0    # Monotonic time until which the key is rested
+        self.disabled = False        # Rejected by the provider
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.failures = 0
+        self.last_used = 0.0
+
+    def usable(self, now: float) -> bool:
+        """Whether the key can take requests now."""
+        return not self.disabled and now >= self.cooldown_until
+
+    def load(self) -> float:
+        """Assigned requests relative to the key's concurrency limit."""
+        return self.pending / self.concurrency.current_limit
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the credential's metrics.
+
+        Returns:
+            Dict[str, Any]: Health, load and outcome counters
+        """
+        return {
+            "name": self.name,
+            "disabled": self.disabled,
+            "cooling_down": max(0.0, round(self.cooldown_until - time.monotonic(), 1)),
+            "pending": self.pending,
+            "limit": self.concurrency.current_limit,
+            "budget_available": int(self.budget.available) if self.budget else None,
+            "requests": self.requests,
+            "failures": self.failures
+        }
+
+class CredentialPool:
+    """
+    Least-loaded selection over a provider's API keys.
+    """
+
+    def __init__(self, provider: str, keys: List[str], config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            provider: Provider name used in logs (e.g. "ElevenLabs")
+            keys: API keys (duplicates are ignored)
+            config: Pool options (optional, overrides the defaults)
+        """
+        self.provider = provider
+
+        # Default configuration
+        self.config = {
+            "initial_limit": 4,          # Starting concurrency per key
+            "max_limit": 32,             # Maximum concurrency per key
+            "budget_per_minute": None,   # Cost allowed per key per minute (None for no budget)
+            "failure_threshold": 3,      # Consecutive failures before a key is rested
+            "cooldown": 30.0,            # Seconds a throttled or failing key is rested
+            "max_cooldown": 300.0        # Longest rest after repeated failures
+        }
+
+        if config:
+            self.config.update({key: value for key, value in config.items() if value is not None})
+
+        unique_keys = list(dict.fromkeys(key for key in keys if key))
+        self.credentials = [
+            Credential(f"{provider}#{i + 1}", key, self.config) for i, key in enumerate(unique_keys)
+        ]
+        self._lock = threading.Lock()
+
+        logger.info(f"{provider} credential pool with {len(self.credentials)} key(s)")
+
+    def __len__(self) -> int:
+        return len(self.credentials)
+
+    def _select(self, cost: float) -> Credential:
+        """
+        Pick the key for a request and reserve it.
+
+        Usable keys are ranked by budget wait, then load, then least recent use. If every
+        key is resting, the one back soonest is used.
+
+        Args:
+            cost: Request cost
+
+        Returns:
+            Credential: The selected key
+
+        Raises:
+            CredentialPoolExhausted: If the pool has no key the provider accepts
+        """
+        with self._lock:
+            candidates = [credential for credential in self.credentials if not credential.disabled]
+            if not candidates:
+                raise CredentialPoolExhausted(f"No usable {self.provider} API key")
+
+            now = time.monotonic()
+            usable = [credential for credential in candidates if credential.usable(now)]
+            if usable:
+                credential = min(usable, key=lambda c: (
+                    c.budget.delay(cost) if c.budget else 0.0, c.load(), c.last_used
+                ))
+            else:
+                credential = min(candidates, key=lambda c: c.cooldown_until)
+
+            credential.pending += 1
+            credential.requests += 1
+            credential.last_used = now
+            return credential
+
+    def _wait_time(self, credential: Credential, cost: float) -> float:
+        """Reserve the request's budget and get the total wait (rest and budget)."""
+        with self._lock:
+            wait = max(0.0, credential.cooldown_until - time.monotonic())
+            if credential.budget:
+                wait = max(wait, credential.budget.reserve(cost))
+            return wait
+
+    def _finish(self, credential: Credential, error: Optional[BaseException] = None):
+        """
+        Release a key and update its health from the request outcome.
+
+        Args:
+            credential: The key used
+            error: The exception the request raised, if any
+        """
+        with self._lock:
+            credential.pending -= 1
+            if error is None:
+                credential.consecutive_failures = 0
+                return
+
+            status_code = getattr(error, "status_code", None)
+            if status_code is None and isinstance(error, (asyncio.CancelledError, KeyboardInterrupt)):
+                return
+            if status_code is not None and 400 <= status_code < 500 and status_code not in (401, 403, 408, 409, 429):
+                # The request was rejected, not the key
+                return
+
+            credential.failures += 1
+            credential.consecutive_failures += 1
+
+            if status_code in (401, 403):
+                if not credential.disabled:
+                    logger.warning(f"{credential.name} was rejected ({status_code}), removing it from rotation")
+                credential.disabled = True
+            elif status_code == 429:
+                self._rest(credential, _retry_after(error))
+            elif credential.consecutive_failures >= self.config["failure_threshold"]:
+                self._rest(credential)
+
+    def _rest(self, credential: Credential, seconds: Optional[float] = None):
+        """Rest a key, doubling the rest on each further failure up to the maximum."""
+        if seconds is None:
+            exponent = max(credential.consecutive_failures - self.config["failure_threshold"], 0)
+            seconds = min(self.config["cooldown"] * (2 ** exponent), self.config["max_cooldown"])
+        credential.cooldown_until = max(credential.cooldown_until, time.monotonic() + seconds)
+        logger.info(f"{credential.name} resting for {seconds:.1f}s")
+
+    @asynccontextmanager
+    async def request(self, cost: float = 1.0):
+        """
+        Run one async request on the least-loaded key, under its budget and concurrency limit.
+        The body should raise on failure; the key's health is updated from the exception.
+
+        Args:
+            cost: Request cost counted against the key's budget
+
+        Yields:
+            str: The API key to use
+        """
+        credential = self._select(cost)
+        error = None
+        try:
+            wait = self._wait_time(credential, cost)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            await credential.concurrency.acquire()
+            start = time.monotonic()
+            outcome = "rejected"
+            try:
+                yield credential.key
+                outcome = "ok"
+            except (GeneratorExit, asyncio.CancelledError):
+                # Closed early by the consumer (e.g. a stopped stream): no latency sample
+                raise
+            except Exception as e:
+                status_code = getattr(e, "status_code", None)
+                if status_code == 429:
+                    outcome = "throttled"
+                elif status_code is None or status_code >= 500:
+                    outcome = "error"
+                raise
+            finally:
+                await asyncio.shield(credential.concurrency.release(
+                    time.monotonic() - start, cost=cost, outcome=outcome
+                ))
+        except (GeneratorExit, asyncio.CancelledError):
+            # Not the key's fault: release it without counting a failure
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._finish(credential, error)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool metrics.
+
+        Returns:
+            Dict[str, Any]: Provider, number of usable keys and per-key metrics
+        """
+        now = time.monotonic()
+        return {
+            "provider": self.provider,
+            "keys": len(self.credentials),
+            "usable": sum(1 for credential in self.credentials if credential.usable(now)),
+            "credentials": [credential.stats() for credential in self.credentials]
+        }
+
+_pools: Dict[tuple, CredentialPool] = {}
+_pools_lock = threading.Lock()
+
+def get_credential_pool(provider: str, keys: List[str], config: Optional[Dict[str, Any]] = None) -> CredentialPool:
+    """
+    Get the shared pool of a provider's keys, so every client of the provider in the
+    process spreads its requests over the same budgets and health.
+
+    Args:
+        provider: Provider name
+        keys: API keys
+        config: Pool options, used when the pool is created
+
+    Returns:
+        CredentialPool: The pool
+    """
+    pool_key = (provider, tuple(keys))
+    with _pools_lock:
+        if pool_key not in _pools:
+            _pools[pool_key] = CredentialPool(provider, keys, config)
+        return _pools[pool_key]
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Get the rest a provider asked for, from the error or its response headers."""
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return float(retry_after)
+
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers["retry-after"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
@@ -82,7 +82,8 @@ class AudioVideoMerger(VideoOperation):
     """Interface for merging audio and video files."""
     
     @abstractmethod
-    async def process(self, audio_file: str, video_file: str, output_file: str) -> str:
+    async def process(self, audio_file: str, video_file: str, output_file: str, start_offset: float = 0.0,
+                      gain_db: float = 0.0, audio_start: float = 0.0, audio_end: Optional[float] = None) -> str:
         """
         Merge audio and video files.
         
@@ -90,6 +91,10 @@ class AudioVideoMerger(VideoOperation):
             audio_file: Path to the audio file
             video_file: Path to the video file
             output_file: Path to save the merged file
+            start_offset: Offset into the video to start from, in seconds
+            gain_db: Gain applied to the audio, in dB
+            audio_start: Offset into the audio to start from, in seconds
+            audio_end: Offset into the audio to stop at, in seconds (None for the end)
             
         Returns:
             Path to the merged file
@@ -134,7 +139,9 @@ class SplitCaptionAdder(VideoOperation):
         output_file: str, 
         position: str = "bottom",
         font_size: int = 24,
-        max_chars_per_line: int = 40
+        max_chars_per_line: int = 40,
+        duration: Optional[float] = None,
+        word_timings: Optional[List[Dict[str, Any]]] = None
     ) -> str:
         """
         Add split captions to a video.
@@ -146,6 +153,8 @@ class SplitCaptionAdder(VideoOperation):
             position: Position of the caption (top, bottom)
             font_size: Font size for the caption
             max_chars_per_line: Maximum characters per line
+            duration: Duration of the video in seconds, if already known
+            word_timings: When each word of the narration is spoken (word, start, end in seconds)
             
         Returns:
             Path to the captioned video
@@ -212,7 +221,8 @@ class YouTubeAudioMerger(VideoOperation):
                      output_file: str, 
                      start_time: float = 0.0, 
                      trim_audio: float = 0.0, 
-                     volume: float = 1.0) -> str:
+                     volume: float = 1.0,
+                     voice_file: Optional[str] = None) -> str:
         """
         Download audio from YouTube and merge it with a video.
         
@@ -223,6 +233,7 @@ class YouTubeAudioMerger(VideoOperation):
             start_time: Start time in seconds to begin the audio in the video
             trim_audio: Trim the beginning of the YouTube audio by this many seconds
             volume: Volume of the YouTube audio (0.0-1.0)
+            voice_file: Narration to mix with instead of the video's audio (optional)
             
         Returns:
             Path to the merged file
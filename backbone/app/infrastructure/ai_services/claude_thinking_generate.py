@@ -1,8 +1,37 @@
 import anthropic
+import asyncio
 import os
 import sys
+import logging
+import threading
+from collections import Counter
+from typing import AsyncIterator, Any, Dict, List, Optional
 from dotenv import load_dotenv
 from app.common.config import ConfigService, get_config_service
+from app.core.credential_pool import get_credential_pool
+
+logger = logging.getLogger(__name__)
+
+# Token usage of every Claude request since the server started, for prompt caching metrics
+_usage_totals = Counter()
+_usage_lock = threading.Lock()
+
+def claude_usage_stats() -> Dict[str, Any]:
+    """
+    Get Claude token usage since the server started, including prompt cache reads and writes.
+    
+    Returns:
+        Dict[str, Any]: Request count, token totals and the share of input tokens read from cache
+    """
+    with _usage_lock:
+        totals = dict(_usage_totals)
+    
+    stats = {field: totals.get(field, 0) for field in (
+        "requests", "input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens", "output_tokens"
+    )}
+    prompt_tokens = stats["input_tokens"] + stats["cache_creation_input_tokens"] + stats["cache_read_input_tokens"]
+    stats["cache_read_ratio"] = round(stats["cache_read_input_tokens"] / prompt_tokens, 4) if prompt_tokens else 0.0
+    return stats
 
 class ClaudeThinkingGenerate:
     def __init__(self, config_service: ConfigService = None):
@@ -10,40 +39,120 @@ class ClaudeThinkingGenerate:
         load_dotenv()
         # Get or create ConfigService instance
         self.config_service = config_service or get_config_service()
-        # Initialize Claude client with API key from environment
-        self.client = anthropic.Anthropic(api_key=self.config_service.get_env('ANTRO_CHAT'))
+        # Pool of API keys from environment (ANTRO_CHAT, comma-separated or ANTRO_CHAT_1, ANTRO_CHAT_2, ...)
+        claude_config = self.config_service.get("claude_api", {})
+        self.credential_pool = get_credential_pool("Anthropic", self.config_service.get_env_list('ANTRO_CHAT'), {
+            "budget_per_minute": claude_config.get("requests_per_minute_per_key")
+        })
+        self._clients = {}
+        # Stop reason and token usage of the last response
+        self.last_turn = {}
+    
+    def _client(self, api_key: str) -> anthropic.AsyncAnthropic:
+        """Get the async Claude client of an API key, creating it if needed."""
+        if api_key not in self._clients:
+            self._clients[api_key] = anthropic.AsyncAnthropic(api_key=api_key)
+        return self._clients[api_key]
 
-    def generate_text_with_thinking(self, user_prompt: str) -> str:
+    def thinking_params(self) -> Dict:
         """
-        Generate a text response from Claude with thinking enabled.
-        This returns the final text output, not the thinking process.
+        Get the request parameters of responses with thinking enabled.
         
-        Args:
-            user_prompt: The prompt to send to Claude
-            
         Returns:
-            The final text response from Claude
+            Model, max_tokens, temperature and thinking budget from the claude_api config
         """
         # Get Claude API configuration
         claude_config = self.config_service.get("claude_api", {})
         
         # Get parameters with defaults
-        model = claude_config.get("model", "claude-3-7-sonnet-20250219")
-        creative_max_tokens = claude_config.get("creative_max_tokens", 4000)
-        creative_temperature = claude_config.get("creative_temperature", 1.0)
-        thinking_budget_tokens = claude_config.get("thinking_budget_tokens", 1500)
-        
-        response = self.client.messages.create(
-            model=model,
-            max_tokens=creative_max_tokens,
-            temperature=creative_temperature,
-            thinking={
+        return {
+            "model": claude_config.get("model", "claude-3-7-sonnet-20250219"),
+            "max_tokens": claude_config.get("creative_max_tokens", 4000),
+            "temperature": claude_config.get("creative_temperature", 1.0),
+            "thinking": {
                 "type": "enabled",
-                "budget_tokens": thinking_budget_tokens
-            },
-            messages=[{"role": "user", "content": user_prompt}]
+                "budget_tokens": claude_config.get("thinking_budget_tokens", 1500)
+            }
+        }
+    
+    def standard_params(self) -> Dict:
+        """
+        Get the request parameters of responses without thinking.
+        
+        Returns:
+            Model, max_tokens and temperature from the claude_api config
+        """
+        # Get Claude API configuration
+        claude_config = self.config_service.get("claude_api", {})
+        
+        # Get parameters with defaults
+        return {
+            "model": claude_config.get("model", "claude-3-7-sonnet-20250219"),
+            "max_tokens": claude_config.get("polish_max_tokens", 1000),
+            "temperature": claude_config.get("polish_temperature", 0.5)
+        }
+
+    def _messages(self, user_prompt: str, history: Optional[List[Dict[str, str]]] = None, prefix: str = "") -> List[Dict]:
+        """
+        Build the messages of a request. The stable prefix opens the first user message
+        with a cache breakpoint, so requests sharing it read it from Claude's prompt cache.
+        
+        Args:
+            user_prompt: The prompt to send to Claude
+            history: Earlier turns of the conversation, as role/content messages (optional)
+            prefix: Stable start of the conversation's first user message (optional)
+            
+        Returns:
+            The messages to send
+        """
+        messages = list(history or []) + [{"role": "user", "content": user_prompt}]
+        if prefix:
+            blocks = [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+            if messages[0]["content"]:
+                blocks.append({"type": "text", "text": messages[0]["content"]})
+            messages[0] = {"role": "user", "content": blocks}
+        return messages
+    
+    def _record_usage(self, message) -> None:
+        """Keep a response's stop reason and token usage, including prompt cache reads and writes."""
+        usage = message.usage
+        self.last_turn = {
+            "stop_reason": message.stop_reason,
+            "input_tokens": usage.input_tokens,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", None) or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+            "output_tokens": usage.output_tokens
+        }
+        with _usage_lock:
+            _usage_totals["requests"] += 1
+            _usage_totals.update({field: value for field, value in self.last_turn.items() if field != "stop_reason"})
+        
+        logger.info(
+            f"Claude usage: {self.last_turn['input_tokens']} input, "
+            f"{self.last_turn['cache_read_input_tokens']} read from cache, "
+            f"{self.last_turn['cache_creation_input_tokens']} written to cache, "
+            f"{self.last_turn['output_tokens']} output tokens"
         )
 
+    async def generate_text_with_thinking(self, user_prompt: str, prefix: str = "") -> str:
+        """
+        Generate a text response from Claude with thinking enabled.
+        This returns the final text output, not the thinking process.
+        
+        Args:
+            user_prompt: The prompt to send to Claude
+            prefix: Stable start of the prompt, cached by Claude across requests (optional)
+            
+        Returns:
+            The final text response from Claude
+        """
+        async with self.credential_pool.request() as api_key:
+            response = await self._client(api_key).messages.create(
+                **self.thinking_params(),
+                messages=self._messages(user_prompt, prefix=prefix)
+            )
+        self._record_usage(response)
+
         # Extract the text content (the final response)
         if hasattr(response, 'content') and isinstance(response.content, list):
             for block in response.content:
@@ -54,31 +163,50 @@ class ClaudeThinkingGenerate:
         # Return empty string if no text content found
         return ""
     
-    def test_generate(self, user_prompt: str) -> str:
+    async def stream_text_with_thinking(self, user_prompt: str, history: Optional[List[Dict[str, str]]] = None,
+                                        prefix: str = "") -> AsyncIterator[str]:
+        """
+        Stream a text response from Claude with thinking enabled.
+        Yields the final text output as it is generated, not the thinking process.
+        Once the stream ends, last_turn holds its stop reason and token usage.
+        
+        Args:
+            user_prompt: The prompt to send to Claude
+            history: Earlier turns of the conversation, as role/content messages (optional)
+            prefix: Stable start of the conversation's first user message, cached by Claude
+                    across requests (optional)
+            
+        Yields:
+            Chunks of the final text response, in order
+        """
+        async with self.credential_pool.request() as api_key:
+            async with self._client(api_key).messages.stream(
+                **self.thinking_params(),
+                messages=self._messages(user_prompt, history, prefix)
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+                
+                self._record_usage(await stream.get_final_message())
+    
+    async def test_generate(self, user_prompt: str, prefix: str = "") -> str:
         """
         Test method for generating text with Claude, with a fixed model and parameters.
         Useful for testing and debugging.
         
         Args:
             user_prompt: The prompt to send to Claude
+            prefix: Stable start of the prompt, cached by Claude across requests (optional)
             
         Returns:
             The generated text response
         """
-        # Get Claude API configuration
-        claude_config = self.config_service.get("claude_api", {})
-        
-        # Get parameters with defaults
-        model = claude_config.get("model", "claude-3-7-sonnet-20250219")
-        polish_max_tokens = claude_config.get("polish_max_tokens", 1000)
-        polish_temperature = claude_config.get("polish_temperature", 0.5)
-        
-        response = self.client.messages.create(
-            model=model,
-            max_tokens=polish_max_tokens,
-            temperature=polish_temperature,
-            messages=[{"role": "user", "content": user_prompt}]
-        )
+        async with self.credential_pool.request() as api_key:
+            response = await self._client(api_key).messages.create(
+                **self.standard_params(),
+                messages=self._messages(user_prompt, prefix=prefix)
+            )
+        self._record_usage(response)
         
         return response.content[0].text.strip()
 
@@ -105,7 +233,7 @@ if __name__ == "__main__":
     
     try:
         # Get the text content with thinking enabled
-        result = generator.generate_text_with_thinking(test_prompt)
+        result = asyncio.run(generator.generate_text_with_thinking(test_prompt))
         
         # Print just the text content
         print("\nFINAL TEXT OUTPUT:")
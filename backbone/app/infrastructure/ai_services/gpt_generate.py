@@ -1,6 +1,7 @@
 import os
 import sys
 import openai
+import asyncio
 import logging
 
 # Configure logging
@@ -19,19 +20,33 @@ if __name__ == "__main__":
         sys.path.insert(0, project_root)
 
 from app.common.config import get_config_service
+from app.core.credential_pool import get_credential_pool
 
 config_service = get_config_service()
 
 class GPTGenerate:
     def __init__(self):
-        api_key = config_service.get_env('OPENAI_API_KEY')
-        if not api_key:
-            logger.warning("No OpenAI API key found, using empty string")
-            api_key = ""
-        logger.info(f"Initializing OpenAI client (API key {'provided' if api_key else 'missing'})")
-        self.client = openai.OpenAI(api_key=api_key)
+        # Pool of API keys (OPENAI_API_KEY, comma-separated or OPENAI_API_KEY_1, OPENAI_API_KEY_2, ...)
+        api_keys = config_service.get_env_list('OPENAI_API_KEY')
+        if not api_keys:
+            logger.warning("No OpenAI API key found")
+        logger.info(f"Initializing OpenAI client ({len(api_keys)} API key(s) provided)")
+        self.credential_pool = get_credential_pool("OpenAI", api_keys, {
+            "budget_per_minute": (config_service.get("openai_api", {}) or {}).get("requests_per_minute_per_key")
+        })
+        self._clients = {}
+    
+    def _client(self, api_key: str) -> openai.AsyncOpenAI:
+        """Get the async OpenAI client of an API key, creating it if needed."""
+        if api_key not in self._clients:
+            self._clients[api_key] = openai.AsyncOpenAI(api_key=api_key)
+        return self._clients[api_key]
+
+    def request_params(self) -> dict:
+        """Get the model parameters of generate_text."""
+        return {"model": "gpt-4o", "temperature": 0.7}
 
-    def generate_text(self, user_prompt: str, system_prompt: str = None) -> str:
+    async def generate_text(self, user_prompt: str, system_prompt: str = None) -> str:
         """
         Generate text using OpenAI's GPT model.
         
@@ -58,11 +73,11 @@ class GPTGenerate:
         
         try:
             logger.info("Sending request to OpenAI API")
-            completion = self.client.chat.completions.create(
-                model="gpt-4o",
-                temperature=0.7,
-                messages=messages
-            )
+            async with self.credential_pool.request() as api_key:
+                completion = await self._client(api_key).chat.completions.create(
+                    **self.request_params(),
+                    messages=messages
+                )
             
             result = completion.choices[0].message.content.strip()
             logger.info(f"Received response from OpenAI (length: {len(result)})")
@@ -74,7 +89,7 @@ class GPTGenerate:
             logger.error(traceback.format_exc())
             raise
 
-    def test_generate(self, test_prompt: str) -> str:
+    async def test_generate(self, test_prompt: str) -> str:
         """
         Test method for generating text with OpenAI GPT.
         
@@ -92,15 +107,16 @@ class GPTGenerate:
             logger.info(f"Prompt length: {len(test_prompt)}")
             logger.debug(f"Prompt preview: {test_prompt[:200]}...")
             
-            response = self.client.chat.completions.create(
-                model="gpt-4o",  # Using GPT-4o model
-                max_tokens=8000,
-                temperature=0.7,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": test_prompt}
-                ]
-            )
+            async with self.credential_pool.request() as api_key:
+                response = await self._client(api_key).chat.completions.create(
+                    model="gpt-4o",  # Using GPT-4o model
+                    max_tokens=8000,
+                    temperature=0.7,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": test_prompt}
+                    ]
+                )
             
             result = response.choices[0].message.content.strip()
             logger.info(f"Response received from OpenAI (length: {len(result)})")
@@ -131,7 +147,7 @@ if __name__ == "__main__":
     print("-" * 50)
     
     try:
-        result = generator.test_generate(test_prompt)
+        result = asyncio.run(generator.test_generate(test_prompt))
         print("Result:")
         print(result)
     except Exception as e:
@@ -25,6 +25,11 @@ from app.infrastructure.ffmpeg.add_split_caption import AsyncSplitCaptionAdder
 from app.infrastructure.ffmpeg.video_concatenator import AsyncVideoConcatenator
 from app.infrastructure.ffmpeg.youtube_audio_merger import AsyncYouTubeAudioMerger
 from app.infrastructure.ffmpeg.pipeline import AsyncVideoProcessingPipeline
+from app.infrastructure.ffmpeg.render_equivalence import AsyncRenderEquivalenceChecker
+from app.infrastructure.ffmpeg.clip_analyzer import AsyncClipAnalyzer
+from app.infrastructure.ffmpeg.clip_dedup import AsyncClipDeduplicator
+from app.infrastructure.ffmpeg.clip_previews import AsyncClipPreviewGenerator
+from app.infrastructure.ffmpeg.narration_assembler import AsyncNarrationAssembler
 
 # Main function to create a configured pipeline
 def create_pipeline(config=None):
@@ -44,9 +49,10 @@ def create_pipeline(config=None):
     pipeline = AsyncVideoProcessingPipeline(
         command_executor=factory.create_command_executor(),
         metadata_service=factory.create_metadata_service(),
-        audio_video_merger=factory.create_audio_video_merger(),
+        audio_video_merger=factory.create_audio_video_merger((config or {}).get("audio")),
         split_caption_adder=factory.create_split_caption_adder(),
-        concatenator=factory.create_video_concatenator()
+        concatenator=factory.create_video_concatenator((config or {}).get("audio")),
+        narration_assembler=factory.create_narration_assembler((config or {}).get("narration"))
     )
     
     # Configure if needed
@@ -78,6 +84,11 @@ __all__ = [
     'AsyncVideoConcatenator',
     'AsyncVideoProcessingPipeline',
     'AsyncYouTubeAudioMerger',
+    'AsyncRenderEquivalenceChecker',
+    'AsyncClipAnalyzer',
+    'AsyncClipDeduplicator',
+    'AsyncClipPreviewGenerator',
+    'AsyncNarrationAssembler',
     
     # Utilities
     'configure_ffmpeg',
@@ -5,10 +5,11 @@ This module provides functionality for adding split captions to videos.
 """
 
 import os
+import re
 import shlex
 import textwrap
 import logging
-from typing import List, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 from app.core.ffmpeg.interfaces import SplitCaptionAdder, FFmpegCommandExecutor
 
@@ -31,6 +32,7 @@ class AsyncSplitCaptionAdder(SplitCaptionAdder):
         self.default_font = "Arial"
         self.default_color = "white"
         self.default_bg_color = "black@0.5"  # Semi-transparent black background
+        self.drawn_segments: Dict[str, List[Tuple[str, float, float]]] = {}  # Segments drawn per output file
     
     async def process(
         self, 
@@ -39,7 +41,9 @@ class AsyncSplitCaptionAdder(SplitCaptionAdder):
         output_file: str, 
         position: str = "bottom",
         font_size: int = 24,
-        max_chars_per_line: int = 40
+        max_chars_per_line: int = 40,
+        duration: Optional[float] = None,
+        word_timings: Optional[List[Dict[str, Any]]] = None
     ) -> str:
         """
         Add split captions to a video.
@@ -51,6 +55,9 @@ class AsyncSplitCaptionAdder(SplitCaptionAdder):
             position: Position of the caption (top, bottom)
             font_size: Font size for the caption
             max_chars_per_line: Maximum characters per line
+            duration: Duration of the video in seconds, if already known (skips probing)
+            word_timings: When each word of the narration is spoken (word, start, end in seconds),
+                          so segments change with the speech instead of at equal intervals
             
         Returns:
             str: Path to the captioned video
@@ -80,23 +87,17 @@ class AsyncSplitCaptionAdder(SplitCaptionAdder):
             output_file = os.path.join("./output", output_file)
             
         try:
-            # Get video duration
-            video_info = await self.command_executor.get_video_info(input_file)
-            duration = float(video_info['format']['duration'])
+            # Get video duration, probing only if the caller doesn't know it
+            # (the narration ends the clip, so its last word is a good enough end)
+            if not duration and word_timings:
+                duration = word_timings[-1]["end"]
+            if not duration:
+                video_info = await self.command_executor.get_video_info(input_file)
+                duration = float(video_info['format']['duration'])
             
-            # Determine number of segments based on caption length
-            words = captions.split()
-            total_chars = len(captions)
-            
-            # Determine optimal number of segments based on caption length
-            if total_chars <= 30:
-                num_segments = 1  # Very short captions don't need splitting
-            elif total_chars <= 50:
-                num_segments = 2  # Short captions split in half
-            else:
-                num_segments = 3  # Most captions will now be split into thirds
-                
-            logger.info(f"Splitting caption into {num_segments} segments (length: {total_chars} chars)")
+            # Split the caption into timed segments
+            segments = self.build_segments(captions, duration, max_chars_per_line, word_timings)
+            num_segments = len(segments)
             
             # Determine position coordinates based on the position parameter
             position_dict = {
@@ -109,40 +110,18 @@ class AsyncSplitCaptionAdder(SplitCaptionAdder):
             
             # For a single segment, just use regular caption
             if num_segments == 1:
-                # Just wrap the text for better display on mobile
-                wrapped_text = self._wrap_text(captions, max_chars_per_line)
                 # Escape special characters
-                safe_text = wrapped_text.replace("'", "'\\\''")
+                safe_text = segments[0][0].replace("'", "'\\\''")
                 
                 filter_text = (
                     f"drawtext=text='{safe_text}':fontsize={font_size}:{pos}:"
                     f"fontcolor={self.default_color}:box=1:boxcolor={self.default_bg_color}:boxborderw=5"
                 )
             else:
-                # Split caption into multiple segments, exactly like in the example
-                segment_size = len(words) // num_segments
-                segments = []
-                
-                for i in range(num_segments):
-                    start_idx = i * segment_size
-                    end_idx = (i + 1) * segment_size if i < num_segments - 1 else len(words)
-                    segment_text = " ".join(words[start_idx:end_idx])
-                    
-                    # Wrap the text segment for better display
-                    wrapped_text = self._wrap_text(segment_text, max_chars_per_line)
-                    segments.append(wrapped_text)
-                
-                # Calculate time for each segment
-                segment_duration = duration / num_segments
-                
                 # Now create multiple drawtext filters with timing constraints
                 filter_parts = []
                 
-                for i, segment in enumerate(segments):
-                    # Calculate start and end times for this segment
-                    start_time = i * segment_duration
-                    end_time = (i + 1) * segment_duration
-                    
+                for segment, start_time, end_time in segments:
                     # Escape special characters (same as in example)
                     safe_text = segment.replace("'", "'\\\''")
                     
@@ -172,6 +151,7 @@ class AsyncSplitCaptionAdder(SplitCaptionAdder):
             
             # Execute the command
             await self.command_executor.execute(cmd)
+            self.drawn_segments[output_file] = segments
             logger.info(f"Successfully added {num_segments} split captions to {output_file}")
             return output_file
             
@@ -180,6 +160,104 @@ class AsyncSplitCaptionAdder(SplitCaptionAdder):
             # If adding captions fails, return the original file
             return input_file
     
+    def build_segments(
+        self,
+        captions: str,
+        duration: float,
+        max_chars_per_line: int = 40,
+        word_timings: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Tuple[str, float, float]]:
+        """
+        Split a caption into timed segments.
+        
+        With word timings, each segment after the first appears when its first word is
+        spoken. Without them (or if they don't match the caption), segments share the
+        clip equally.
+        
+        Args:
+            captions: Caption text
+            duration: Duration of the clip in seconds
+            max_chars_per_line: Maximum characters per line
+            word_timings: When each word of the narration is spoken (optional)
+            
+        Returns:
+            List[Tuple[str, float, float]]: (wrapped_text, start_time, end_time) for each segment
+        """
+        # Determine number of segments based on caption length
+        words = captions.split()
+        total_chars = len(captions)
+        
+        # Determine optimal number of segments based on caption length
+        if total_chars <= 30:
+            num_segments = 1  # Very short captions don't need splitting
+        elif total_chars <= 50:
+            num_segments = 2  # Short captions split in half
+        else:
+            num_segments = 3  # Most captions will now be split into thirds
+            
+        logger.info(f"Splitting caption into {num_segments} segments (length: {total_chars} chars)")
+        
+        # For a single segment, just wrap the text for better display on mobile
+        if num_segments == 1:
+            return [(self._wrap_text(captions, max_chars_per_line), 0.0, duration)]
+        
+        # Split caption into multiple segments, exactly like in the example
+        segment_size = len(words) // num_segments
+        segment_duration = duration / num_segments
+        
+        # Segment start times: when the first word is spoken, or equal shares of the clip
+        word_starts = self._match_word_timings(words, word_timings) if word_timings else None
+        if word_starts is None:
+            starts = [i * segment_duration for i in range(num_segments)]
+        else:
+            starts = [0.0] + [min(word_starts[i * segment_size], duration) for i in range(1, num_segments)]
+        ends = starts[1:] + [duration]
+        segments = []
+        
+        for i in range(num_segments):
+            start_idx = i * segment_size
+            end_idx = (i + 1) * segment_size if i < num_segments - 1 else len(words)
+            segment_text = " ".join(words[start_idx:end_idx])
+            
+            # Wrap the text segment for better display
+            wrapped_text = self._wrap_text(segment_text, max_chars_per_line)
+            segments.append((wrapped_text, round(starts[i], 3), round(ends[i], 3)))
+        
+        return segments
+    
+    def _match_word_timings(self, words: List[str], word_timings: List[Dict[str, Any]]) -> Optional[List[float]]:
+        """
+        Find the start time of each caption word in the narration's word timings.
+        Words are compared by their letters and digits, in order; timed words that aren't
+        in the caption (e.g. pause markup) are skipped.
+        
+        Args:
+            words: Caption words
+            word_timings: Timed narration words
+            
+        Returns:
+            Optional[List[float]]: Start time of each caption word, or None if they don't match
+        """
+        def normalize(word):
+            return re.sub(r"[\W_]+", "", word).lower()
+        
+        starts = []
+        position = 0
+        for word in words:
+            target = normalize(word)
+            if not target:
+                # Punctuation-only caption words show up with the word before them
+                starts.append(starts[-1] if starts else 0.0)
+                continue
+            while position < len(word_timings) and normalize(word_timings[position]["word"]) != target:
+                position += 1
+            if position == len(word_timings):
+                logger.debug(f"Word timings don't match the caption at '{word}', splitting evenly")
+                return None
+            starts.append(word_timings[position]["start"])
+            position += 1
+        return starts
+    
     def _wrap_text(self, text: str, max_chars: int) -> str:
         """
         Wrap text to a maximum number of characters per line.
@@ -0,0 +1,368 @@
+"""
+Clip Analyzer
+
+This module provides an offline analysis pass over the clip library. For each clip it
+records scene cuts, motion energy, dead frames and a keyframe-aligned best start offset
+in the genre's clip index, so rendering and clip selection never decode clips at request time.
+"""
+
+import os
+import re
+import shlex
+import asyncio
+import logging
+import tempfile
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from app.core.ffmpeg.interfaces import FFmpegCommandExecutor
+from app.infrastructure.storage.clip_index import ClipIndex
+from app.infrastructure.storage.file_hash import compute_content_hash
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_VERSION = 1
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi')
+
+class AsyncClipAnalyzer:
+    """
+    Analyzes clips with FFmpeg's scdet/signalstats filters and NumPy over downsampled frames.
+    """
+
+    def __init__(self, command_executor: FFmpegCommandExecutor, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the analyzer.
+
+        Args:
+            command_executor: Command executor for running FFmpeg
+            config: Analysis options (optional, overrides the defaults)
+        """
+        self.command_executor = command_executor
+
+        # Default configuration
+        self.config = {
+            "frame_width": 96,          # Width of the downsampled analysis frames
+            "frame_height": 54,         # Height of the downsampled analysis frames
+            "scene_threshold": 10.0,    # scdet threshold for scene cuts
+            "window": 5.0,              # Length of the rendered clip window in seconds
+            "dead_std": 4.0,            # Frames with lower luma deviation are considered dead (flat)
+            "cut_guard": 0.5            # Avoid starts with a scene cut within this many seconds
+        }
+
+        if config:
+            self.config.update(config)
+
+    async def analyze(self, video_file: str) -> Dict[str, Any]:
+        """
+        Analyze a single clip.
+
+        Args:
+            video_file: Path to the clip
+
+        Returns:
+            Dict[str, Any]: Analysis entry for the clip index
+        """
+        width = self.config["frame_width"]
+        height = self.config["frame_height"]
+
+        info = await self.command_executor.get_video_info(video_file)
+        duration = float(info.get("format", {}).get("duration", 0.0))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            metadata_file = os.path.join(temp_dir, "metadata.txt")
+            frames_file = os.path.join(temp_dir, "frames.gray")
+
+            # One decode pass: per-frame stats and scene scores from FFmpeg,
+            # plus downsampled grayscale frames for NumPy
+            filter_complex = (
+                f"[0:v]scale={width}:{height},format=gray,split=2[stats][raw];"
+                f"[stats]signalstats,scdet=threshold={self.config['scene_threshold']},"
+                f"metadata=mode=print:file={metadata_file}[meta]"
+            )
+            cmd_parts = [
+                "ffmpeg",
+                "-i", video_file,
+                "-filter_complex", filter_complex,
+                "-map", "[meta]", "-f", "null", os.path.join(temp_dir, "meta.nut"),
+                "-map", "[raw]", "-f", "rawvideo", "-y", frames_file
+            ]
+            await self.command_executor.execute(" ".join(shlex.quote(str(part)) for part in cmd_parts))
+
+            frame_stats = self._parse_metadata(metadata_file)
+            frames = np.fromfile(frames_file, dtype=np.uint8)
+
+        frames = frames[: (frames.size // (width * height)) * width * height].reshape(-1, height, width)
+        count = min(len(frame_stats), frames.shape[0])
+        frames = frames[:count]
+        frame_stats = frame_stats[:count]
+
+        keyframes = await self.get_keyframe_times(video_file)
+
+        return self._summarize(frames, frame_stats, keyframes, duration)
+
+    async def analyze_library(self, videos_dir: str, force: bool = False) -> ClipIndex:
+        """
+        Analyze every clip in a genre folder and update its clip index.
+        Clips whose content hash matches their index entry are skipped.
+
+        Args:
+            videos_dir: Directory containing the clips of one genre
+            force: Re-analyze clips even if their entries are current
+
+        Returns:
+            ClipIndex: The updated clip index
+        """
+        index = ClipIndex(videos_dir)
+        clips = sorted(f for f in os.listdir(videos_dir) if f.endswith(VIDEO_EXTENSIONS))
+
+        logger.info(f"Analyzing {len(clips)} clips in {videos_dir}")
+
+        async def analyze_clip(clip: str):
+            clip_path = os.path.join(videos_dir, clip)
+            content_hash = await asyncio.to_thread(compute_content_hash, clip_path)
+
+            entry = index.get(clip)
+            if not force and index.is_current(clip, content_hash) \
+                    and entry.get("analysis_version") == ANALYSIS_VERSION:
+                logger.info(f"Clip analysis is current, skipping: {clip}")
+                return
+
+            try:
+                analysis = await self.analyze(clip_path)
+            except Exception as e:
+                logger.error(f"Error analyzing clip {clip}: {e}")
+                return
+
+            # Keep fields added by other offline passes (e.g. perceptual hashes)
+            entry = dict(entry or {})
+            entry.update(analysis)
+            entry["content_hash"] = content_hash
+            index.set(clip, entry)
+            logger.info(f"Analyzed {clip}: best_start={analysis['best_start']}s, motion={analysis['motion_energy']}")
+
+        await asyncio.gather(*(analyze_clip(clip) for clip in clips))
+
+        index.prune(clips)
+        index.save()
+        return index
+
+    async def get_keyframe_times(self, video_file: str) -> List[float]:
+        """
+        Get keyframe timestamps by decoding only keyframes.
+
+        Args:
+            video_file: Path to the clip
+
+        Returns:
+            List[float]: Keyframe times in seconds
+        """
+        output = await self.command_executor.execute_ffprobe(
+            shlex.quote(video_file),
+            ["-skip_frame", "nokey", "-select_streams", "v:0", "-show_entries", "frame=pts_time", "-of", "csv=p=0"]
+        )
+
+        times = []
+        for line in output.splitlines():
+            value = line.strip().strip(",")
+            if value and value != "N/A":
+                try:
+                    times.append(float(value))
+                except ValueError:
+                    continue
+        return sorted(times)
+
+    @staticmethod
+    def _parse_metadata(metadata_file: str) -> List[Dict[str, float]]:
+        """
+        Parse the per-frame output of FFmpeg's metadata=print filter.
+
+        Args:
+            metadata_file: Path to the metadata file
+
+        Returns:
+            List[Dict[str, float]]: One dict per frame with pts_time, ydif, yavg and scene data
+        """
+        frames = []
+        current = None
+
+        with open(metadata_file, "r") as f:
+            for line in f:
+                line = line.strip()
+                header = re.match(r"frame:\s*\d+\s+pts:\s*\S+\s+pts_time:\s*(\S+)", line)
+                if header:
+                    current = {"pts_time": float(header.group(1)), "ydif": 0.0, "yavg": 0.0, "scene_score": 0.0, "cut": False}
+                    frames.append(current)
+                    continue
+
+                if current is None or "=" not in line:
+                    continue
+
+                key, value = line.split("=", 1)
+                if key == "lavfi.signalstats.YDIF":
+                    current["ydif"] = float(value)
+                elif key == "lavfi.signalstats.YAVG":
+                    current["yavg"] = float(value)
+                elif key == "lavfi.scd.score":
+                    current["scene_score"] = float(value)
+                elif key == "lavfi.scd.time":
+                    current["cut"] = True
+
+        return frames
+
+    def _summarize(self, frames: np.ndarray, frame_stats: List[Dict[str, float]],
+                   keyframes: List[float], duration: float) -> Dict[str, Any]:
+        """
+        Turn raw frames and per-frame stats into an index entry.
+
+        Args:
+            frames: Downsampled grayscale frames with shape (n, height, width)
+            frame_stats: Per-frame stats parsed from FFmpeg
+            keyframes: Keyframe times in seconds
+            duration: Clip duration in seconds
+
+        Returns:
+            Dict[str, Any]: Analysis entry
+        """
+        count = frames.shape[0]
+        if count == 0:
+            return {
+                "analysis_version": ANALYSIS_VERSION,
+                "duration": duration,
+                "frame_count": 0,
+                "keyframes": keyframes,
+                "scene_cuts": [],
+                "dead_ranges": [],
+                "usable_start": 0.0,
+                "usable_end": duration,
+                "motion_energy": 0.0,
+                "motion_profile": [],
+                "luma_diff": 0.0,
+                "brightness": 0.0,
+                "best_start": 0.0
+            }
+
+        times = np.array([s["pts_time"] for s in frame_stats], dtype=np.float64)
+        duration = duration or float(times[-1])
+
+        # Motion energy: mean absolute luma difference between consecutive frames (0-1)
+        pixels = frames.reshape(count, -1).astype(np.int16)
+        motion = np.zeros(count, dtype=np.float64)
+        if count > 1:
+            motion[1:] = np.abs(np.diff(pixels, axis=0)).mean(axis=1) / 255.0
+
+        # Dead frames: flat frames such as black or white fades
+        dead = pixels.std(axis=1) < self.config["dead_std"]
+
+        scene_cuts = [float(t) for t, s in zip(times, frame_stats) if s["cut"]]
+        dead_ranges = self._runs_to_ranges(dead, times)
+
+        live_indices = np.flatnonzero(~dead)
+        usable_start = float(times[live_indices[0]]) if live_indices.size else 0.0
+        usable_end = float(times[live_indices[-1]]) if live_indices.size else duration
+
+        # Per-second motion profile for clip selection
+        seconds = np.floor(times).astype(np.int64)
+        profile_sums = np.bincount(seconds, weights=motion)
+        profile_counts = np.maximum(np.bincount(seconds), 1)
+        motion_profile = [round(float(v), 4) for v in profile_sums / profile_counts]
+
+        best_start = self._best_start(times, motion, dead, scene_cuts, keyframes, duration)
+
+        return {
+            "analysis_version": ANALYSIS_VERSION,
+            "duration": round(duration, 3),
+            "frame_count": int(count),
+            "keyframes": [round(t, 3) for t in keyframes],
+            "scene_cuts": [round(t, 3) for t in scene_cuts],
+            "dead_ranges": dead_ranges,
+            "usable_start": round(usable_start, 3),
+            "usable_end": round(usable_end, 3),
+            "motion_energy": round(float(motion.mean()), 4),
+            "motion_profile": motion_profile,
+            "luma_diff": round(float(np.mean([s["ydif"] for s in frame_stats])), 3),
+            "brightness": round(float(np.mean([s["yavg"] for s in frame_stats])), 3),
+            "best_start": round(best_start, 3)
+        }
+
+    def _best_start(self, times: np.ndarray, motion: np.ndarray, dead: np.ndarray,
+                    scene_cuts: List[float], keyframes: List[float], duration: float) -> float:
+        """
+        Pick the keyframe to start rendering from.
+
+        Candidates are keyframes (so the renderer can trim with stream copy) that leave a full
+        window before the end of the clip. Each candidate is scored by the mean motion over the
+        window, penalized by dead frames and by scene cuts right after the start.
+
+        Returns:
+            float: Best start offset in seconds
+        """
+        window = self.config["window"]
+        cut_guard = self.config["cut_guard"]
+
+        candidates = [t for t in keyframes if t + window <= duration + 1e-6]
+        if not candidates:
+            return 0.0
+
+        cuts = np.asarray(scene_cuts, dtype=np.float64)
+        scores = []
+        for start in candidates:
+            in_window = (times >= start) & (times < start + window)
+            if not np.any(in_window):
+                scores.append(-np.inf)
+                continue
+
+            score = motion[in_window].mean() - dead[in_window].mean()
+            if cuts.size and np.any((cuts > start) & (cuts < start + cut_guard)):
+                score -= 0.5
+            scores.append(score)
+
+        return float(candidates[int(np.argmax(scores))])
+
+    @staticmethod
+    def _runs_to_ranges(mask: np.ndarray, times: np.ndarray) -> List[List[float]]:
+        """
+        Convert a boolean per-frame mask into [start, end] time ranges.
+
+        Args:
+            mask: Per-frame boolean mask
+            times: Per-frame timestamps
+
+        Returns:
+            List[List[float]]: Time ranges covered by the mask
+        """
+        if not np.any(mask):
+            return []
+
+        padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+        edges = np.flatnonzero(np.diff(padded))
+        frame_step = float(np.median(np.diff(times))) if times.size > 1 else 0.0
+
+        return [
+            [round(float(times[start]), 3), round(float(times[end - 1]) + frame_step, 3)]
+            for start, end in zip(edges[0::2], edges[1::2])
+        ]
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    # Add the project root to the Python path when running the script directly
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Build the offline clip analysis index for a genre")
+    parser.add_argument("--genre", required=True, help="Genre folder under data/media/videos")
+    parser.add_argument("--base-dir", default="data/media/videos", help="Base directory of the clip library")
+    parser.add_argument("--window", type=float, default=5.0, help="Rendered clip length in seconds")
+    parser.add_argument("--force", action="store_true", help="Re-analyze clips with current entries")
+    args = parser.parse_args()
+
+    from app.infrastructure.ffmpeg.factories import create_command_executor
+
+    analyzer = AsyncClipAnalyzer(create_command_executor(), {"window": args.window})
+    asyncio.run(analyzer.analyze_library(os.path.join(args.base_dir, args.genre), force=args.force))
@@ -0,0 +1,299 @@
+"""
+Clip Deduplicator
+
+This module provides perceptual-hash deduplication of the clip library. Keyframes of each clip
+are hashed (dHash and pHash) with NumPy, near-identical clips are clustered, and the cluster IDs
+are stored in the genre's clip index so the prompt builder can send one representative per cluster.
+"""
+
+import os
+import shlex
+import asyncio
+import logging
+import tempfile
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from app.core.ffmpeg.interfaces import FFmpegCommandExecutor
+from app.infrastructure.storage.clip_index import ClipIndex
+from app.infrastructure.storage.file_hash import compute_content_hash
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi')
+
+# Hamming distance lookup for one byte
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """
+    Build an orthonormal DCT-II matrix.
+
+    Args:
+        size: Number of samples
+
+    Returns:
+        np.ndarray: DCT matrix with shape (size, size)
+    """
+    n = np.arange(size)
+    matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size)) * np.sqrt(2.0 / size)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+def dhash_frames(frames: np.ndarray) -> np.ndarray:
+    """
+    Compute 64-bit difference hashes for a batch of frames.
+
+    Args:
+        frames: Grayscale frames with shape (n, 32, 36)
+
+    Returns:
+        np.ndarray: Packed hashes with shape (n, 8)
+    """
+    count = frames.shape[0]
+    # Average 4x4 blocks down to 8 rows x 9 columns
+    blocks = frames.reshape(count, 8, 4, 9, 4).mean(axis=(2, 4))
+    bits = blocks[:, :, 1:] > blocks[:, :, :-1]
+    return np.packbits(bits.reshape(count, 64), axis=1)
+
+def phash_frames(frames: np.ndarray) -> np.ndarray:
+    """
+    Compute 64-bit DCT perceptual hashes for a batch of frames.
+
+    Args:
+        frames: Grayscale frames with shape (n, 32, 36)
+
+    Returns:
+        np.ndarray: Packed hashes with shape (n, 8)
+    """
+    count, height, width = frames.shape
+    dct_rows = _dct_matrix(height)
+    dct_cols = _dct_matrix(width)
+    coefficients = np.einsum("ij,njk,lk->nil", dct_rows, frames.astype(np.float64), dct_cols)
+    low = coefficients[:, :8, :8].reshape(count, 64)
+    # The median excludes the DC term, which only encodes overall brightness
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    return np.packbits(low > median, axis=1)
+
+def hamming_distances(hashes: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """
+    Compute pairwise Hamming distances between two sets of packed hashes.
+
+    Args:
+        hashes: Packed hashes with shape (n, 8)
+        others: Packed hashes with shape (m, 8)
+
+    Returns:
+        np.ndarray: Distances with shape (n, m)
+    """
+    return _POPCOUNT[hashes[:, None, :] ^ others[None, :, :]].sum(axis=2, dtype=np.uint16)
+
+class AsyncClipDeduplicator:
+    """
+    Clusters near-duplicate clips (e.g. "multiple angles" variants) by perceptual hashes of their keyframes.
+    """
+
+    def __init__(self, command_executor: FFmpegCommandExecutor, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            command_executor: Command executor for running FFmpeg
+            config: Deduplication options (optional, overrides the defaults)
+        """
+        self.command_executor = command_executor
+
+        # Default configuration
+        self.config = {
+            "max_frames": 16,          # Keyframes sampled per clip
+            "dhash_threshold": 10,     # Max dHash distance (of 64 bits) for matching frames
+            "phash_threshold": 12,     # Max pHash distance (of 64 bits) for matching frames
+            "min_match_ratio": 0.5     # Fraction of frames that must match in both directions
+        }
+
+        if config:
+            self.config.update(config)
+
+    async def hash_clip(self, video_file: str) -> Dict[str, List[str]]:
+        """
+        Hash the keyframes of a clip.
+
+        Args:
+            video_file: Path to the clip
+
+        Returns:
+            Dict[str, List[str]]: Hex-encoded dHash and pHash per sampled keyframe
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            frames_file = os.path.join(temp_dir, "keyframes.gray")
+
+            # Keyframe-only decode, downsampled to 36x32 grayscale
+            cmd_parts = [
+                "ffmpeg",
+                "-skip_frame", "nokey",
+                "-i", video_file,
+                "-vsync", "vfr",
+                "-vf", "scale=36:32,format=gray",
+                "-f", "rawvideo", "-y", frames_file
+            ]
+            await self.command_executor.execute(" ".join(shlex.quote(str(part)) for part in cmd_parts))
+
+            frames = np.fromfile(frames_file, dtype=np.uint8)
+
+        frames = frames[: (frames.size // (32 * 36)) * 32 * 36].reshape(-1, 32, 36)
+        if frames.shape[0] > self.config["max_frames"]:
+            picks = np.linspace(0, frames.shape[0] - 1, self.config["max_frames"]).round().astype(int)
+            frames = frames[picks]
+
+        return {
+            "dhash": [h.tobytes().hex() for h in dhash_frames(frames)],
+            "phash": [h.tobytes().hex() for h in phash_frames(frames)]
+        }
+
+    def cluster(self, clip_hashes: Dict[str, Dict[str, List[str]]]) -> List[List[str]]:
+        """
+        Group clips into clusters of near-duplicates.
+
+        Two clips are near-duplicates when enough frames of each have a matching frame
+        in the other under both the dHash and the pHash thresholds. Clusters are the
+        connected components of that relation.
+
+        Args:
+            clip_hashes: Mapping of clip filename to its frame hashes
+
+        Returns:
+            List[List[str]]: Clusters of clip filenames, each sorted, ordered by first member
+        """
+        clips = sorted(c for c, h in clip_hashes.items() if h.get("dhash"))
+        if not clips:
+            return []
+
+        def unpack(hex_hashes):
+            return np.frombuffer(bytes.fromhex("".join(hex_hashes)), dtype=np.uint8).reshape(-1, 8)
+
+        dhashes = [unpack(clip_hashes[c]["dhash"]) for c in clips]
+        phashes = [unpack(clip_hashes[c]["phash"]) for c in clips]
+        all_dhashes = np.concatenate(dhashes)
+        all_phashes = np.concatenate(phashes)
+        offsets = np.cumsum([0] + [len(h) for h in dhashes[:-1]])
+
+        # match_ratio[i, j]: fraction of clip i's frames with a matching frame in clip j
+        match_ratio = np.zeros((len(clips), len(clips)))
+        for i in range(len(clips)):
+            matches = (hamming_distances(dhashes[i], all_dhashes) <= self.config["dhash_threshold"]) & \
+                      (hamming_distances(phashes[i], all_phashes) <= self.config["phash_threshold"])
+            match_ratio[i] = np.logical_or.reduceat(matches, offsets, axis=1).mean(axis=0)
+
+        similar = np.minimum(match_ratio, match_ratio.T) >= self.config["min_match_ratio"]
+
+        # Union-find over the similarity graph
+        parent = list(range(len(clips)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, j in zip(*np.nonzero(np.triu(similar, k=1))):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        clusters: Dict[int, List[str]] = {}
+        for i, clip in enumerate(clips):
+            clusters.setdefault(find(i), []).append(clip)
+
+        return [clusters[root] for root in sorted(clusters)]
+
+    async def deduplicate_library(self, videos_dir: str, force: bool = False) -> ClipIndex:
+        """
+        Hash every clip in a genre folder, cluster near-duplicates and record the
+        clusters in the clip index. Hashes are reused while the clip content is unchanged.
+
+        Args:
+            videos_dir: Directory containing the clips of one genre
+            force: Re-hash clips even if their stored hashes are current
+
+        Returns:
+            ClipIndex: The updated clip index
+        """
+        index = ClipIndex(videos_dir)
+        clips = sorted(f for f in os.listdir(videos_dir) if f.endswith(VIDEO_EXTENSIONS))
+
+        logger.info(f"Hashing {len(clips)} clips in {videos_dir}")
+
+        async def hash_clip(clip: str):
+            clip_path = os.path.join(videos_dir, clip)
+            content_hash = await asyncio.to_thread(compute_content_hash, clip_path)
+
+            entry = dict(index.get(clip) or {})
+            stored = entry.get("perceptual_hashes", {})
+            if not force and stored.get("content_hash") == content_hash:
+                return
+
+            try:
+                hashes = await self.hash_clip(clip_path)
+            except Exception as e:
+                logger.error(f"Error hashing clip {clip}: {e}")
+                # Hashes of the clip's previous content no longer describe it
+                if "perceptual_hashes" in entry:
+                    del entry["perceptual_hashes"]
+                    index.set(clip, entry)
+                return
+
+            entry["perceptual_hashes"] = {"content_hash": content_hash, **hashes}
+            index.set(clip, entry)
+
+        await asyncio.gather(*(hash_clip(clip) for clip in clips))
+        index.prune(clips)
+
+        clusters = self.cluster({
+            clip: (index.get(clip) or {}).get("perceptual_hashes", {}) for clip in clips
+        })
+
+        # Clips without hashes now (no keyframes, or hashing failed) belong to no cluster
+        for clip in clips:
+            entry = index.get(clip)
+            if entry:
+                for field in ("cluster_id", "cluster_size", "cluster_representative"):
+                    entry.pop(field, None)
+
+        for cluster_id, members in enumerate(clusters):
+            # The clip with the most motion represents the cluster (first by name if not analyzed)
+            representative = max(members, key=lambda c: (index.get(c).get("motion_energy", 0.0), -members.index(c)))
+            for clip in members:
+                entry = index.get(clip)
+                entry["cluster_id"] = cluster_id
+                entry["cluster_size"] = len(members)
+                entry["cluster_representative"] = clip == representative
+
+        duplicates = sum(len(members) - 1 for members in clusters)
+        logger.info(f"Found {len(clusters)} clusters, {duplicates} near-duplicate clips in {videos_dir}")
+
+        index.save()
+        return index
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    # Add the project root to the Python path when running the script directly
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Cluster near-duplicate clips of a genre by perceptual hashes")
+    parser.add_argument("--genre", required=True, help="Genre folder under data/media/videos")
+    parser.add_argument("--base-dir", default="data/media/videos", help="Base directory of the clip library")
+    parser.add_argument("--force", action="store_true", help="Re-hash clips with current hashes")
+    args = parser.parse_args()
+
+    from app.infrastructure.ffmpeg.factories import create_command_executor
+
+    deduplicator = AsyncClipDeduplicator(create_command_executor())
+    asyncio.run(deduplicator.deduplicate_library(os.path.join(args.base_dir, args.genre), force=args.force))
@@ -0,0 +1,218 @@
+"""
+Clip Previews
+
+This module provides precomputed previews for the clip library: a poster frame and a
+thumbnail sprite sheet per clip. Previews are generated once with keyframe-only decoding
+and are named after the clip's content hash, so they can be served with long cache headers.
+"""
+
+import os
+import math
+import shlex
+import asyncio
+import logging
+from typing import Dict, List, Any, Optional
+
+from app.core.ffmpeg.interfaces import FFmpegCommandExecutor
+from app.infrastructure.ffmpeg.clip_analyzer import AsyncClipAnalyzer, VIDEO_EXTENSIONS
+from app.infrastructure.storage.clip_index import ClipIndex
+from app.infrastructure.storage.file_hash import compute_content_hash
+
+logger = logging.getLogger(__name__)
+
+PREVIEWS_BASE_DIR = "data/media/previews"
+
+class AsyncClipPreviewGenerator:
+    """
+    Generates poster frames and sprite sheets for clips.
+    """
+
+    def __init__(self, command_executor: FFmpegCommandExecutor, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the preview generator.
+
+        Args:
+            command_executor: Command executor for running FFmpeg
+            config: Preview options (optional, overrides the defaults)
+        """
+        self.command_executor = command_executor
+
+        # Default configuration
+        self.config = {
+            "tile_width": 160,      # Sprite tile width in pixels
+            "tile_height": 90,      # Sprite tile height in pixels
+            "columns": 5,           # Sprite grid columns
+            "rows": 4,              # Sprite grid rows
+            "poster_width": 480,    # Poster frame width in pixels
+            "quality": 4            # JPEG quality (2-31, lower is better)
+        }
+
+        if config:
+            self.config.update(config)
+
+    async def generate(self, video_file: str, output_dir: str, content_hash: str,
+                       poster_time: Optional[float] = None, keyframes: Optional[List[float]] = None) -> Dict[str, Any]:
+        """
+        Generate the poster frame and sprite sheet for a clip.
+
+        Args:
+            video_file: Path to the clip
+            output_dir: Directory to write the previews to
+            content_hash: Content hash of the clip, used in the preview filenames
+            poster_time: Time of the poster frame (defaults to the middle keyframe)
+            keyframes: Keyframe times, if already known from the clip index
+
+        Returns:
+            Dict[str, Any]: Preview entry for the clip index
+        """
+        os.makedirs(output_dir, exist_ok=True)
+
+        if not keyframes:
+            keyframes = await AsyncClipAnalyzer(self.command_executor).get_keyframe_times(video_file)
+        if not keyframes:
+            keyframes = [0.0]
+
+        stem = f"{os.path.splitext(os.path.basename(video_file))[0]}.{content_hash[:12]}"
+        poster_file = os.path.join(output_dir, f"{stem}.poster.jpg")
+        sprite_file = os.path.join(output_dir, f"{stem}.sprite.jpg")
+
+        if poster_time is None:
+            poster_time = keyframes[len(keyframes) // 2]
+
+        # Poster: the keyframe at or before poster_time
+        poster_cmd = [
+            "ffmpeg",
+            "-ss", f"{poster_time:.3f}",
+            "-skip_frame", "nokey",
+            "-i", video_file,
+            "-frames:v", "1",
+            "-vf", f"scale={self.config['poster_width']}:-2",
+            "-q:v", self.config["quality"],
+            "-y", poster_file
+        ]
+        await self.command_executor.execute(" ".join(shlex.quote(str(part)) for part in poster_cmd))
+
+        # Sprite: every step-th keyframe, letterboxed into a fixed tile grid
+        tile_width = self.config["tile_width"]
+        tile_height = self.config["tile_height"]
+        columns = self.config["columns"]
+        rows = self.config["rows"]
+        step = max(1, math.ceil(len(keyframes) / (columns * rows)))
+        tile_times = keyframes[::step]
+
+        sprite_filter = (
+            f"select=not(mod(n\\,{step})),"
+            f"scale={tile_width}:{tile_height}:force_original_aspect_ratio=decrease,"
+            f"pad={tile_width}:{tile_height}:(ow-iw)/2:(oh-ih)/2,"
+            f"tile={columns}x{rows}"
+        )
+        sprite_cmd = [
+            "ffmpeg",
+            "-skip_frame", "nokey",
+            "-i", video_file,
+            "-vsync", "vfr",
+            "-vf", sprite_filter,
+            "-frames:v", "1",
+            "-q:v", self.config["quality"],
+            "-y", sprite_file
+        ]
+        await self.command_executor.execute(" ".join(shlex.quote(str(part)) for part in sprite_cmd))
+
+        return {
+            "content_hash": content_hash,
+            "poster": os.path.basename(poster_file),
+            "sprite": os.path.basename(sprite_file),
+            "tile_width": tile_width,
+            "tile_height": tile_height,
+            "columns": columns,
+            "rows": rows,
+            "tile_times": [round(t, 3) for t in tile_times]
+        }
+
+    async def generate_library(self, videos_dir: str, previews_dir: str, force: bool = False) -> ClipIndex:
+        """
+        Generate previews for every clip in a genre folder and record them in the clip index.
+        Clips whose previews were generated from the same content are skipped.
+
+        Args:
+            videos_dir: Directory containing the clips of one genre
+            previews_dir: Directory to write the genre's previews to
+            force: Regenerate previews even if they are current
+
+        Returns:
+            ClipIndex: The updated clip index
+        """
+        index = ClipIndex(videos_dir)
+        clips = sorted(f for f in os.listdir(videos_dir) if f.endswith(VIDEO_EXTENSIONS))
+
+        logger.info(f"Generating previews for {len(clips)} clips in {videos_dir}")
+
+        async def generate_clip(clip: str):
+            clip_path = os.path.join(videos_dir, clip)
+            content_hash = await asyncio.to_thread(compute_content_hash, clip_path)
+
+            entry = dict(index.get(clip) or {})
+            previews = entry.get("previews", {})
+            if not force and previews.get("content_hash") == content_hash \
+                    and os.path.exists(os.path.join(previews_dir, previews.get("sprite", ""))):
+                return
+
+            # Reuse the offline analysis if it was computed from the same content
+            analysis_current = entry.get("content_hash") == content_hash
+            try:
+                new_previews = await self.generate(
+                    clip_path,
+                    previews_dir,
+                    content_hash,
+                    poster_time=entry.get("best_start") if analysis_current else None,
+                    keyframes=entry.get("keyframes") if analysis_current else None
+                )
+            except Exception as e:
+                logger.error(f"Error generating previews for {clip}: {e}")
+                return
+
+            entry["previews"] = new_previews
+            index.set(clip, entry)
+
+        await asyncio.gather(*(generate_clip(clip) for clip in clips))
+        index.prune(clips)
+        index.save()
+
+        # Remove previews of clips that changed or were removed
+        referenced = set()
+        for entry in index.clips.values():
+            previews = entry.get("previews", {})
+            referenced.update(previews.get(key) for key in ("poster", "sprite"))
+        for filename in os.listdir(previews_dir) if os.path.exists(previews_dir) else []:
+            if filename.endswith(".jpg") and filename not in referenced:
+                os.remove(os.path.join(previews_dir, filename))
+
+        return index
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    # Add the project root to the Python path when running the script directly
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Generate poster frames and sprite sheets for a genre")
+    parser.add_argument("--genre", required=True, help="Genre folder under data/media/videos")
+    parser.add_argument("--base-dir", default="data/media/videos", help="Base directory of the clip library")
+    parser.add_argument("--previews-dir", default=PREVIEWS_BASE_DIR, help="Base directory for previews")
+    parser.add_argument("--force", action="store_true", help="Regenerate current previews")
+    args = parser.parse_args()
+
+    from app.infrastructure.ffmpeg.factories import create_command_executor
+
+    generator = AsyncClipPreviewGenerator(create_command_executor())
+    asyncio.run(generator.generate_library(
+        os.path.join(args.base_dir, args.genre),
+        os.path.join(args.previews_dir, args.genre),
+        force=args.force
+    ))
@@ -12,6 +12,7 @@ from app.infrastructure.ffmpeg.video_metadata import AsyncVideoMetadataService
 from app.infrastructure.ffmpeg.merge_audio_video import AsyncAudioVideoMerger
 from app.infrastructure.ffmpeg.add_split_caption import AsyncSplitCaptionAdder
 from app.infrastructure.ffmpeg.video_concatenator import AsyncVideoConcatenator
+from app.infrastructure.ffmpeg.narration_assembler import AsyncNarrationAssembler
 
 logger = logging.getLogger(__name__)
 
@@ -50,15 +51,19 @@ class FFmpegFactory:
             command_executor=self.create_command_executor()
         )
     
-    def create_audio_video_merger(self):
+    def create_audio_video_merger(self, config: Dict[str, Any] = None):
         """
         Create an audio video merger.
         
+        Args:
+            config: Audio format plan (optional)
+        
         Returns:
             AsyncAudioVideoMerger: An audio video merger
         """
         return AsyncAudioVideoMerger(
-            command_executor=self.create_command_executor()
+            command_executor=self.create_command_executor(),
+            config=config
         )
     
     def create_split_caption_adder(self):
@@ -72,15 +77,34 @@ class FFmpegFactory:
             command_executor=self.create_command_executor()
         )
     
-    def create_video_concatenator(self):
+    def create_video_concatenator(self, config: Dict[str, Any] = None):
         """
         Create a video concatenator.
         
+        Args:
+            config: Audio format plan (optional)
+        
         Returns:
             AsyncVideoConcatenator: A video concatenator
         """
         return AsyncVideoConcatenator(
-            command_executor=self.create_command_executor()
+            command_executor=self.create_command_executor(),
+            config=config
+        )
+    
+    def create_narration_assembler(self, config: Dict[str, Any] = None):
+        """
+        Create a narration assembler.
+        
+        Args:
+            config: Assembly options (optional)
+        
+        Returns:
+            AsyncNarrationAssembler: A narration assembler
+        """
+        return AsyncNarrationAssembler(
+            command_executor=self.create_command_executor(),
+            config=config
         )
 
 def create_ffmpeg_factory(config: Dict[str, Any] = None) -> FFmpegFactory:
@@ -135,12 +159,13 @@ def create_video_processing_pipeline(config: Dict[str, Any] = None):
     from app.infrastructure.ffmpeg import create_pipeline
     return create_pipeline(config)
 
-def create_youtube_audio_merger(command_executor=None):
+def create_youtube_audio_merger(command_executor=None, config: Dict[str, Any] = None):
     """
     Create a YouTube audio merger.
     
     Args:
         command_executor: Command executor for running FFmpeg (optional)
+        config: Music cache options (optional)
         
     Returns:
         AsyncYouTubeAudioMerger: A YouTube audio merger
@@ -151,4 +176,4 @@ def create_youtube_audio_merger(command_executor=None):
     if command_executor is None:
         command_executor = create_command_executor()
         
-    return AsyncYouTubeAudioMerger(command_executor) 
\ No newline at end of file
+    return AsyncYouTubeAudioMerger(command_executor, config)
\ No newline at end of file
@@ -6,7 +6,7 @@ This module provides functionality for merging audio and video files.
 
 import os
 import logging
-from typing import Optional
+from typing import Dict, Any, Optional
 
 from app.core.ffmpeg.interfaces import AudioVideoMerger, FFmpegCommandExecutor
 
@@ -18,16 +18,27 @@ class AsyncAudioVideoMerger(AudioVideoMerger):
     Merges audio and video files using FFmpeg.
     """
     
-    def __init__(self, command_executor: FFmpegCommandExecutor):
+    def __init__(self, command_executor: FFmpegCommandExecutor, config: Optional[Dict[str, Any]] = None):
         """
         Initialize the merger.
         
         Args:
             command_executor: Command executor for running FFmpeg
+            config: Audio format plan (optional, see app.core.audio.format_plan)
         """
         self.command_executor = command_executor
+        
+        # Default configuration (None keeps FFmpeg's default)
+        self.config = {
+            "sample_rate": None,    # Sample rate of the merged audio
+            "final_bitrate": None   # Bitrate of the AAC encode
+        }
+        
+        if config:
+            self.config.update({key: value for key, value in config.items() if key in self.config})
     
-    async def process(self, audio_file: str, video_file: str, output_file: str) -> str:
+    async def process(self, audio_file: str, video_file: str, output_file: str, start_offset: float = 0.0,
+                      gain_db: float = 0.0, audio_start: float = 0.0, audio_end: Optional[float] = None) -> str:
         """
         Merge audio and video files.
         
@@ -35,6 +46,10 @@ class AsyncAudioVideoMerger(AudioVideoMerger):
             audio_file: Path to the audio file
             video_file: Path to the video file
             output_file: Path to save the merged file
+            start_offset: Offset into the video to start from, in seconds (e.g. the clip index best_start)
+            gain_db: Gain applied to the audio, in dB (e.g. loudness normalization)
+            audio_start: Offset into the audio to start from, in seconds (e.g. leading silence)
+            audio_end: Offset into the audio to stop at, in seconds (None for the end)
             
         Returns:
             str: Path to the merged file
@@ -45,8 +60,24 @@ class AsyncAudioVideoMerger(AudioVideoMerger):
         logger.info(f"Merging audio {audio_file} with video {video_file} to {output_file}")
         
         # Construct FFmpeg command
-        # This replaces the original audio stream with the provided audio file
-        cmd = f"ffmpeg -i {video_file} -i {audio_file} -map 0:v -map 1:a -c:v copy -shortest {output_file}"
+        # This replaces the original audio stream with the provided audio file.
+        # Input seeking with stream copy starts at the keyframe at or before the offset.
+        seek = f"-ss {start_offset:.3f} " if start_offset and start_offset > 0 else ""
+        
+        # Trim and gain ride along in the audio encode the merge already does
+        audio_trim = f"-ss {audio_start:.3f} " if audio_start and audio_start > 0 else ""
+        if audio_end is not None:
+            audio_trim += f"-t {audio_end - (audio_start or 0.0):.3f} "
+        gain = f"-af volume={gain_db:.2f}dB " if gain_db else ""
+        
+        # Encode the audio as planned for the whole render
+        encode = "-c:a aac "
+        if self.config["final_bitrate"]:
+            encode += f"-b:a {self.config['final_bitrate']} "
+        if self.config["sample_rate"]:
+            encode += f"-ar {self.config['sample_rate']} "
+        
+        cmd = f"ffmpeg {seek}-i {video_file} {audio_trim}-i {audio_file} -map 0:v -map 1:a -c:v copy {encode}{gain}-shortest {output_file}"
         
         try:
             await self.command_executor.execute(cmd)
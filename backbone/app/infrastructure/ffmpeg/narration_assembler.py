@@ -0,0 +1,220 @@
+"""
+Narration Assembler
+
+This module provides functionality for assembling the narration lines of a video into a single
+continuous track. Each TTS file is decoded to PCM once and laid out on one timeline with NumPy,
+so the narration is encoded only once, in the final mux.
+"""
+
+import os
+import math
+import wave
+import shlex
+import asyncio
+import logging
+import tempfile
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from app.core.ffmpeg.interfaces import FFmpegCommandExecutor
+
+logger = logging.getLogger(__name__)
+
+class AsyncNarrationAssembler:
+    """
+    Decodes narration lines and lays them out on a single timeline.
+    """
+
+    def __init__(self, command_executor: FFmpegCommandExecutor, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the assembler.
+
+        Args:
+            command_executor: Command executor for running FFmpeg
+            config: Assembly options (optional, overrides the defaults)
+        """
+        self.command_executor = command_executor
+
+        # Default configuration
+        self.config = {
+            "sample_rate": 48000,   # Sample rate of the narration track
+            "gap": 0.0,             # Silence after each line in seconds
+            "frame_rate": 30,       # Frame rate of the concatenated video; slots are whole frames of it
+            "boundary_fade": 0.02   # Fade-in/out at each end of a line in seconds, so lines start and stop without clicks
+        }
+
+        if config:
+            self.config.update(config)
+
+    async def decode(self, audio_file: str) -> np.ndarray:
+        """
+        Decode an audio file to mono float PCM.
+
+        Args:
+            audio_file: Path to the audio file
+
+        Returns:
+            np.ndarray: Samples in [-1, 1] at the configured sample rate
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pcm_file = os.path.join(temp_dir, "audio.f32")
+            cmd_parts = [
+                "ffmpeg",
+                "-i", audio_file,
+                "-ac", "1",
+                "-ar", self.config["sample_rate"],
+                "-f", "f32le",
+                "-y", pcm_file
+            ]
+            await self.command_executor.execute(" ".join(shlex.quote(str(part)) for part in cmd_parts))
+            return np.fromfile(pcm_file, dtype=np.float32)
+
+    async def decode_all(self, audio_files: List[str]) -> List[np.ndarray]:
+        """
+        Decode several audio files concurrently.
+
+        Args:
+            audio_files: Paths to the audio files
+
+        Returns:
+            List[np.ndarray]: Decoded samples, in the same order
+        """
+        return await asyncio.gather(*(self.decode(audio_file) for audio_file in audio_files))
+
+    def adjust(self, track: np.ndarray, gain_db: float = 0.0, start: float = 0.0, end: Optional[float] = None) -> np.ndarray:
+        """
+        Trim a decoded line to a window and apply a gain.
+
+        Args:
+            track: Decoded narration line
+            gain_db: Gain in dB
+            start: Start of the window in seconds
+            end: End of the window in seconds (None for the end of the line)
+
+        Returns:
+            np.ndarray: The adjusted line
+        """
+        sample_rate = self.config["sample_rate"]
+        first = int(round((start or 0.0) * sample_rate))
+        last = int(round(end * sample_rate)) if end is not None else len(track)
+        track = track[first:last]
+
+        if gain_db:
+            track = track * np.float32(10 ** (gain_db / 20))
+        return track
+
+    def slot_durations(self, tracks: List[np.ndarray], max_durations: Optional[List[float]] = None) -> List[float]:
+        """
+        Compute the timeline slot of each line: its length plus the gap, capped by the length
+        of the clip it plays over, rounded to whole frames of the concatenated video. Clips are
+        cut to their slot and re-timed to that frame rate, so slots that weren't whole frames
+        would let the video drift against the narration by up to a frame per clip.
+
+        Args:
+            tracks: Decoded narration lines
+            max_durations: Maximum slot length per line (e.g. source clip durations)
+
+        Returns:
+            List[float]: Slot durations in seconds
+        """
+        sample_rate = self.config["sample_rate"]
+        frame_rate = self.config["frame_rate"]
+        durations = []
+
+        for i, track in enumerate(tracks):
+            frames = round((len(track) / sample_rate + self.config["gap"]) * frame_rate)
+            if max_durations and max_durations[i]:
+                # Rounding must not run past the end of the clip
+                frames = min(frames, math.floor(max_durations[i] * frame_rate + 1e-6))
+            durations.append(max(frames, 1) / frame_rate)
+
+        return durations
+
+    def build_track(self, tracks: List[np.ndarray], slot_durations: List[float]) -> np.ndarray:
+        """
+        Lay the lines out back to back, each starting at the sum of the previous slots.
+
+        Args:
+            tracks: Decoded narration lines
+            slot_durations: Slot duration of each line in seconds
+
+        Returns:
+            np.ndarray: The narration track
+        """
+        sample_rate = self.config["sample_rate"]
+
+        # Round slot boundaries (not slot lengths) so rounding errors don't accumulate
+        boundaries = np.round(np.concatenate(([0.0], np.cumsum(slot_durations))) * sample_rate).astype(np.int64)
+        timeline = np.zeros(boundaries[-1], dtype=np.float32)
+        # Lines don't overlap (each stays in its clip's slot); each one fades in and out on its own
+        fade_samples = int(self.config["boundary_fade"] * sample_rate)
+
+        for track, start, end in zip(tracks, boundaries[:-1], boundaries[1:]):
+            segment = track[: end - start].copy()
+            fade = min(fade_samples, len(segment) // 2)
+            if fade > 0:
+                ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+                segment[:fade] *= ramp
+                segment[-fade:] *= ramp[::-1]
+            timeline[start: start + len(segment)] += segment
+
+        return timeline
+
+    def write_wav(self, track: np.ndarray, output_file: str) -> str:
+        """
+        Write a track as 16-bit PCM WAV, atomically.
+
+        Args:
+            track: Samples in [-1, 1]
+            output_file: Path to the WAV file
+
+        Returns:
+            str: Path to the WAV file
+        """
+        output_dir = os.path.dirname(output_file) or "."
+        os.makedirs(output_dir, exist_ok=True)
+
+        samples = (np.clip(track, -1.0, 1.0) * 32767).astype("<i2")
+
+        fd, temp_path = tempfile.mkstemp(dir=output_dir, suffix=".wav")
+        os.close(fd)
+        try:
+            with wave.open(temp_path, "wb") as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(self.config["sample_rate"])
+                wav_file.writeframes(samples.tobytes())
+            os.replace(temp_path, output_file)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        return output_file
+
+    async def assemble(self, audio_files: List[str], output_file: str,
+                       max_durations: Optional[List[float]] = None) -> List[Dict[str, Any]]:
+        """
+        Assemble narration lines into one track.
+
+        Args:
+            audio_files: Paths to the narration lines, in timeline order
+            output_file: Path to the narration WAV file
+            max_durations: Maximum slot length per line (optional)
+
+        Returns:
+            List[Dict[str, Any]]: Timeline with audio_file, start and duration of each line
+        """
+        tracks = await self.decode_all(audio_files)
+        durations = self.slot_durations(tracks, max_durations)
+        track = self.build_track(tracks, durations)
+        self.write_wav(track, output_file)
+
+        starts = np.concatenate(([0.0], np.cumsum(durations)[:-1]))
+        logger.info(f"Assembled {len(audio_files)} narration lines ({len(track) / self.config['sample_rate']:.2f}s) into {output_file}")
+
+        return [
+            {"audio_file": audio_file, "start": float(start), "duration": float(duration)}
+            for audio_file, start, duration in zip(audio_files, starts, durations)
+        ]
@@ -7,7 +7,9 @@ This module implements the AsyncVideoProcessingPipeline class for processing vid
 import os
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
 
 from app.core.ffmpeg.interfaces import (
     FFmpegCommandExecutor,
@@ -17,6 +19,7 @@ from app.core.ffmpeg.interfaces import (
     VideoConcatenator,
     VideoProcessingPipeline
 )
+from app.infrastructure.ffmpeg.narration_assembler import AsyncNarrationAssembler
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +36,8 @@ class AsyncVideoProcessingPipeline:
         audio_video_merger: AudioVideoMerger,
         split_caption_adder: SplitCaptionAdder,
         concatenator: VideoConcatenator,
-        max_concurrent_tasks: int = 4
+        max_concurrent_tasks: int = 4,
+        narration_assembler: Optional[AsyncNarrationAssembler] = None
     ):
         """
         Initialize the pipeline with the necessary components.
@@ -45,6 +49,7 @@ class AsyncVideoProcessingPipeline:
             split_caption_adder: Component for adding split captions
             concatenator: Component for concatenating videos
             max_concurrent_tasks: Maximum number of concurrent tasks
+            narration_assembler: Component for assembling a single narration track (optional)
         """
         self.command_executor = command_executor
         self.metadata_service = metadata_service
@@ -52,6 +57,7 @@ class AsyncVideoProcessingPipeline:
         self.split_caption_adder = split_caption_adder
         self.concatenator = concatenator
         self.max_concurrent_tasks = max_concurrent_tasks
+        self.narration_assembler = narration_assembler or AsyncNarrationAssembler(command_executor)
         
         # Configuration for captions
         self.font_size = 24
@@ -85,6 +91,89 @@ class AsyncVideoProcessingPipeline:
         
         return filename
     
+    def _caption_duration(self, data: Dict[str, Any]) -> Optional[float]:
+        """
+        Get the duration of a merged clip from known lengths, without probing it.
+        Merging stops at the shorter of the narration and the rest of the source clip.
+        
+        Args:
+            data: Processing data with "audio_duration" and optionally "clip_duration"
+            
+        Returns:
+            Optional[float]: Duration in seconds, or None if the narration length is unknown
+        """
+        duration = data.get("audio_duration")
+        if not duration:
+            return None
+        
+        clip_duration = data.get("clip_duration")
+        if clip_duration:
+            duration = min(duration, max(clip_duration - data.get("start_offset", 0.0), 0.0))
+        return duration or None
+    
+    async def process_video(self, audio_file: str, data: Dict[str, Any], input_video: str = None) -> Optional[str]:
+        """
+        Process a single video: merge its audio and add captions.
+        
+        Args:
+            audio_file: Path to the audio file
+            data: Processing data {"line": caption_text, "source_video": video_path, "clip": clip_name}
+            input_video: Optional reference video used when the data has no source video
+            
+        Returns:
+            Optional[str]: Path to the processed video, or None if processing failed
+        """
+        try:
+            # Extract data
+            line = data.get("line", "")
+            source_video = data.get("source_video", input_video)
+            
+            # Determine output filename (using clip name if available)
+            clip_name = data.get("clip", None)
+            audio_basename = os.path.basename(audio_file).split('.')[0]
+            
+            if clip_name:
+                # Use the clip name from video_list.json
+                # Ensure clip name is valid and has an extension
+                clip_name = self._ensure_valid_filename(clip_name)
+                
+                merged_output = os.path.join(self.output_dir, f"merged_{clip_name}")
+                final_output = os.path.join(self.output_dir, clip_name)
+            else:
+                # Fall back to using the audio filename
+                merged_output = os.path.join(self.output_dir, f"merged_{audio_basename}.mp4")
+                final_output = os.path.join(self.output_dir, f"final_{audio_basename}.mp4")
+            
+            # Step 1: Merge audio and video
+            logger.info(f"Merging audio {audio_file} with video {source_video}")
+            merged = await self.audio_video_merger.process(
+                audio_file=audio_file,
+                video_file=source_video,
+                output_file=merged_output,
+                start_offset=data.get("start_offset", 0.0),
+                gain_db=data.get("audio_gain_db", 0.0),
+                audio_start=data.get("audio_start", 0.0),
+                audio_end=data.get("audio_end")
+            )
+            
+            # Step 2: Add captions
+            logger.info(f"Adding captions to {merged}")
+            captioned = await self.split_caption_adder.process(
+                input_file=merged,
+                captions=line,
+                output_file=final_output,
+                position=self.caption_position,
+                font_size=self.font_size,
+                duration=self._caption_duration(data) if merged != source_video else None,
+                word_timings=data.get("word_timings") if merged != source_video else None
+            )
+            
+            # Return final video path
+            return captioned
+        except Exception as e:
+            logger.error(f"Error processing video with audio {audio_file}: {e}")
+            return None
+    
     async def process_videos(self, video_data: Dict[str, Dict[str, Any]], input_video: str = None) -> List[str]:
         """
         Process multiple videos in parallel.
@@ -109,50 +198,7 @@ class AsyncVideoProcessingPipeline:
         
         async def process_single_video(audio_file, data):
             async with semaphore:
-                try:
-                    # Extract data
-                    line = data.get("line", "")
-                    source_video = data.get("source_video", input_video)
-                    
-                    # Determine output filename (using clip name if available)
-                    clip_name = data.get("clip", None)
-                    audio_basename = os.path.basename(audio_file).split('.')[0]
-                    
-                    if clip_name:
-                        # Use the clip name from video_list.json
-                        # Ensure clip name is valid and has an extension
-                        clip_name = self._ensure_valid_filename(clip_name)
-                        
-                        merged_output = os.path.join(self.output_dir, f"merged_{clip_name}")
-                        final_output = os.path.join(self.output_dir, clip_name)
-                    else:
-                        # Fall back to using the audio filename
-                        merged_output = os.path.join(self.output_dir, f"merged_{audio_basename}.mp4")
-                        final_output = os.path.join(self.output_dir, f"final_{audio_basename}.mp4")
-                    
-                    # Step 1: Merge audio and video
-                    logger.info(f"Merging audio {audio_file} with video {source_video}")
-                    merged = await self.audio_video_merger.process(
-                        audio_file=audio_file,
-                        video_file=source_video,
-                        output_file=merged_output
-                    )
-                    
-                    # Step 2: Add captions
-                    logger.info(f"Adding captions to {merged}")
-                    captioned = await self.split_caption_adder.process(
-                        input_file=merged,
-                        captions=line,
-                        output_file=final_output,
-                        position=self.caption_position,
-                        font_size=self.font_size
-                    )
-                    
-                    # Return final video path
-                    return captioned
-                except Exception as e:
-                    logger.error(f"Error processing video with audio {audio_file}: {e}")
-                    return None
+                return await self.process_video(audio_file, data, input_video)
         
         # Create tasks for each video
         for audio_file, data in video_data.items():
@@ -171,6 +217,166 @@ class AsyncVideoProcessingPipeline:
         logger.info(f"Completed processing {len(processed_videos)} videos successfully")
         return processed_videos
     
+    async def prepare_narrated_video(self, audio_file: str, data: Dict[str, Any]) -> Tuple[np.ndarray, float]:
+        """
+        Decode a narration line and size its slot on the timeline: the line's length,
+        capped by what remains of the source clip after its start offset.
+        
+        Args:
+            audio_file: Path to the audio file
+            data: Processing data {"line": caption_text, "source_video": video_path, "clip": clip_name}
+            
+        Returns:
+            Tuple[np.ndarray, float]: The decoded line and its slot duration in seconds
+        """
+        # Use the clip length from the clip index when known, instead of probing the clip
+        clip_duration = data.get("clip_duration")
+        if clip_duration:
+            track = await self.narration_assembler.decode(audio_file)
+        else:
+            track, clip_duration = await asyncio.gather(
+                self.narration_assembler.decode(audio_file),
+                self.metadata_service.get_duration(data["source_video"]),
+                return_exceptions=True
+            )
+        if isinstance(track, BaseException):
+            raise track
+        
+        # Apply the line's speech window and loudness gain to the decoded samples
+        track = self.narration_assembler.adjust(
+            track, data.get("audio_gain_db", 0.0), data.get("audio_start", 0.0), data.get("audio_end")
+        )
+        
+        max_duration = None
+        if not isinstance(clip_duration, BaseException):
+            max_duration = max(clip_duration - data.get("start_offset", 0.0), 0.0) or None
+        
+        slot = self.narration_assembler.slot_durations([track], [max_duration])[0]
+        return track, slot
+    
+    async def render_narrated_video(self, audio_file: str, data: Dict[str, Any], slot: float) -> Optional[str]:
+        """
+        Cut a clip to its narration slot without audio and add captions.
+        
+        Args:
+            audio_file: Path to the audio file (names the output when there is no clip name)
+            data: Processing data {"line": caption_text, "source_video": video_path, "clip": clip_name}
+            slot: Slot duration in seconds
+            
+        Returns:
+            Optional[str]: Path to the processed (silent) video, or None if processing failed
+        """
+        try:
+            line = data.get("line", "")
+            source_video = data["source_video"]
+            clip_name = data.get("clip", None)
+            audio_basename = os.path.basename(audio_file).split('.')[0]
+            
+            if clip_name:
+                clip_name = self._ensure_valid_filename(clip_name)
+                cut_output = os.path.join(self.output_dir, f"cut_{clip_name}")
+                final_output = os.path.join(self.output_dir, clip_name)
+            else:
+                cut_output = os.path.join(self.output_dir, f"cut_{audio_basename}.mp4")
+                final_output = os.path.join(self.output_dir, f"final_{audio_basename}.mp4")
+            
+            # Step 1: Cut the clip to its slot, dropping audio (stream copy, no encode)
+            start_offset = data.get("start_offset", 0.0)
+            seek = f"-ss {start_offset:.3f} " if start_offset else ""
+            cmd = f"ffmpeg {seek}-i {source_video} -t {slot:.3f} -an -c:v copy -y {cut_output}"
+            await self.command_executor.execute(cmd)
+            
+            # Step 2: Add captions
+            logger.info(f"Adding captions to {cut_output}")
+            return await self.split_caption_adder.process(
+                input_file=cut_output,
+                captions=line,
+                output_file=final_output,
+                position=self.caption_position,
+                font_size=self.font_size,
+                duration=slot,
+                word_timings=data.get("word_timings")
+            )
+        except Exception as e:
+            logger.error(f"Error processing video with audio {audio_file}: {e}")
+            return None
+    
+    def write_narration_track(self, tracks: List[np.ndarray], slots: List[float], narration_file: str) -> str:
+        """
+        Lay out the narration lines of the rendered clips and write the track.
+        
+        Args:
+            tracks: Decoded narration lines, in timeline order
+            slots: Slot duration of each line in seconds
+            narration_file: Path to write the narration track (WAV) to
+            
+        Returns:
+            str: Path to the narration track
+        """
+        narration = self.narration_assembler.build_track(tracks, slots)
+        return self.narration_assembler.write_wav(narration, narration_file)
+    
+    async def process_videos_with_narration(self, video_data: Dict[str, Dict[str, Any]], narration_file: str) -> List[str]:
+        """
+        Process multiple videos without per-clip audio, assembling the narration into one track.
+        
+        Each audio file is decoded once; clips are cut to the length of their line (capped by the
+        source clip), captioned without audio, and the narration lines are laid out on a single
+        timeline matching the clip order. The narration is encoded once, when muxed into the
+        concatenated video.
+        
+        Args:
+            video_data: Dictionary mapping audio files to their processing data
+                        {audio_file: {"line": caption_text, "source_video": video_path, "clip": clip_name}}
+            narration_file: Path to write the narration track (WAV) to
+            
+        Returns:
+            List[str]: List of processed (silent) video file paths, in timeline order
+        """
+        logger.info(f"Starting narration processing of {len(video_data)} videos with max {self.max_concurrent_tasks} concurrent tasks")
+        
+        os.makedirs(self.output_dir, exist_ok=True)
+        if os.path.exists(narration_file):
+            os.remove(narration_file)
+        
+        entries = list(video_data.items())
+        
+        # Decode every line once and size each clip's slot on the timeline
+        prepared = await asyncio.gather(
+            *(self.prepare_narrated_video(audio_file, data) for audio_file, data in entries),
+            return_exceptions=True
+        )
+        
+        semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
+        
+        async def process_single_video(audio_file, data, prepared_line):
+            if isinstance(prepared_line, BaseException):
+                logger.error(f"Error decoding narration {audio_file}: {prepared_line}")
+                return None
+            async with semaphore:
+                return await self.render_narrated_video(audio_file, data, prepared_line[1])
+        
+        results = await asyncio.gather(
+            *(process_single_video(audio_file, data, line) for (audio_file, data), line in zip(entries, prepared)),
+            return_exceptions=True
+        )
+        
+        # Keep the narration lines of the clips that rendered, so audio and video stay aligned
+        processed_videos, kept_tracks, kept_slots = [], [], []
+        for result, prepared_line in zip(results, prepared):
+            if result and not isinstance(result, Exception) and os.path.exists(result):
+                processed_videos.append(result)
+                kept_tracks.append(prepared_line[0])
+                kept_slots.append(prepared_line[1])
+            elif isinstance(result, Exception):
+                logger.error(f"Task failed with exception: {result}")
+        
+        if processed_videos:
+            self.write_narration_track(kept_tracks, kept_slots, narration_file)
+        
+        logger.info(f"Completed processing {len(processed_videos)} videos with a single narration track")
+        return processed_videos
+    
     async def concatenate_videos(self, video_files: List[str], output_file: str, project_id: str = None) -> str:
         """
         Concatenate multiple videos into a single video.
@@ -0,0 +1,452 @@
+"""
+Render Equivalence Checker
+
+This module renders a fixture project through two pipeline configurations and
+compares the results, so changes to the FFmpeg path can be verified against a baseline.
+"""
+
+import os
+import re
+import json
+import shlex
+import shutil
+import argparse
+import asyncio
+import logging
+import tempfile
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from app.core.ffmpeg.interfaces import FFmpegCommandExecutor
+
+logger = logging.getLogger(__name__)
+
+class AsyncRenderEquivalenceChecker:
+    """
+    Renders a fixture project with a baseline and a candidate pipeline configuration
+    and checks that the outputs are equivalent within configurable thresholds.
+
+    Checks performed:
+    - Video: SSIM and PSNR per clip segment using FFmpeg's ssim/psnr filters
+    - Audio: normalized PCM cross-correlation and alignment offset
+    - Captions: segment text and timing boundaries per clip
+    - Duration: drift of the final video and of each clip
+    """
+
+    def __init__(self, command_executor: FFmpegCommandExecutor, thresholds: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the checker.
+
+        Args:
+            command_executor: Command executor for running FFmpeg
+            thresholds: Pass/fail thresholds (optional, overrides the defaults)
+        """
+        self.command_executor = command_executor
+
+        # Default thresholds
+        self.thresholds = {
+            "min_ssim": 0.97,                  # Minimum mean SSIM (All) per segment
+            "min_psnr": 35.0,                  # Minimum mean PSNR (dB) per segment
+            "min_audio_correlation": 0.95,     # Minimum normalized cross-correlation peak
+            "max_audio_offset_ms": 25.0,       # Maximum lag between the two audio tracks
+            "max_caption_drift": 0.05,         # Maximum caption boundary difference (seconds)
+            "max_duration_drift": 0.1,         # Maximum duration difference (seconds)
+            "audio_sample_rate": 16000         # Sample rate used for audio comparison
+        }
+
+        if thresholds:
+            self.thresholds.update(thresholds)
+
+    async def render(self, fixture_dir: str, videos_dir: str, pipeline_config: Dict[str, Any], output_dir: str) -> Dict[str, Any]:
+        """
+        Render the fixture project through a pipeline configuration.
+
+        Args:
+            fixture_dir: Directory containing video_list.json and its audio files
+            videos_dir: Directory containing the source videos
+            pipeline_config: Configuration passed to create_pipeline
+            output_dir: Directory for the rendered clips and final video
+
+        Returns:
+            Dict[str, Any]: Render result with clips, caption segments and the final video path
+        """
+        from app.infrastructure.ffmpeg import create_pipeline
+
+        with open(os.path.join(fixture_dir, "video_list.json"), "r") as f:
+            video_list = json.load(f)
+
+        # Build the processing data in the same shape as VideoProcessorService
+        video_data = {}
+        for audio_file, data in video_list.items():
+            video_data[os.path.join(fixture_dir, audio_file)] = {
+                "line": data["line"],
+                "source_video": os.path.join(videos_dir, data["source_video"]),
+                "clip": data.get("clip", None)
+            }
+
+        os.makedirs(output_dir, exist_ok=True)
+        pipeline = create_pipeline(pipeline_config)
+        pipeline.output_dir = output_dir
+
+        logger.info(f"Rendering fixture {fixture_dir} with config {pipeline_config}")
+        clips = await pipeline.process_videos(video_data)
+        if len(clips) != len(video_data):
+            raise RuntimeError(f"Rendered {len(clips)} of {len(video_data)} clips with config {pipeline_config}")
+
+        final_video = await pipeline.concatenate_videos(clips, os.path.join(output_dir, "final_equivalence.mp4"))
+        if not final_video:
+            raise RuntimeError(f"Concatenation failed with config {pipeline_config}")
+
+        # Record clip durations and the caption segments the caption adder drew into each clip
+        # (a clip whose captions failed has none, so it shows up as a mismatch)
+        clip_durations = []
+        caption_segments = []
+        for clip in clips:
+            clip_durations.append(await pipeline.metadata_service.get_duration(clip))
+            caption_segments.append(pipeline.split_caption_adder.drawn_segments.get(clip, []))
+
+        return {
+            "clips": clips,
+            "clip_durations": clip_durations,
+            "caption_segments": caption_segments,
+            "final_video": final_video,
+            "final_duration": await pipeline.metadata_service.get_duration(final_video)
+        }
+
+    async def compare_video(self, baseline: str, candidate: str, segments: List[Tuple[float, float]], work_dir: str) -> Dict[str, Any]:
+        """
+        Compare two videos with FFmpeg's ssim and psnr filters, aggregated per segment.
+
+        Args:
+            baseline: Path to the baseline video
+            candidate: Path to the candidate video
+            segments: (start_time, end_time) for each segment of the baseline timeline
+            work_dir: Directory for the filter statistics files
+
+        Returns:
+            Dict[str, Any]: Per-segment SSIM/PSNR and an overall pass flag
+        """
+        ssim_log = os.path.join(work_dir, "ssim.log")
+        psnr_log = os.path.join(work_dir, "psnr.log")
+
+        filter_complex = (
+            f"[0:v]split=2[c0][c1];[1:v]split=2[b0][b1];"
+            f"[c0][b0]ssim=stats_file={ssim_log}[ssim];"
+            f"[c1][b1]psnr=stats_file={psnr_log}[psnr]"
+        )
+        cmd_parts = [
+            "ffmpeg",
+            "-i", candidate,
+            "-i", baseline,
+            "-filter_complex", filter_complex,
+            "-map", "[ssim]", "-f", "null", os.path.join(work_dir, "ssim.nut"),
+            "-map", "[psnr]", "-f", "null", os.path.join(work_dir, "psnr.nut"),
+            "-y"
+        ]
+        await self.command_executor.execute(" ".join(shlex.quote(str(part)) for part in cmd_parts))
+
+        # Frame numbers in the stats files map to timestamps through the baseline frame rate
+        fps = await self._get_frame_rate(baseline)
+        ssim_values = self._parse_stats_file(ssim_log, r"All:([0-9.]+)")
+        psnr_values = self._parse_stats_file(psnr_log, r"psnr_avg:([0-9.]+|inf)")
+
+        results = []
+        for index, (start_time, end_time) in enumerate(segments):
+            first = int(start_time * fps)
+            last = max(first + 1, int(end_time * fps))
+            segment_ssim = ssim_values[first:last]
+            segment_psnr = psnr_values[first:last]
+
+            mean_ssim = float(np.mean(segment_ssim)) if segment_ssim.size else 0.0
+            mean_psnr = float(np.mean(np.minimum(segment_psnr, 100.0))) if segment_psnr.size else 0.0
+            results.append({
+                "segment": index,
+                "start_time": start_time,
+                "end_time": end_time,
+                "ssim": mean_ssim,
+                "min_ssim": float(np.min(segment_ssim)) if segment_ssim.size else 0.0,
+                "psnr": mean_psnr,
+                "passed": (
+                    mean_ssim >= self.thresholds["min_ssim"]
+                    and mean_psnr >= self.thresholds["min_psnr"]
+                )
+            })
+
+        return {
+            "segments": results,
+            "frames_compared": int(min(ssim_values.size, psnr_values.size)),
+            "passed": bool(results) and all(r["passed"] for r in results)
+        }
+
+    async def compare_audio(self, baseline: str, candidate: str, work_dir: str) -> Dict[str, Any]:
+        """
+        Compare the audio tracks of two files using PCM cross-correlation.
+
+        Args:
+            baseline: Path to the baseline media file
+            candidate: Path to the candidate media file
+            work_dir: Directory for the decoded PCM files
+
+        Returns:
+            Dict[str, Any]: Correlation peak, lag in milliseconds and an overall pass flag
+        """
+        sample_rate = int(self.thresholds["audio_sample_rate"])
+        baseline_pcm = await self._decode_pcm(baseline, os.path.join(work_dir, "baseline.pcm"), sample_rate)
+        candidate_pcm = await self._decode_pcm(candidate, os.path.join(work_dir, "candidate.pcm"), sample_rate)
+
+        if baseline_pcm.size == 0 or candidate_pcm.size == 0:
+            both_silent = baseline_pcm.size == candidate_pcm.size
+            return {"correlation": 1.0 if both_silent else 0.0, "offset_ms": 0.0, "passed": both_silent}
+
+        correlation, lag = self._cross_correlate(baseline_pcm, candidate_pcm)
+        offset_ms = lag * 1000.0 / sample_rate
+
+        return {
+            "correlation": correlation,
+            "offset_ms": offset_ms,
+            "baseline_rms": float(np.sqrt(np.mean(baseline_pcm ** 2))),
+            "candidate_rms": float(np.sqrt(np.mean(candidate_pcm ** 2))),
+            "passed": (
+                correlation >= self.thresholds["min_audio_correlation"]
+                and abs(offset_ms) <= self.thresholds["max_audio_offset_ms"]
+            )
+        }
+
+    def compare_captions(self, baseline_segments: List[List[Tuple[str, float, float]]],
+                         candidate_segments: List[List[Tuple[str, float, float]]]) -> Dict[str, Any]:
+        """
+        Compare the caption segments of each clip.
+
+        Args:
+            baseline_segments: Caption segments per clip for the baseline render
+            candidate_segments: Caption segments per clip for the candidate render
+
+        Returns:
+            Dict[str, Any]: Maximum boundary drift, text mismatches and an overall pass flag
+        """
+        max_drift = 0.0
+        mismatches = []
+
+        for clip_index, (baseline, candidate) in enumerate(zip(baseline_segments, candidate_segments)):
+            if [text for text, _, _ in baseline] != [text for text, _, _ in candidate]:
+                mismatches.append(clip_index)
+                continue
+            for (_, b_start, b_end), (_, c_start, c_end) in zip(baseline, candidate):
+                max_drift = max(max_drift, abs(b_start - c_start), abs(b_end - c_end))
+
+        if len(baseline_segments) != len(candidate_segments):
+            mismatches.append("clip_count")
+
+        return {
+            "max_drift": max_drift,
+            "mismatched_clips": mismatches,
+            "passed": not mismatches and max_drift <= self.thresholds["max_caption_drift"]
+        }
+
+    def compare_durations(self, baseline: Dict[str, Any], candidate: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compare the final and per-clip durations of two renders.
+
+        Args:
+            baseline: Render result for the baseline configuration
+            candidate: Render result for the candidate configuration
+
+        Returns:
+            Dict[str, Any]: Duration drift values and an overall pass flag
+        """
+        final_drift = abs(baseline["final_duration"] - candidate["final_duration"])
+        clip_drifts = [
+            abs(b - c) for b, c in zip(baseline["clip_durations"], candidate["clip_durations"])
+        ]
+        max_clip_drift = max(clip_drifts) if clip_drifts else 0.0
+
+        return {
+            "baseline_duration": baseline["final_duration"],
+            "candidate_duration": candidate["final_duration"],
+            "final_drift": final_drift,
+            "max_clip_drift": max_clip_drift,
+            "passed": (
+                final_drift <= self.thresholds["max_duration_drift"]
+                and max_clip_drift <= self.thresholds["max_duration_drift"]
+            )
+        }
+
+    async def check(self, fixture_dir: str, videos_dir: str, baseline_config: Dict[str, Any],
+                    candidate_config: Dict[str, Any], work_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Render the fixture with both configurations and compare the results.
+
+        Args:
+            fixture_dir: Directory containing video_list.json and its audio files
+            videos_dir: Directory containing the source videos
+            baseline_config: Pipeline configuration for the reference render
+            candidate_config: Pipeline configuration under test
+            work_dir: Directory for renders and intermediate files (temporary if not provided)
+
+        Returns:
+            Dict[str, Any]: Equivalence report with a top-level "passed" flag
+        """
+        cleanup = work_dir is None
+        work_dir = work_dir or tempfile.mkdtemp(prefix="render_equivalence_")
+
+        try:
+            baseline = await self.render(fixture_dir, videos_dir, baseline_config, os.path.join(work_dir, "baseline"))
+            candidate = await self.render(fixture_dir, videos_dir, candidate_config, os.path.join(work_dir, "candidate"))
+
+            # Segments follow the clip boundaries of the baseline timeline
+            segments = []
+            offset = 0.0
+            for duration in baseline["clip_durations"]:
+                segments.append((offset, offset + duration))
+                offset += duration
+
+            report = {
+                "video": await self.compare_video(baseline["final_video"], candidate["final_video"], segments, work_dir),
+                "audio": await self.compare_audio(baseline["final_video"], candidate["final_video"], work_dir),
+                "captions": self.compare_captions(baseline["caption_segments"], candidate["caption_segments"]),
+                "duration": self.compare_durations(baseline, candidate)
+            }
+            report["passed"] = all(section["passed"] for section in report.values())
+            report["thresholds"] = dict(self.thresholds)
+
+            logger.info(f"Render equivalence {'PASSED' if report['passed'] else 'FAILED'}")
+            return report
+        finally:
+            if cleanup:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    async def _get_frame_rate(self, video_file: str) -> float:
+        """
+        Get the frame rate of the first video stream.
+
+        Args:
+            video_file: Path to the video file
+
+        Returns:
+            float: Frames per second (30.0 if it cannot be determined)
+        """
+        info = await self.command_executor.get_video_info(video_file)
+        for stream in info.get("streams", []):
+            if stream.get("codec_type") == "video":
+                num, _, den = stream.get("avg_frame_rate", "30/1").partition("/")
+                try:
+                    return float(num) / float(den or 1)
+                except (ValueError, ZeroDivisionError):
+                    break
+        return 30.0
+
+    async def _decode_pcm(self, media_file: str, output_file: str, sample_rate: int) -> np.ndarray:
+        """
+        Decode the audio of a media file to mono float PCM.
+
+        Args:
+            media_file: Path to the media file
+            output_file: Path for the raw PCM output
+            sample_rate: Sample rate to decode at
+
+        Returns:
+            np.ndarray: Samples in the range [-1, 1]
+        """
+        cmd_parts = [
+            "ffmpeg",
+            "-i", media_file,
+            "-vn", "-ac", "1", "-ar", sample_rate,
+            "-f", "s16le",
+            "-y", output_file
+        ]
+        await self.command_executor.execute(" ".join(shlex.quote(str(part)) for part in cmd_parts))
+        return np.fromfile(output_file, dtype="<i2").astype(np.float32) / 32768.0
+
+    @staticmethod
+    def _parse_stats_file(stats_file: str, pattern: str) -> np.ndarray:
+        """
+        Parse per-frame values from an ssim/psnr stats file.
+
+        Args:
+            stats_file: Path to the stats file
+            pattern: Regex with one group capturing the value
+
+        Returns:
+            np.ndarray: One value per frame
+        """
+        values = []
+        with open(stats_file, "r") as f:
+            for line in f:
+                match = re.search(pattern, line)
+                if match:
+                    values.append(float(match.group(1)))
+        return np.asarray(values, dtype=np.float64)
+
+    @staticmethod
+    def _cross_correlate(baseline: np.ndarray, candidate: np.ndarray) -> Tuple[float, int]:
+        """
+        Compute the normalized cross-correlation peak between two signals.
+
+        Args:
+            baseline: Baseline samples
+            candidate: Candidate samples
+
+        Returns:
+            Tuple[float, int]: (correlation peak, lag of the candidate in samples)
+        """
+        baseline = baseline - np.mean(baseline)
+        candidate = candidate - np.mean(candidate)
+
+        size = baseline.size + candidate.size - 1
+        fft_size = 1 << (size - 1).bit_length()
+
+        spectrum = np.fft.rfft(candidate, fft_size) * np.conj(np.fft.rfft(baseline, fft_size))
+        correlation = np.fft.irfft(spectrum, fft_size)
+
+        # Reorder so that negative lags come first
+        correlation = np.concatenate((correlation[-(baseline.size - 1):], correlation[:candidate.size]))
+        peak = int(np.argmax(np.abs(correlation)))
+
+        norm = np.sqrt(np.sum(baseline ** 2) * np.sum(candidate ** 2))
+        if norm == 0:
+            return (1.0 if not np.any(baseline) and not np.any(candidate) else 0.0), 0
+
+        return float(correlation[peak] / norm), peak - (baseline.size - 1)
+
+
+def _load_config_argument(value: str) -> Dict[str, Any]:
+    """Load a pipeline configuration from a JSON file path or an inline JSON string."""
+    if os.path.exists(value):
+        with open(value, "r") as f:
+            return json.load(f)
+    return json.loads(value)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Add the project root to the Python path when running the script directly
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Check that two pipeline configurations render equivalent output")
+    parser.add_argument("--fixture", required=True, help="Directory with video_list.json and audio files")
+    parser.add_argument("--videos-dir", required=True, help="Directory with the source videos")
+    parser.add_argument("--baseline", default="{}", help="Baseline pipeline config (JSON file or string)")
+    parser.add_argument("--candidate", required=True, help="Candidate pipeline config (JSON file or string)")
+    parser.add_argument("--thresholds", default="{}", help="Threshold overrides (JSON file or string)")
+    parser.add_argument("--work-dir", default=None, help="Keep renders in this directory")
+    args = parser.parse_args()
+
+    from app.infrastructure.ffmpeg.factories import create_command_executor
+
+    checker = AsyncRenderEquivalenceChecker(create_command_executor(), _load_config_argument(args.thresholds))
+    result = asyncio.run(checker.check(
+        args.fixture,
+        args.videos_dir,
+        _load_config_argument(args.baseline),
+        _load_config_argument(args.candidate),
+        args.work_dir
+    ))
+
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["passed"] else 1)
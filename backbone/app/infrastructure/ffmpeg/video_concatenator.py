@@ -9,7 +9,7 @@ import tempfile
 import logging
 import shutil
 import uuid
-from typing import List
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 from app.core.ffmpeg.interfaces import VideoConcatenator, FFmpegCommandExecutor
@@ -22,14 +22,25 @@ class AsyncVideoConcatenator(VideoConcatenator):
     Concatenates multiple videos into a single video using FFmpeg.
     """
     
-    def __init__(self, command_executor: FFmpegCommandExecutor):
+    def __init__(self, command_executor: FFmpegCommandExecutor, config: Optional[Dict[str, Any]] = None):
         """
         Initialize the concatenator.
         
         Args:
             command_executor: Command executor for running FFmpeg
+            config: Audio format plan (optional, see app.core.audio.format_plan)
         """
         self.command_executor = command_executor
+        
+        # Default configuration
+        self.config = {
+            "sample_rate": 48000,               # Sample rate of the concatenated audio
+            "intermediate_codec": "pcm_s16le",  # Audio codec of the normalized clips (lossless)
+            "final_bitrate": "192k"             # Bitrate of the single AAC encode
+        }
+        
+        if config:
+            self.config.update({key: value for key, value in config.items() if key in self.config and value})
     
     async def process(self, video_files: List[str], output_file: str, project_id: str = None) -> str:
         """
@@ -91,8 +102,8 @@ class AsyncVideoConcatenator(VideoConcatenator):
                 # Get video info to check frame rate
                 video_info = await self.command_executor.get_video_info(video_file)
                 
-                # Create normalized output path
-                normalized_path = os.path.join(temp_dir, f"normalized_{i}.mp4")
+                # Create normalized output path (Matroska, so the audio can stay uncompressed)
+                normalized_path = os.path.join(temp_dir, f"normalized_{i}.mkv")
                 normalized_videos.append(normalized_path)
                 
                 # Normalize video with explicit parameters for consistency
@@ -101,7 +112,7 @@ class AsyncVideoConcatenator(VideoConcatenator):
                     f"-r 30 -g 30 -keyint_min 30 -sc_threshold 0 "  # Force consistent frame rate and keyframes
                     f"-vsync cfr "  # Constant frame rate
                     f"-async 1 "    # Audio sync
-                    f"-c:a aac -b:a 192k -ar 48000 "  # Consistent audio
+                    f"-c:a {self.config['intermediate_codec']} -ar {self.config['sample_rate']} "  # Consistent audio, encoded once below
                     f"-pix_fmt yuv420p "  # Standard pixel format
                     f"-y {normalized_path}"
                 )
@@ -124,7 +135,7 @@ class AsyncVideoConcatenator(VideoConcatenator):
                 f"-c:v libx264 -preset medium -crf 22 "
                 f"-r 30 -g 30 -keyint_min 30 "  # Consistent frame rate and keyframes
                 f"-vsync cfr "  # Constant frame rate output
-                f"-c:a aac -b:a 192k -ar 48000 "  # Consistent audio
+                f"-c:a aac -b:a {self.config['final_bitrate']} -ar {self.config['sample_rate']} "  # Consistent audio
                 f"-movflags +faststart "  # Optimize for streaming
                 f"-y {final_output_path}"
             )
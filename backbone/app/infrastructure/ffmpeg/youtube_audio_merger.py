@@ -5,12 +5,16 @@ This module provides functionality for downloading audio from YouTube and mergin
 """
 
 import os
-import subprocess
+import shlex
+import shutil
+import asyncio
 import tempfile
 import logging
-from typing import Optional
+from typing import Dict, Any, Optional
 
 from app.core.ffmpeg.interfaces import YouTubeAudioMerger, FFmpegCommandExecutor
+from app.core.audio.frame_scanner import scan_audio_duration
+from app.infrastructure.storage.music_cache import MusicBedCache, MUSIC_CACHE_DIR, get_music_cache, track_key
 
 logger = logging.getLogger(__name__)
 
@@ -20,14 +24,32 @@ class AsyncYouTubeAudioMerger(YouTubeAudioMerger):
     Downloads audio from YouTube and merges it with videos using FFmpeg.
     """
     
-    def __init__(self, command_executor: FFmpegCommandExecutor):
+    def __init__(self, command_executor: FFmpegCommandExecutor, config: Optional[Dict[str, Any]] = None):
         """
         Initialize the merger.
         
         Args:
             command_executor: Command executor for running FFmpeg commands
+            config: Music cache options
         """
         self.command_executor = command_executor
+        self.config = {
+            "cache": True,                  # Reuse downloaded sources and derived beds across renders
+            "cache_dir": MUSIC_CACHE_DIR,
+            "cache_max_mb": 2048,
+            "bed_bucket_seconds": 30,       # Beds are built to a multiple of this length
+            "bed_sample_rate": 48000,       # Sample rate of beds and of the mix (the render's planned rate)
+            "final_bitrate": "192k",        # Bitrate of the mix's AAC encode
+            "ducking": False,               # Lower the music under narration (sidechain compression)
+            "ducking_threshold": 0.03,
+            "ducking_ratio": 6
+        }
+        if config:
+            self.config.update({key: value for key, value in config.items() if value is not None})
+        
+        self.music_cache = get_music_cache(
+            self.config["cache_dir"], int(self.config["cache_max_mb"]) * 1024 * 1024
+        ) if self.config["cache"] else None
     
     async def _download_youtube_audio(self, youtube_url: str, output_path: str) -> str:
         """
@@ -66,9 +88,29 @@ class AsyncYouTubeAudioMerger(YouTubeAudioMerger):
             logger.debug(f"Traceback: {traceback.format_exc()}")
             raise
     
+    async def _get_media_info(self, file_path: str) -> Dict[str, Any]:
+        """
+        Get the duration of a media file and whether it has an audio stream.
+        
+        Args:
+            file_path: Path to the media file
+            
+        Returns:
+            Dict[str, Any]: duration (seconds, 0.0 if unknown) and has_audio
+        """
+        try:
+            info = await self.command_executor.get_video_info(file_path)
+            duration = float(info.get("format", {}).get("duration") or 0.0)
+            has_audio = any(stream.get("codec_type") == "audio" for stream in info.get("streams", []))
+            logger.debug(f"Media duration: {duration:.2f} seconds for {file_path} (audio: {has_audio})")
+            return {"duration": duration, "has_audio": has_audio}
+        except Exception as e:
+            logger.error(f"Failed to probe media file {file_path}: {e}")
+            return {"duration": 0.0, "has_audio": True}
+    
     async def _get_media_duration(self, file_path: str) -> float:
         """
-        Get the duration of a media file using ffprobe.
+        Get the duration of a media file.
         
         Args:
             file_path: Path to the media file
@@ -76,78 +118,130 @@ class AsyncYouTubeAudioMerger(YouTubeAudioMerger):
         Returns:
             float: Duration in seconds
         """
-        logger.debug(f"Getting duration for media file: {file_path}")
+        return (await self._get_media_info(file_path))["duration"]
+    
+    async def _run_ffmpeg(self, cmd_parts) -> None:
+        """Run an FFmpeg command built from a list of arguments."""
+        await self.command_executor.execute(" ".join(shlex.quote(str(part)) for part in cmd_parts))
+    
+    async def _get_source(self, music_cache: MusicBedCache, youtube_url: str) -> str:
+        """
+        Get the downloaded audio of a track, downloading it only on a cache miss.
         
-        try:
-            # Create a temporary directory for the script
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Create a temporary file for the output
-                duration_output = os.path.join(temp_dir, "duration.txt")
-                
-                # Create a script file for the ffprobe command
-                script_file = os.path.join(temp_dir, "ffprobe_duration.sh")
-                with open(script_file, 'w') as f:
-                    f.write("#!/bin/bash\n")
-                    f.write(f'ffprobe -v error -show_entries format=duration -of default=noprint_wrappers=1:nokey=1 "{file_path}" > "{duration_output}"\n')
-                
-                # Make the script executable
-                os.chmod(script_file, 0o755)
-                
-                # Execute the script
-                await self.command_executor.execute(script_file)
-                
-                # Read the duration from the output file
-                with open(duration_output, 'r') as f:
-                    duration_str = f.read().strip()
-                    duration = float(duration_str) if duration_str else 0.0
+        Args:
+            music_cache: Music cache
+            youtube_url: YouTube URL of the track
             
-            logger.debug(f"Media duration: {duration:.2f} seconds for {file_path}")
-            return duration
-        except Exception as e:
-            logger.error(f"Failed to get media duration for {file_path}: {e}")
-            import traceback
-            logger.debug(f"Traceback: {traceback.format_exc()}")
-            return 0.0
+        Returns:
+            str: Path to the cached mp3
+        """
+        source_path = music_cache.source_path(youtube_url)
+        async with music_cache.lock(source_path):
+            cached = music_cache.lookup(source_path, "source")
+            if cached:
+                logger.info(f"  - Music source cache hit: {cached}")
+                return cached
+            
+            # Download next to the cache entry and rename it into place, so an
+            # interrupted download never leaves a partial source behind
+            download_dir = tempfile.mkdtemp(dir=music_cache.sources_dir, prefix=f".{track_key(youtube_url)}.")
+            try:
+                downloaded = await self._download_youtube_audio(youtube_url, os.path.join(download_dir, "audio"))
+                os.replace(downloaded, source_path)
+            finally:
+                shutil.rmtree(download_dir, ignore_errors=True)
+        
+        await asyncio.to_thread(music_cache.evict)
+        return source_path
     
-    async def _trim_audio(self, input_audio: str, trim_start: float, output_audio: str) -> str:
+    async def _get_bed(self, music_cache: MusicBedCache, youtube_url: str, source_path: str,
+                       trim_audio: float, duration: float) -> str:
         """
-        Trim the beginning of an audio file.
+        Get a music bed: the source trimmed, looped to cover the duration (rounded up to a
+        bucket) and resampled. Beds are built once and reused by every render that needs them.
         
         Args:
-            input_audio: Path to the input audio file
-            trim_start: Start time to trim from in seconds
-            output_audio: Path to save the trimmed audio
+            music_cache: Music cache
+            youtube_url: YouTube URL of the track
+            source_path: Path to the track's source audio
+            trim_audio: Seconds to trim from the start of the source
+            duration: Seconds of music needed
             
         Returns:
-            str: Path to the trimmed audio
+            str: Path to the cached bed
         """
-        logger.info(f"Trimming audio file {input_audio}")
-        logger.info(f"  - Removing first {trim_start:.2f} seconds")
-        logger.info(f"  - Output will be saved to {output_audio}")
+        sample_rate = int(self.config["bed_sample_rate"])
+        length = MusicBedCache.bucket_length(duration, float(self.config["bed_bucket_seconds"]))
+        bed_path = music_cache.bed_path(youtube_url, trim_audio, length, sample_rate)
         
-        try:
-            # Create a temporary directory for the script
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Create a script file for the FFmpeg command
-                script_file = os.path.join(temp_dir, "ffmpeg_trim.sh")
-                with open(script_file, 'w') as f:
-                    f.write("#!/bin/bash\n")
-                    f.write(f'ffmpeg -i "{input_audio}" -ss {trim_start} -c:a copy "{output_audio}"\n')
-                
-                # Make the script executable
-                os.chmod(script_file, 0o755)
-                
-                # Execute the script
-                await self.command_executor.execute(script_file)
-                
-            logger.info(f"Audio trimming complete: {output_audio}")
-            return output_audio
-        except Exception as e:
-            logger.error(f"Audio trimming failed: {e}")
-            logger.warning(f"Using original untrimmed audio: {input_audio}")
-            import traceback
-            logger.debug(f"Traceback: {traceback.format_exc()}")
-            return input_audio  # Return original if trim fails
+        async with music_cache.lock(bed_path):
+            cached = music_cache.lookup(bed_path, "bed")
+            if cached:
+                logger.info(f"  - Music bed cache hit: {cached}")
+                return cached
+            
+            scan = await asyncio.to_thread(scan_audio_duration, source_path)
+            source_duration = scan["duration_us"] / 1_000_000 if scan else await self._get_media_duration(source_path)
+            if trim_audio >= source_duration:
+                raise ValueError(f"trim_audio ({trim_audio}s) is not shorter than the track ({source_duration:.2f}s)")
+            
+            logger.info(f"  - Building {length}s music bed at {sample_rate} Hz from {source_duration:.2f}s source")
+            bed_dir = os.path.dirname(bed_path)
+            base = f".{os.path.basename(bed_path)}.{os.getpid()}"
+            trimmed_path = os.path.join(bed_dir, f"{base}.trim.flac")
+            temp_path = os.path.join(bed_dir, f"{base}.part.flac")
+            try:
+                # Trim and resample once, then loop the trimmed audio to the bed length
+                await self._run_ffmpeg([
+                    "ffmpeg", "-i", source_path, "-ss", f"{trim_audio:.3f}",
+                    "-ar", sample_rate, "-ac", 2, "-c:a", "flac", "-y", trimmed_path
+                ])
+                await self._run_ffmpeg([
+                    "ffmpeg", "-stream_loop", -1, "-i", trimmed_path, "-t", length,
+                    "-c:a", "flac", "-y", temp_path
+                ])
+                os.replace(temp_path, bed_path)
+            finally:
+                for path in (trimmed_path, temp_path):
+                    if os.path.exists(path):
+                        os.unlink(path)
+        
+        await asyncio.to_thread(music_cache.evict)
+        return bed_path
+    
+    def _mix_filter(self, start_time: float, duration: float, volume: float, has_audio: bool,
+                    voice: str = "0:a") -> str:
+        """
+        Build the filter graph mixing the music bed (input 1) under the voice (the video's
+        audio, input 0, unless given). The bed is cut to the remaining length and delayed to
+        the start time; with ducking enabled, the voice also drives a sidechain compressor
+        on the music.
+        
+        Args:
+            start_time: Seconds into the video where the music starts
+            duration: Seconds of music after the start time
+            volume: Music volume (0.0-1.0)
+            has_audio: Whether there is a voice to mix with
+            voice: Stream specifier of the voice
+            
+        Returns:
+            str: The filter graph, with the mixed audio labelled [a]
+        """
+        delay_ms = int(round(start_time * 1000))
+        music = f"[1:a]atrim=0:{duration:.3f},asetpts=PTS-STARTPTS,adelay={delay_ms}:all=1,volume={volume}"
+        
+        if not has_audio:
+            return f"{music}[a]"
+        
+        if self.config["ducking"]:
+            return (
+                f"{music}[music];"
+                f"[{voice}]asplit=2[voice][key];"
+                f"[music][key]sidechaincompress=threshold={self.config['ducking_threshold']}:"
+                f"ratio={self.config['ducking_ratio']}:attack=20:release=300[ducked];"
+                f"[voice][ducked]amix=inputs=2:duration=first[a]"
+            )
+        return f"{music}[music];[{voice}][music]amix=inputs=2:duration=first[a]"
     
     async def process(self, 
                      video_file: str, 
@@ -155,7 +249,8 @@ class AsyncYouTubeAudioMerger(YouTubeAudioMerger):
                      output_file: str, 
                      start_time: float = 0.0, 
                      trim_audio: float = 0.0, 
-                     volume: float = 1.0) -> str:
+                     volume: float = 1.0,
+                     voice_file: Optional[str] = None) -> str:
         """
         Download audio from YouTube and merge it with a video.
         
@@ -166,6 +261,8 @@ class AsyncYouTubeAudioMerger(YouTubeAudioMerger):
             start_time: Start time in seconds to begin the audio in the video
             trim_audio: Trim the beginning of the YouTube audio by this many seconds
             volume: Volume of the YouTube audio (0.0-1.0)
+            voice_file: Uncompressed narration to mix with instead of the video's audio
+                        (optional), so the mix is the narration's only encode
             
         Returns:
             str: Path to the merged file
@@ -187,154 +284,56 @@ class AsyncYouTubeAudioMerger(YouTubeAudioMerger):
                     logger.warning(f"Invalid volume value {volume}, using 1.0")
                     volume = 1.0
                 
-                # STEP 1: Download the YouTube audio
-                logger.info(f"STEP 1: DOWNLOADING YOUTUBE AUDIO from {youtube_url}")
-                temp_audio_path = os.path.join(temp_dir, "audio")
-                audio_path = await self._download_youtube_audio(youtube_url, temp_audio_path)
+                music_cache = self.music_cache or MusicBedCache(os.path.join(temp_dir, "music"))
                 
-                # STEP 2: Trim the audio if needed
-                if trim_audio > 0:
-                    logger.info(f"STEP 2: TRIMMING AUDIO by {trim_audio} seconds")
-                    trimmed_audio_path = os.path.join(temp_dir, "trimmed_audio.mp3")
-                    audio_path = await self._trim_audio(audio_path, trim_audio, trimmed_audio_path)
-                else:
-                    logger.info(f"STEP 2: NO TRIMMING NEEDED (trim_audio={trim_audio})")
+                # STEP 1: Get the source audio (downloaded once per track)
+                logger.info(f"STEP 1: GETTING MUSIC SOURCE for {youtube_url}")
+                audio_path = await self._get_source(music_cache, youtube_url)
                 
-                # STEP 3: Get durations and prepare for merging
-                logger.info(f"STEP 3: ANALYZING MEDIA DURATIONS")
-                video_duration = await self._get_media_duration(video_file)
-                audio_duration = await self._get_media_duration(audio_path)
+                # STEP 2: Get the video duration
+                logger.info(f"STEP 2: ANALYZING VIDEO DURATION")
+                video_info = await self._get_media_info(video_file)
+                video_duration = video_info["duration"]
+                if video_duration <= 0:
+                    raise ValueError(f"Could not determine the duration of {video_file}")
                 
                 # Validate start time
                 if start_time >= video_duration:
                     logger.warning(f"Start time ({start_time}s) is greater than video duration ({video_duration}s). Setting to 0.")
                     start_time = 0
                 
-                # Calculate how many times to loop the audio to cover the video
                 remaining_video_duration = video_duration - float(start_time)
-                loop_count = max(1, int(remaining_video_duration / audio_duration) + 1)
-                
                 logger.info(f"  - Video duration: {video_duration:.2f} seconds")
-                logger.info(f"  - Audio duration: {audio_duration:.2f} seconds")
                 logger.info(f"  - Starting audio at: {start_time:.2f} seconds into the video")
                 logger.info(f"  - YouTube audio volume: {volume}")
-                logger.info(f"  - Looping audio {loop_count} times to cover the video")
-                
-                # STEP 4: Prepare concatenated audio
-                logger.info(f"STEP 4: PREPARING CONCATENATED AUDIO")
-                # Create a file with the concatenation instructions
-                concat_file = os.path.join(temp_dir, "concat.txt")
-                with open(concat_file, 'w') as f:
-                    for i in range(loop_count):
-                        f.write(f"file '{audio_path}'\n")
-                
-                # Path to the temporary concatenated audio
-                concat_audio = os.path.join(temp_dir, "concat_audio.mp3")
-                
-                # Concatenate the audio files using a script approach
-                try:
-                    # First attempt: Try the script method
-                    try:
-                        # Create a temporary script for the concatenation
-                        concat_script = os.path.join(temp_dir, "ffmpeg_concat.sh")
-                        with open(concat_script, 'w') as f:
-                            f.write("#!/bin/bash\n")
-                            f.write(f'ffmpeg -f concat -safe 0 -i "{concat_file}" -c copy "{concat_audio}"\n')
-                        
-                        # Make the script executable
-                        os.chmod(concat_script, 0o755)
-                        
-                        logger.info(f"  - Created FFmpeg concat script: {concat_script}")
-                        logger.info(f"  - Concatenating audio {loop_count} times")
-                        
-                        # Execute the script
-                        await self.command_executor.execute(concat_script)
-                    
-                    except Exception as script_error:
-                        # Second attempt: Fallback to direct subprocess method like in the example code
-                        logger.warning(f"Concat script method failed with error: {script_error}. Trying direct subprocess method...")
-                        
-                        # Build the command as a list like in the example code
-                        cmd = [
-                            'ffmpeg',
-                            '-f', 'concat',
-                            '-safe', '0',
-                            '-i', concat_file,
-                            '-c', 'copy',
-                            concat_audio
-                        ]
-                        
-                        logger.info(f"  - Using direct subprocess with command: {cmd}")
-                        
-                        # Execute using direct subprocess
-                        import subprocess
-                        subprocess.run(cmd, check=True)
-                        logger.info(f"  - Direct subprocess method successful for concatenation")
-                
-                except Exception as e:
-                    logger.error(f"Both script and direct subprocess methods failed for concatenation: {e}")
-                    raise
                 
-                # STEP 5: Merge the video with the concatenated audio
-                logger.info(f"STEP 5: MERGING VIDEO WITH YOUTUBE AUDIO")
+                # STEP 3: Get the trimmed, looped bed covering the video (built once per bucket)
+                logger.info(f"STEP 3: GETTING MUSIC BED (trim_audio={trim_audio}s, {remaining_video_duration:.2f}s needed)")
+                bed_audio = await self._get_bed(music_cache, youtube_url, audio_path, max(0.0, float(trim_audio)), remaining_video_duration)
                 
-                try:
-                    # First attempt: Try the script method
-                    try:
-                        # Create a temporary script file with the FFmpeg command
-                        script_file = os.path.join(temp_dir, "ffmpeg_merge.sh")
-                        with open(script_file, 'w') as f:
-                            f.write("#!/bin/bash\n")
-                            f.write(f'ffmpeg -i "{video_file}" -i "{concat_audio}" \\\n')
-                            # The key fix here is using proper escaping for the between function
-                            f.write(f'  -filter_complex "[1:a]volume=0:enable=\'between(t,0,{start_time})\',volume={volume}[youtube_audio]; [0:a][youtube_audio]amix=inputs=2:duration=first[a]" \\\n')
-                            f.write(f'  -map 0:v -map "[a]" -c:v copy "{output_file}"\n')
-                        
-                        # Make the script executable
-                        os.chmod(script_file, 0o755)
-                        
-                        logger.info(f"  - Created FFmpeg merge script: {script_file}")
-                        
-                        # For debugging, dump the script content to logs
-                        with open(script_file, 'r') as f:
-                            script_content = f.read()
-                            logger.info(f"  - Script content:\n{script_content}")
-                        
-                        # Execute the script directly
-                        merge_cmd = script_file
-                        await self.command_executor.execute(merge_cmd)
-                    
-                    except Exception as script_error:
-                        # Second attempt: Fallback to direct subprocess method like in the example code
-                        logger.warning(f"Script method failed with error: {script_error}. Trying direct subprocess method...")
-                        
-                        # Create the filter complex string with proper escaping
-                        filter_complex = f"[1:a]volume=0:enable='between(t,0,{start_time})',volume={volume}[youtube_audio]; [0:a][youtube_audio]amix=inputs=2:duration=first[a]"
-                        
-                        # Build the command as a list like in the example code
-                        cmd = [
-                            'ffmpeg',
-                            '-i', video_file,
-                            '-i', concat_audio,
-                            '-filter_complex', filter_complex,
-                            '-map', '0:v',
-                            '-map', '[a]',
-                            '-c:v', 'copy',
-                            output_file
-                        ]
-                        
-                        logger.info(f"  - Using direct subprocess with command: {cmd}")
-                        
-                        # Execute using direct subprocess
-                        import subprocess
-                        subprocess.run(cmd, check=True)
-                        logger.info(f"  - Direct subprocess method successful")
+                # STEP 4: Mix the bed under the video's audio in one FFmpeg pass, copying the video stream
+                logger.info(f"STEP 4: MERGING VIDEO WITH YOUTUBE AUDIO")
+                inputs = ["-i", video_file, "-i", bed_audio]
+                if voice_file:
+                    inputs += ["-i", voice_file]
+                filter_complex = self._mix_filter(
+                    float(start_time), remaining_video_duration, volume,
+                    bool(voice_file) or video_info["has_audio"], "2:a" if voice_file else "0:a"
+                )
+                logger.info(f"  - Filter graph: {filter_complex}")
                 
-                except Exception as e:
-                    logger.error(f"Both script and direct subprocess methods failed: {e}")
-                    raise
+                temp_output = os.path.join(temp_dir, f"merged{os.path.splitext(output_file)[1] or '.mp4'}")
+                await self._run_ffmpeg([
+                    "ffmpeg", *inputs,
+                    "-filter_complex", filter_complex,
+                    "-map", "0:v", "-map", "[a]",
+                    "-c:v", "copy",
+                    "-c:a", "aac", "-b:a", self.config["final_bitrate"], "-ar", int(self.config["bed_sample_rate"]), "-ac", 2,
+                    "-y", temp_output
+                ])
+                shutil.move(temp_output, output_file)
                 
-                logger.info(f"STEP 6: SUCCESSFULLY COMPLETED YOUTUBE AUDIO MERGING")
+                logger.info(f"STEP 5: SUCCESSFULLY COMPLETED YOUTUBE AUDIO MERGING")
                 logger.info(f"  - Final output: {output_file}")
                 logger.info(f"========== YOUTUBE AUDIO MERGER COMPLETE ==========")
                 return output_file
@@ -0,0 +1,8 @@
+from app.infrastructure.storage.file_hash import compute_content_hash
+from app.infrastructure.storage.clip_index import ClipIndex
+from app.infrastructure.storage.tts_cache import TTSCache, get_tts_cache
+from app.infrastructure.storage.job_manifest import JobManifest
+from app.infrastructure.storage.music_cache import MusicBedCache, get_music_cache
+from app.infrastructure.storage.llm_cache import LLMResponseCache, get_llm_cache
+
+__all__ = ['compute_content_hash', 'ClipIndex', 'TTSCache', 'get_tts_cache', 'JobManifest', 'MusicBedCache', 'get_music_cache', 'LLMResponseCache', 'get_llm_cache']
@@ -0,0 +1,161 @@
+"""
+Clip Index
+
+This module provides the on-disk catalog of offline analysis results for a clip library.
+"""
+
+import os
+import json
+import logging
+import tempfile
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+CLIP_INDEX_FILENAME = "clip_index.json"
+
+class ClipIndex:
+    """
+    JSON-backed catalog of per-clip analysis results for one genre folder.
+    
+    The index lives next to the clips (data/media/videos/<genre>/clip_index.json)
+    and maps each clip filename to its analysis entry. Entries carry the content
+    hash of the clip they were computed from so stale entries can be detected.
+    """
+    
+    def __init__(self, videos_dir: str):
+        """
+        Initialize the clip index.
+        
+        Args:
+            videos_dir: Directory containing the clips of one genre
+        """
+        self.videos_dir = videos_dir
+        self.index_path = os.path.join(videos_dir, CLIP_INDEX_FILENAME)
+        self.clips = self._load()
+    
+    @classmethod
+    def for_genre(cls, genre: str, base_dir: str = "data/media/videos") -> "ClipIndex":
+        """
+        Get the clip index for a genre.
+        
+        Args:
+            genre: Genre folder name
+            base_dir: Base directory of the clip library
+            
+        Returns:
+            ClipIndex: The clip index for the genre
+        """
+        return cls(os.path.join(base_dir, genre))
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the index from disk.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Mapping of clip filename to analysis entry
+        """
+        if not os.path.exists(self.index_path):
+            return {}
+        
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+            return data.get("clips", {})
+        except Exception as e:
+            logger.error(f"Error loading clip index {self.index_path}: {e}")
+            return {}
+    
+    def save(self) -> None:
+        """Write the index to disk atomically."""
+        os.makedirs(self.videos_dir, exist_ok=True)
+        
+        fd, temp_path = tempfile.mkstemp(dir=self.videos_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": 1, "clips": self.clips}, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.index_path)
+            logger.info(f"Clip index saved to {self.index_path} ({len(self.clips)} clips)")
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+    
+    def get(self, clip: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the analysis entry for a clip.
+        
+        Args:
+            clip: Clip filename
+            
+        Returns:
+            Optional[Dict[str, Any]]: The entry, or None if the clip is not indexed
+        """
+        return self.clips.get(os.path.basename(clip))
+    
+    def set(self, clip: str, entry: Dict[str, Any]) -> None:
+        """
+        Store the analysis entry for a clip.
+        
+        Args:
+            clip: Clip filename
+            entry: Analysis entry
+        """
+        self.clips[os.path.basename(clip)] = entry
+    
+    def is_current(self, clip: str, content_hash: str) -> bool:
+        """
+        Check whether a clip has an entry computed from the given content.
+        
+        Args:
+            clip: Clip filename
+            content_hash: Content hash of the clip on disk
+            
+        Returns:
+            bool: True if the entry exists and matches the content hash
+        """
+        entry = self.get(clip)
+        return bool(entry) and entry.get("content_hash") == content_hash
+    
+    def prune(self, existing_clips) -> None:
+        """
+        Remove entries for clips that no longer exist.
+        
+        Args:
+            existing_clips: Iterable of clip filenames present in the library
+        """
+        existing = {os.path.basename(c) for c in existing_clips}
+        for clip in list(self.clips):
+            if clip not in existing:
+                del self.clips[clip]
+
+    
+    def representatives(self, clips: List[str]) -> List[str]:
+        """
+        Reduce a clip catalog to one representative per near-duplicate cluster.
+        Clips without a cluster ID (not yet deduplicated) are kept as-is.
+        
+        Args:
+            clips: Clip filenames, in catalog order
+            
+        Returns:
+            List[str]: The catalog with cluster duplicates removed
+        """
+        representatives = []
+        seen_clusters = {}
+        
+        for clip in clips:
+            entry = self.get(clip) or {}
+            cluster_id = entry.get("cluster_id")
+            if cluster_id is None:
+                representatives.append(clip)
+                continue
+            
+            if cluster_id not in seen_clusters:
+                seen_clusters[cluster_id] = len(representatives)
+                representatives.append(clip)
+            elif entry.get("cluster_representative"):
+                # Prefer the designated representative over the first member seen
+                representatives[seen_clusters[cluster_id]] = clip
+        
+        return representatives
\ No newline at end of file
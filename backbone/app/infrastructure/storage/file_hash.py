@@ -0,0 +1,25 @@
+"""
+File Hashing
+
+This module provides helpers for computing content hashes of media files.
+"""
+
+import hashlib
+
+def compute_content_hash(file_path: str, algorithm: str = "sha256", chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the content hash of a file without loading it into memory.
+    
+    Args:
+        file_path: Path to the file
+        algorithm: Hash algorithm name supported by hashlib
+        chunk_size: Number of bytes to read per chunk
+        
+    Returns:
+        str: Hex digest of the file contents
+    """
+    digest = hashlib.new(algorithm)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,109 @@
+"""
+Job Manifest
+
+This module provides the on-disk manifest of a processing job: facts about the job's
+generated files (such as exact narration durations) that later steps read instead of
+probing the files again.
+"""
+
+import os
+import json
+import logging
+import tempfile
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_MANIFEST_FILENAME = "manifest.json"
+
+class JobManifest:
+    """
+    JSON-backed manifest of the files in a job directory.
+
+    The manifest lives in the job directory (data/current/manifest.json) and maps each
+    audio filename to its entry. Entries carry the size and modification time of the
+    file they describe, so an entry is ignored once the file is regenerated.
+    """
+
+    def __init__(self, job_dir: str = "data/current"):
+        """
+        Initialize the manifest.
+
+        Args:
+            job_dir: Job directory
+        """
+        self.job_dir = job_dir
+        self.manifest_path = os.path.join(job_dir, JOB_MANIFEST_FILENAME)
+        self.audio = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the manifest from disk.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Mapping of audio filename to entry
+        """
+        if not os.path.exists(self.manifest_path):
+            return {}
+
+        try:
+            with open(self.manifest_path, "r") as f:
+                data = json.load(f)
+            return data.get("audio", {})
+        except Exception as e:
+            logger.error(f"Error loading job manifest {self.manifest_path}: {e}")
+            return {}
+
+    def save(self) -> None:
+        """Write the manifest to disk atomically."""
+        os.makedirs(self.job_dir, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=self.job_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": 1, "audio": self.audio}, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.manifest_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    @staticmethod
+    def _file_stamp(file_path: str) -> Dict[str, int]:
+        stat = os.stat(file_path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def get_audio(self, audio_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the entry of an audio file, if it describes the file as it is on disk.
+
+        Args:
+            audio_path: Path to the audio file
+
+        Returns:
+            Optional[Dict[str, Any]]: The entry, or None if missing or stale
+        """
+        entry = self.audio.get(os.path.basename(audio_path))
+        if not entry or not os.path.exists(audio_path):
+            return None
+
+        stamp = self._file_stamp(audio_path)
+        if entry.get("size") != stamp["size"] or entry.get("mtime_ns") != stamp["mtime_ns"]:
+            return None
+        return entry
+
+    def set_audio(self, audio_path: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record the entry of an audio file, stamped with the file's size and modification time.
+
+        Args:
+            audio_path: Path to the audio file
+            entry: Facts about the file
+
+        Returns:
+            Dict[str, Any]: The stored entry
+        """
+        stored = dict(entry)
+        stored.update(self._file_stamp(audio_path))
+        self.audio[os.path.basename(audio_path)] = stored
+        return stored
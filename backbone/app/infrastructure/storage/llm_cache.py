@@ -0,0 +1,282 @@
+"""
+LLM Response Cache
+
+This module provides a disk cache of LLM responses, shared across requests. Entries are
+keyed by the model, every request parameter that affects the output (temperature,
+max_tokens, thinking budget) and the full prompt, including earlier turns, and expire
+after a TTL, so re-submitting the same request within the TTL skips the LLM. Expired
+entries are swept periodically as responses are stored, and the oldest entries are
+evicted when the cache outgrows its size or entry limit.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_DIR = "data/cache/llm"
+
+_caches: Dict[str, "LLMResponseCache"] = {}
+
+def get_llm_cache(cache_dir: str = LLM_CACHE_DIR, ttl_seconds: float = 24 * 3600,
+                  max_size_bytes: int = 256 * 1024 ** 2, max_entries: int = 10000) -> "LLMResponseCache":
+    """
+    Get the shared cache for a directory, so metrics accumulate across requests.
+
+    Args:
+        cache_dir: Cache directory
+        ttl_seconds: Age after which entries are no longer used
+        max_size_bytes: Size limit before the oldest entries are evicted
+        max_entries: Entry limit before the oldest entries are evicted
+
+    Returns:
+        LLMResponseCache: The cache for the directory
+    """
+    key = os.path.abspath(cache_dir)
+    if key not in _caches:
+        _caches[key] = LLMResponseCache(cache_dir, ttl_seconds, max_size_bytes, max_entries)
+    _caches[key].ttl_seconds = ttl_seconds
+    _caches[key].max_size_bytes = max_size_bytes
+    _caches[key].max_entries = max_entries
+    return _caches[key]
+
+class LLMResponseCache:
+    """
+    Disk store of LLM responses with a time-to-live and size-based eviction.
+    """
+
+    def __init__(self, cache_dir: str = LLM_CACHE_DIR, ttl_seconds: float = 24 * 3600,
+                 max_size_bytes: int = 256 * 1024 ** 2, max_entries: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Cache directory
+            ttl_seconds: Age after which entries are no longer used
+            max_size_bytes: Size limit before the oldest entries are evicted
+            max_entries: Entry limit before the oldest entries are evicted
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = max_size_bytes
+        self.max_entries = max_entries
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.evictions = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Running entry count and size, scanned from disk once and then kept up to date, so
+        # stores only walk the directory to sweep (at most every sweep interval) or evict
+        self._lock = threading.Lock()
+        self._entries, self._size_bytes = self._scan()
+        self._last_sweep = 0.0
+
+    @staticmethod
+    def make_key(params: Dict[str, Any], prompt: str, history: Optional[List[Dict[str, str]]] = None,
+                 prefix: str = "") -> str:
+        """
+        Build the cache key of a request.
+
+        Args:
+            params: Provider, model and request parameters
+            prompt: Merged prompt (after the prefix)
+            history: Earlier turns of the conversation (optional)
+            prefix: Stable start of the conversation's first user message (optional)
+
+        Returns:
+            str: Hex digest identifying the response
+        """
+        payload = {"params": params, "prefix": prefix, "history": history or [], "prompt": prompt}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        """
+        Get the cache path of an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            str: Path of the cached response
+        """
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a response, recording a hit or miss. Expired entries are removed.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[Dict[str, Any]]: The cached entry ("text", "turn", "created_at"), or None
+        """
+        path = self.path_for(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cached LLM response {path}: {e}")
+            self.misses += 1
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self.expired += 1
+            self.misses += 1
+            self._remove(path)
+            return None
+
+        self.hits += 1
+        return entry
+
+    def store(self, key: str, text: str, turn: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Cache a response.
+
+        Args:
+            key: Cache key
+            text: Response text
+            turn: Stop reason and token usage of the response (optional)
+
+        Returns:
+            str: Path of the cached response
+        """
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        replaced_size = os.path.getsize(path) if os.path.exists(path) else None
+
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"text": text, "turn": turn or {}, "created_at": time.time()}, f)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        self.stores += 1
+        with self._lock:
+            self._size_bytes += os.path.getsize(path) - (replaced_size or 0)
+            self._entries += 0 if replaced_size is not None else 1
+            over_limit = self._size_bytes > self.max_size_bytes or self._entries > self.max_entries
+            sweep_due = time.monotonic() - self._last_sweep >= self.sweep_interval
+
+        if over_limit or sweep_due:
+            self.sweep()
+        return path
+
+    @property
+    def sweep_interval(self) -> float:
+        """Seconds between sweeps for expired entries: the TTL, at most an hour."""
+        return min(self.ttl_seconds, 3600.0)
+
+    def sweep(self) -> int:
+        """
+        Remove expired entries, then the oldest entries until the cache is back under its
+        low-water marks (90% of the size and entry limits).
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            self._last_sweep = time.monotonic()
+            cutoff = time.time() - self.ttl_seconds
+
+            # Entries are written once, so their modification time is their creation time
+            entries = []
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if name.endswith(".json"):
+                        path = os.path.join(root, name)
+                        stat = os.stat(path)
+                        entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+
+            total_size = sum(size for _, size, _ in entries)
+            count = len(entries)
+            expired = 0
+            evicted = 0
+            over_limit = total_size > self.max_size_bytes or count > self.max_entries
+            low_size, low_entries = int(self.max_size_bytes * 0.9), int(self.max_entries * 0.9)
+
+            for mtime, size, path in entries:
+                if mtime < cutoff:
+                    expired += 1
+                elif over_limit and (total_size > low_size or count > low_entries):
+                    evicted += 1
+                else:
+                    break
+                os.unlink(path)
+                total_size -= size
+                count -= 1
+
+            self._entries, self._size_bytes = count, total_size
+
+        self.expired += expired
+        self.evictions += evicted
+        if expired or evicted:
+            logger.info(f"Removed {expired} expired and evicted {evicted} LLM cache entries from {self.cache_dir}")
+        return expired + evicted
+
+    def _remove(self, path: str) -> None:
+        """Remove an entry, keeping the running size up to date."""
+        try:
+            size = os.path.getsize(path)
+            os.unlink(path)
+        except OSError:
+            return
+        with self._lock:
+            self._entries -= 1
+            self._size_bytes -= size
+
+    def _scan(self) -> Tuple[int, int]:
+        """Count the entries on disk and their total size."""
+        entries = 0
+        size_bytes = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    entries += 1
+                    size_bytes += os.path.getsize(os.path.join(root, name))
+        return entries, size_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict[str, Any]: Hit/miss counters, hit rate, entry count and size, and the limits
+        """
+        with self._lock:
+            entries, size_bytes = self._entries, self._size_bytes
+
+        lookups = self.hits + self.misses
+        return {
+            "cache_dir": self.cache_dir,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expired": self.expired,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size_bytes,
+            "max_size_bytes": self.max_size_bytes,
+            "max_entries": self.max_entries
+        }
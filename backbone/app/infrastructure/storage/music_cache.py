@@ -0,0 +1,211 @@
+"""
+Music Bed Cache
+
+This module provides a cache of background music: downloaded sources keyed by track, and
+derived beds (trimmed, looped to a length bucket and resampled) keyed by the source and
+the parameters that shaped them. Repeat renders with the same music skip the download and
+the trim/loop work entirely.
+"""
+
+import os
+import re
+import math
+import asyncio
+import hashlib
+import logging
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
+
+MUSIC_CACHE_DIR = "data/cache/music"
+
+_caches: Dict[str, "MusicBedCache"] = {}
+
+def get_music_cache(cache_dir: str = MUSIC_CACHE_DIR, max_size_bytes: int = 2 * 1024 ** 3) -> "MusicBedCache":
+    """
+    Get the shared music cache for a directory, so locks and metrics are shared across renders.
+
+    Args:
+        cache_dir: Cache directory
+        max_size_bytes: Size limit before least recently used beds and sources are evicted
+
+    Returns:
+        MusicBedCache: The cache for the directory
+    """
+    key = os.path.abspath(cache_dir)
+    if key not in _caches:
+        _caches[key] = MusicBedCache(cache_dir, max_size_bytes)
+    _caches[key].max_size_bytes = max_size_bytes
+    return _caches[key]
+
+def track_key(url: str) -> str:
+    """
+    Get the cache key of a music track: the YouTube video ID when the URL has one
+    (so watch?v= and youtu.be links share an entry), otherwise a hash of the URL.
+
+    Args:
+        url: Track URL
+
+    Returns:
+        str: Filesystem-safe track key
+    """
+    parsed = urlparse(url)
+    video_id = None
+    if parsed.hostname and parsed.hostname.endswith("youtu.be"):
+        video_id = parsed.path.lstrip("/").split("/")[0]
+    elif parsed.hostname and "youtube" in parsed.hostname:
+        video_id = parse_qs(parsed.query).get("v", [None])[0]
+
+    if video_id and re.fullmatch(r"[A-Za-z0-9_-]+", video_id):
+        return f"yt_{video_id}"
+    return f"url_{hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]}"
+
+class MusicBedCache:
+    """
+    Cache of music sources and derived beds with size-based LRU eviction.
+    """
+
+    def __init__(self, cache_dir: str = MUSIC_CACHE_DIR, max_size_bytes: int = 2 * 1024 ** 3):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Cache directory
+            max_size_bytes: Size limit before least recently used files are evicted
+        """
+        self.cache_dir = cache_dir
+        self.sources_dir = os.path.join(cache_dir, "sources")
+        self.beds_dir = os.path.join(cache_dir, "beds")
+        self.max_size_bytes = max_size_bytes
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+        # Metrics
+        self.source_hits = 0
+        self.source_misses = 0
+        self.bed_hits = 0
+        self.bed_misses = 0
+
+        os.makedirs(self.sources_dir, exist_ok=True)
+        os.makedirs(self.beds_dir, exist_ok=True)
+
+    def lock(self, key: str) -> asyncio.Lock:
+        """
+        Get the lock for a cache entry, so concurrent renders build each entry once.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            asyncio.Lock: The entry's lock
+        """
+        if key not in self._locks:
+            self._locks[key] = asyncio.Lock()
+        return self._locks[key]
+
+    def source_path(self, url: str) -> str:
+        """Get the cache path of a track's downloaded source."""
+        return os.path.join(self.sources_dir, f"{track_key(url)}.mp3")
+
+    @staticmethod
+    def bucket_length(duration: float, bucket_seconds: float) -> int:
+        """
+        Round a required bed length up to its bucket, so similar videos share a bed.
+
+        Args:
+            duration: Required length in seconds
+            bucket_seconds: Bucket size in seconds
+
+        Returns:
+            int: Bed length in seconds
+        """
+        return int(max(1, math.ceil(duration / bucket_seconds)) * bucket_seconds)
+
+    def bed_path(self, url: str, trim: float, length: int, sample_rate: int) -> str:
+        """
+        Get the cache path of a derived bed.
+
+        Args:
+            url: Track URL
+            trim: Seconds trimmed from the start of the source
+            length: Bed length in seconds (a bucket)
+            sample_rate: Bed sample rate
+
+        Returns:
+            str: Path of the bed
+        """
+        return os.path.join(self.beds_dir, f"{track_key(url)}.trim{int(round(trim * 1000))}ms.{length}s.{sample_rate}hz.flac")
+
+    def lookup(self, path: str, kind: str) -> Optional[str]:
+        """
+        Look up a cached file, recording a hit or miss.
+
+        Args:
+            path: Cache path of the file
+            kind: "source" or "bed"
+
+        Returns:
+            Optional[str]: The path, or None on a miss
+        """
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            setattr(self, f"{kind}_hits", getattr(self, f"{kind}_hits") + 1)
+            # Refresh the file's recency for eviction
+            os.utime(path)
+            return path
+
+        setattr(self, f"{kind}_misses", getattr(self, f"{kind}_misses") + 1)
+        return None
+
+    def evict(self) -> int:
+        """
+        Remove least recently used files until the cache fits its size limit.
+
+        Returns:
+            int: Number of files removed
+        """
+        entries = []
+        total_size = 0
+        for directory in (self.sources_dir, self.beds_dir):
+            for name in os.listdir(directory):
+                if name.endswith(".part") or name.startswith("."):
+                    continue
+                path = os.path.join(directory, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            os.unlink(path)
+            total_size -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"Evicted {removed} music cache files from {self.cache_dir}")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict[str, Any]: Hit/miss counters, file counts and size
+        """
+        sources = [name for name in os.listdir(self.sources_dir) if name.endswith(".mp3")]
+        beds = [name for name in os.listdir(self.beds_dir) if name.endswith(".flac")]
+        size_bytes = sum(os.path.getsize(os.path.join(self.sources_dir, name)) for name in sources) + \
+            sum(os.path.getsize(os.path.join(self.beds_dir, name)) for name in beds)
+
+        return {
+            "cache_dir": self.cache_dir,
+            "source_hits": self.source_hits,
+            "source_misses": self.source_misses,
+            "bed_hits": self.bed_hits,
+            "bed_misses": self.bed_misses,
+            "sources": len(sources),
+            "beds": len(beds),
+            "size_bytes": size_bytes,
+            "max_size_bytes": self.max_size_bytes
+        }
@@ -0,0 +1,369 @@
+"""
+TTS Cache
+
+This module provides a content-addressed cache of generated narration audio, shared
+across projects. Entries are keyed by the text and every voice setting that affects the
+audio, live outside the per-run directories, and are linked into the job workspace.
+Analyses of the audio (loudness, speech bounds) are kept alongside, keyed by file content.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+from app.infrastructure.storage.file_hash import compute_content_hash
+
+logger = logging.getLogger(__name__)
+
+TTS_CACHE_DIR = "data/cache/tts"
+
+# Voice settings that change the generated audio
+CACHE_KEY_FIELDS = (
+    "voice_id",
+    "model_id",
+    "stability",
+    "similarity_boost",
+    "speed",
+    "use_speaker_boost",
+    "output_format"
+)
+
+_caches: Dict[str, "TTSCache"] = {}
+
+def get_tts_cache(cache_dir: str = TTS_CACHE_DIR, max_size_bytes: int = 2 * 1024 ** 3) -> "TTSCache":
+    """
+    Get the shared cache for a directory, so metrics accumulate across requests.
+
+    Args:
+        cache_dir: Cache directory
+        max_size_bytes: Size limit before least recently used entries are evicted
+
+    Returns:
+        TTSCache: The cache for the directory
+    """
+    key = os.path.abspath(cache_dir)
+    if key not in _caches:
+        _caches[key] = TTSCache(cache_dir, max_size_bytes)
+    _caches[key].max_size_bytes = max_size_bytes
+    return _caches[key]
+
+class TTSCache:
+    """
+    Content-addressed store of TTS outputs with size-based LRU eviction.
+    """
+
+    def __init__(self, cache_dir: str = TTS_CACHE_DIR, max_size_bytes: int = 2 * 1024 ** 3):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Cache directory
+            max_size_bytes: Size limit before least recently used entries are evicted
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Running size of the audio entries, scanned from disk once and then kept up to date
+        # on store and evict, so storing a line doesn't walk the cache directory
+        self._lock = threading.Lock()
+        self._entries, self._size_bytes = self._scan()
+
+    @staticmethod
+    def make_key(text: str, settings: Dict[str, Any]) -> str:
+        """
+        Build the cache key for a line of narration.
+
+        Args:
+            text: Narration text
+            settings: Voice settings (see CACHE_KEY_FIELDS)
+
+        Returns:
+            str: Hex digest identifying the audio
+        """
+        payload = {"text": text}
+        payload.update({field: settings.get(field) for field in CACHE_KEY_FIELDS})
+
+        # Audio from other TTS backends is keyed separately (ElevenLabs keys predate backends)
+        backend = settings.get("backend") or "elevenlabs"
+        if backend != "elevenlabs":
+            payload["backend"] = backend
+
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, ext: str = ".mp3") -> str:
+        """
+        Get the cache path of an entry.
+
+        Args:
+            key: Cache key
+            ext: File extension
+
+        Returns:
+            str: Path of the cached file
+        """
+        return os.path.join(self.cache_dir, key[:2], f"{key}{ext}")
+
+    def lookup(self, key: str, ext: str = ".mp3") -> Optional[str]:
+        """
+        Look up an entry, recording a hit or miss.
+
+        Args:
+            key: Cache key
+            ext: File extension
+
+        Returns:
+            Optional[str]: Path of the cached file, or None on a miss
+        """
+        cached_path = self.path_for(key, ext)
+        if os.path.exists(cached_path):
+            self.hits += 1
+            # Refresh the entry's recency for eviction
+            os.utime(cached_path)
+            return cached_path
+
+        self.misses += 1
+        return None
+
+    def matches(self, key: str, file_path: str) -> bool:
+        """
+        Check whether a workspace file holds the audio of a cache entry.
+
+        Args:
+            key: Cache key
+            file_path: Workspace file
+
+        Returns:
+            bool: True if the file is (a link to or a copy of) the cached entry
+        """
+        cached_path = self.path_for(key, os.path.splitext(file_path)[1])
+        if not os.path.exists(file_path) or not os.path.exists(cached_path):
+            return False
+
+        if os.path.samefile(file_path, cached_path):
+            return True
+
+        return os.path.getsize(file_path) == os.path.getsize(cached_path) and \
+            compute_content_hash(file_path) == compute_content_hash(cached_path)
+
+    def link_into(self, cached_path: str, output_path: str) -> str:
+        """
+        Place a cached file in the job workspace, replacing whatever is there.
+        Uses a hard link where possible and falls back to a copy.
+
+        Args:
+            cached_path: Path of the cached file
+            output_path: Workspace path
+
+        Returns:
+            str: The workspace path
+        """
+        output_dir = os.path.dirname(output_path) or "."
+        os.makedirs(output_dir, exist_ok=True)
+
+        temp_path = os.path.join(output_dir, f".{os.path.basename(output_path)}.{os.getpid()}.link")
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+        try:
+            os.link(cached_path, temp_path)
+        except OSError:
+            shutil.copy2(cached_path, temp_path)
+
+        os.replace(temp_path, output_path)
+        return output_path
+
+    def store(self, key: str, source_path: str, ext: Optional[str] = None) -> str:
+        """
+        Add a generated file to the cache and evict old entries if over the size limit.
+
+        Args:
+            key: Cache key
+            source_path: Generated file in the job workspace
+            ext: Extension of the cached file (defaults to the source file's)
+
+        Returns:
+            str: Path of the cached file
+        """
+        cached_path = self.path_for(key, ext or os.path.splitext(source_path)[1])
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+        replaced_size = os.path.getsize(cached_path) if os.path.exists(cached_path) else None
+
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cached_path), suffix=".part")
+        os.close(fd)
+        try:
+            os.unlink(temp_path)
+            try:
+                os.link(source_path, temp_path)
+            except OSError:
+                shutil.copy2(source_path, temp_path)
+            os.replace(temp_path, cached_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        self.stores += 1
+        if not _is_sidecar(cached_path):
+            with self._lock:
+                self._size_bytes += os.path.getsize(cached_path) - (replaced_size or 0)
+                self._entries += 0 if replaced_size is not None else 1
+                over_limit = self._size_bytes > self.max_size_bytes
+            if over_limit:
+                self.evict()
+        return cached_path
+
+    def analysis_path(self, content_hash: str) -> str:
+        """
+        Get the cache path of the analysis of an audio file.
+
+        Args:
+            content_hash: SHA-256 of the audio file
+
+        Returns:
+            str: Path of the cached analysis
+        """
+        return os.path.join(self.cache_dir, "analysis", content_hash[:2], f"{content_hash}.json")
+
+    def load_analysis(self, content_hash: str, version: int) -> Optional[Dict[str, Any]]:
+        """
+        Load the cached analysis of an audio file.
+
+        Args:
+            content_hash: SHA-256 of the audio file
+            version: Analysis version the caller expects
+
+        Returns:
+            Optional[Dict[str, Any]]: The analysis, or None if missing or from another version
+        """
+        path = self.analysis_path(content_hash)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "r") as f:
+                analysis = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cached analysis {path}: {e}")
+            return None
+        return analysis if analysis.get("version") == version else None
+
+    def store_analysis(self, content_hash: str, analysis: Dict[str, Any]) -> str:
+        """
+        Cache the analysis of an audio file.
+
+        Args:
+            content_hash: SHA-256 of the audio file
+            analysis: Analysis to store
+
+        Returns:
+            str: Path of the cached analysis
+        """
+        path = self.analysis_path(content_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(analysis, f)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return path
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache is back under its low-water mark
+        (90% of the size limit), so the next stores don't each trigger another eviction.
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            entries = []
+            total_size = 0
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    path = os.path.join(root, name)
+                    if _is_sidecar(path):
+                        continue
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total_size += stat.st_size
+
+            removed = 0
+            if total_size > self.max_size_bytes:
+                low_water = int(self.max_size_bytes * 0.9)
+                for _, size, path in sorted(entries):
+                    if total_size <= low_water:
+                        break
+                    os.unlink(path)
+                    total_size -= size
+                    removed += 1
+
+                    # Timestamps cached with the audio go with it
+                    sidecar = os.path.splitext(path)[0] + ".alignment.json"
+                    if os.path.exists(sidecar):
+                        os.unlink(sidecar)
+
+            self._entries = len(entries) - removed
+            self._size_bytes = total_size
+
+        if removed:
+            self.evictions += removed
+            logger.info(f"Evicted {removed} TTS cache entries from {self.cache_dir}")
+
+        return removed
+
+    def _scan(self) -> Tuple[int, int]:
+        """Count the audio entries on disk and their total size."""
+        entries = 0
+        size_bytes = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                if not _is_sidecar(path):
+                    entries += 1
+                    size_bytes += os.path.getsize(path)
+        return entries, size_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict[str, Any]: Hit/miss counters, hit rate, entry count and size
+        """
+        with self._lock:
+            entries, size_bytes = self._entries, self._size_bytes
+
+        lookups = self.hits + self.misses
+        return {
+            "cache_dir": self.cache_dir,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size_bytes,
+            "max_size_bytes": self.max_size_bytes
+        }
+
+def _is_sidecar(path: str) -> bool:
+    """Check whether a cache file is a partial write, an analysis or timestamps, not audio."""
+    return path.endswith((".part", ".json"))
@@ -7,11 +7,18 @@ from app.core.content.claude_llm_response import ClaudeLLMResponse
 from app.core.content.standard_claude_response import StandardClaudeResponse
 from app.core.content.standard_gpt_response import StandardGPTResponse
 from app.core.content.merge_prompt import PromptMerger
+from app.core.content.video_list_stream import VideoListStreamParser
+from app.core.content.continuation import ContinuationSession
+from app.core.content.cached_llm_response import CachedLLMResponse
 from app.common.config import ConfigService, get_config_service
+from app.infrastructure.storage import ClipIndex, get_llm_cache
+from app.infrastructure.storage.llm_cache import LLM_CACHE_DIR
 import os
 import re
 import json
+import asyncio
 import shutil  # Added import for folder clearing functionality
+from typing import Dict, Any, Optional, Callable
 
 # Configure logging
 logging.basicConfig(
@@ -413,25 +420,32 @@ def extract_and_merge_json_from_text(text):
     
     return merged_json
 
-def start_video_pipeline(
+async def start_video_pipeline(
     mothership: str,
     user_prompt: str,
     config_service: ConfigService,
-    genre: str = "military"  # Default to military genre if not specified
+    genre: str = "military",  # Default to military genre if not specified
+    on_entry: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    use_llm_cache: bool = True
 ) -> tuple:
     """
-    Start the video generation pipeline.
+    Start the video generation pipeline. LLM calls are awaited on async clients and
+    blocking file work runs in worker threads, so the event loop stays responsive.
     
     Args:
         mothership: The mothership prompt
         user_prompt: The user's prompt
         config_service: The config service instance
         genre: The genre/type of video to generate (e.g., military, corporate)
+        on_entry: Called with (audio filename, entry) as each video_list entry is streamed,
+                  before the rest of the list is generated (optional)
+        use_llm_cache: Answer requests identical to earlier ones from the LLM response cache
+                       (also disabled by llm_cache.enabled in config)
         
     Returns:
         Tuple of (creative_output, polish_output)
     """
-    clear_data_directories()
+    await asyncio.to_thread(clear_data_directories)
     logger.info(f"Starting video generation pipeline for {genre} video with prompt: {user_prompt[:50]}...")
     
     # Verify the genre exists in the configuration
@@ -451,6 +465,12 @@ def start_video_pipeline(
     
     # 2. Get genre-specific video list
     video_list = config_service.get("video_list", {}).get(genre, [])
+    
+    # Send one clip per near-duplicate cluster (if the library has been deduplicated)
+    catalog_size = len(video_list)
+    video_list = await asyncio.to_thread(ClipIndex.for_genre(genre).representatives, video_list)
+    if len(video_list) < catalog_size:
+        logger.info(f"Clip catalog reduced from {catalog_size} to {len(video_list)} cluster representatives")
     print(f"MAIN PIPELINE - CONFIG SERVICE TYPE: {type(config_service)}")
     print(f"MAIN PIPELINE - CONFIG SERVICE ID: {id(config_service)}")
     print(f"MAIN PIPELINE - VIDEO LIST TYPE: {type(video_list)}")
@@ -504,12 +524,26 @@ def start_video_pipeline(
     polish_llm = StandardClaudeResponse(config_service)
     final_llm = StandardGPTResponse(config_service)
     
+    # Reuse responses to identical requests (same model, parameters and merged prompt)
+    llm_cache_config = config_service.get("llm_cache", {})
+    if use_llm_cache and llm_cache_config.get("enabled", True):
+        llm_cache = get_llm_cache(
+            llm_cache_config.get("directory", LLM_CACHE_DIR),
+            float(llm_cache_config.get("ttl_hours", 24)) * 3600,
+            int(llm_cache_config.get("max_mb", 256)) * 1024 * 1024,
+            int(llm_cache_config.get("max_entries", 10000))
+        )
+        creative_llm, polish_llm, final_llm = (
+            CachedLLMResponse(llm, llm_cache) for llm in (creative_llm, polish_llm, final_llm)
+        )
+    
     # Step 1: Combine the mothership and user prompt for the creative phase
     
     combined_prompt = f"MOTHERSHIP PROMPT: {mothership}\n\nUSER PROMPT: {user_prompt}"
     
-    # Step 2: Merge with creative parameters
-    final_creative_prompt = PromptMerger.merge_creative_prompt(
+    # Step 2: Merge with creative parameters (the template, parameters and clip catalog form a
+    # stable prefix the provider can cache; only the prompt after it changes between requests)
+    creative_prefix, creative_prompt = PromptMerger.split_creative_prompt(
         user_prompt=combined_prompt,
         creative_prompt=creative_template,  # Using the template from config
         story_arc_count=story_arc_count,
@@ -521,11 +555,11 @@ def start_video_pipeline(
     
     # Step 3: Generate creative response with thinking
     logger.info("Generating creative response with thinking...")
-    print(f'FINAL CREATIVE PROMPT: {final_creative_prompt}')
-    creative_output = creative_llm.generate_response(final_creative_prompt)
+    print(f'FINAL CREATIVE PROMPT: {creative_prefix}{creative_prompt}')
+    creative_output = await creative_llm.generate_response(creative_prompt, prefix=creative_prefix)
 
     # Step 4: Merge with polish parameters, including the creative output
-    final_polish_prompt = PromptMerger.merge_polish_prompt(
+    polish_prefix, polish_prompt = PromptMerger.split_polish_prompt(
         user_prompt=f"{combined_prompt}\n\nCreative output:\n{creative_output}",
         polish_prompt=polish_template,  # Using the template from config
         duration=duration,
@@ -536,17 +570,27 @@ def start_video_pipeline(
     
     # Step 5: Generate polish response without thinking
     logger.info("Generating polish response without thinking...")
-    polish_output = polish_llm.generate_response(final_polish_prompt)
+    polish_output = await polish_llm.generate_response(polish_prompt, prefix=polish_prefix)
 
     # Get the list prompt from genre_prompts
-    list_prompt = genre_prompts.get("list", "")
-    list_prompt +=  f'{str(video_list)} Here is the script: {polish_output}'
-    final_response = ''
-    
-    # Send to GPT for list generation - list_prompt acts as system instructions,
-    # while polish_output provides the content to be transformed into a structured list
-    while 'finish' not in final_response.lower():
-        final_response += creative_llm.generate_response(f'{list_prompt}, current progress {final_response}')
+    list_prefix = genre_prompts.get("list", "") + str(video_list)
+    list_prompt = f' Here is the script: {polish_output}'
+    
+    # Stream the list until the model writes 'finish', continuing it within the configured budget
+    # and handing each entry to on_entry as soon as its object closes
+    claude_config = config_service.get("claude_api", {})
+    list_session = ContinuationSession(creative_llm, list_prompt, {
+        "max_turns": claude_config.get("list_max_turns"),
+        "max_output_tokens": claude_config.get("list_max_output_tokens")
+    }, prefix=list_prefix)
+    list_parser = VideoListStreamParser()
+    async for text in list_session.stream(lambda response: 'finish' in response.lower()):
+        if on_entry:
+            for audio_file, entry in list_parser.feed(text):
+                on_entry(audio_file, entry)
+    
+    final_response = list_session.text
+    logger.info(f"Video list generated in {list_session.metrics['turns']} turn(s): {list_session.metrics}")
     
     # Extract JSON from the final response and save it to a file
     logger.info(f"Extracting JSON structure from final response (length: {len(final_response)})")
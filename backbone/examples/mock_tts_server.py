@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Mock TTS Server
+
+A local stand-in for the ElevenLabs text-to-speech endpoints, for testing audio
+generation without an API key or quota. Every character becomes a short tone and
+every <break time="..."/> tag becomes silence, so durations and character timestamps
+are deterministic.
+
+Usage:
+    python examples/mock_tts_server.py --port 8765
+
+Then point the backend at it in config.json:
+    "audio": {"tts_base_url": "http://127.0.0.1:8765/v1", "tts_batch_lines": 4}
+and set any API key (e.g. EL=mock).
+"""
+
+import re
+import json
+import base64
+import logging
+import argparse
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BREAK_TAG = re.compile(r'\s*<break\s+time="([\d.]+)s"\s*/>\s*')
+
+def synthesize_timeline(text: str, char_duration: float) -> Tuple[List[Tuple[float, bool]], Dict[str, List]]:
+    """
+    Lay out the text as tones (characters) and silences (breaks).
+
+    Args:
+        text: Request text
+        char_duration: Duration of each character in seconds
+
+    Returns:
+        Tuple: (duration, is_silence) segments and the character alignment
+    """
+    segments = []
+    alignment = {"characters": [], "character_start_times_seconds": [], "character_end_times_seconds": []}
+    t = 0.0
+
+    position = 0
+    for match in list(BREAK_TAG.finditer(text)) + [None]:
+        chunk = text[position:match.start()] if match else text[position:]
+        if chunk:
+            segments.append((len(chunk) * char_duration, False))
+            for char in chunk:
+                alignment["characters"].append(char)
+                alignment["character_start_times_seconds"].append(round(t, 3))
+                t += char_duration
+                alignment["character_end_times_seconds"].append(round(t, 3))
+        if match:
+            pause = float(match.group(1))
+            segments.append((pause, True))
+            t += pause
+            position = match.end()
+
+    return segments, alignment
+
+def render_mp3(segments: List[Tuple[float, bool]], output_format: str) -> bytes:
+    """
+    Render the segments to MP3 with FFmpeg.
+
+    Args:
+        segments: (duration, is_silence) segments
+        output_format: Requested format (e.g. mp3_44100_128)
+
+    Returns:
+        bytes: The encoded audio
+    """
+    match = re.fullmatch(r"mp3_(\d+)_(\d+)", output_format)
+    sample_rate, bitrate = (match.group(1), match.group(2)) if match else ("44100", "128")
+
+    inputs, labels = [], []
+    for i, (duration, silence) in enumerate(segments):
+        source = "anullsrc=r={0}:cl=mono".format(sample_rate) if silence else \
+            "sine=frequency={0}:sample_rate={1}".format(220 + 40 * (i % 8), sample_rate)
+        inputs += ["-f", "lavfi", "-t", f"{duration:.3f}", "-i", source]
+        labels.append(f"[{i}:a]")
+
+    cmd = ["ffmpeg", "-loglevel", "error", *inputs,
+           "-filter_complex", "".join(labels) + f"concat=n={len(segments)}:v=0:a=1",
+           "-c:a", "libmp3lame", "-ar", sample_rate, "-b:a", f"{bitrate}k", "-f", "mp3", "pipe:1"]
+    return subprocess.run(cmd, capture_output=True, check=True).stdout
+
+def stream_chunks(audio: bytes, alignment: Dict[str, List], chunks: int = 4) -> bytes:
+    """
+    Split a response into newline-delimited JSON chunks, as the streaming timestamps
+    endpoint returns them: each with part of the audio and the alignment of its characters.
+
+    Args:
+        audio: The encoded audio
+        alignment: The character alignment
+        chunks: Number of chunks
+
+    Returns:
+        bytes: The response body
+    """
+    lines = []
+    audio_step = -(-len(audio) // chunks)
+    char_step = -(-len(alignment["characters"]) // chunks)
+    for i in range(chunks):
+        part = slice(i * char_step, (i + 1) * char_step)
+        chunk_alignment = {key: values[part] for key, values in alignment.items()}
+        lines.append(json.dumps({
+            "audio_base64": base64.b64encode(audio[i * audio_step:(i + 1) * audio_step]).decode(),
+            "alignment": chunk_alignment,
+            "normalized_alignment": chunk_alignment
+        }))
+    return ("\n".join(lines) + "\n").encode()
+
+class MockTTSHandler(BaseHTTPRequestHandler):
+    """Handles /v1/text-to-speech/{voice_id}[/stream|/with-timestamps|/stream/with-timestamps]."""
+
+    char_duration = 0.06
+
+    def do_POST(self):
+        path, _, query = self.path.partition("?")
+        match = re.fullmatch(r"/v1/text-to-speech/([^/]+)(/stream|/with-timestamps|/stream/with-timestamps)?", path)
+        if not match:
+            self.send_error(404)
+            return
+
+        params = dict(part.split("=", 1) for part in query.split("&") if "=" in part)
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        text = body.get("text", "")
+        if not text.strip():
+            self.send_error(400, "text is required")
+            return
+
+        segments, alignment = synthesize_timeline(text, self.char_duration)
+        audio = render_mp3(segments, params.get("output_format", "mp3_44100_128"))
+        logger.info(f"{match.group(2) or '/'} {len(text)} chars -> {len(audio)} bytes")
+
+        if match.group(2) == "/with-timestamps":
+            payload = json.dumps({
+                "audio_base64": base64.b64encode(audio).decode(),
+                "alignment": alignment,
+                "normalized_alignment": alignment
+            }).encode()
+            content_type = "application/json"
+        elif match.group(2) == "/stream/with-timestamps":
+            payload = stream_chunks(audio, alignment)
+            content_type = "application/x-ndjson"
+        else:
+            payload = audio
+            content_type = "audio/mpeg"
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock ElevenLabs text-to-speech server")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind")
+    parser.add_argument("--char-duration", type=float, default=0.06, help="Seconds of audio per character")
+    args = parser.parse_args()
+
+    MockTTSHandler.char_duration = args.char_duration
+    server = ThreadingHTTPServer((args.host, args.port), MockTTSHandler)
+    logger.info(f"Mock TTS server listening on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()